@@ -1,7 +1,8 @@
+import asyncio
 import os
-import shutil
+import time
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, TYPE_CHECKING
 from datetime import datetime
 from dotenv import load_dotenv
 
@@ -9,8 +10,9 @@ from dotenv import load_dotenv
 load_dotenv()
 
 # Third-party imports
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Depends, Request
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Depends, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
 from starlette.middleware.sessions import SessionMiddleware
 from pydantic import BaseModel
 from slowapi import Limiter, _rate_limit_exceeded_handler
@@ -19,15 +21,25 @@ from slowapi.errors import RateLimitExceeded
 import uvicorn
 
 # Local imports
-from src.data_processor import DataProcessor
+# pandas (data_processor), googleapiclient (gmail_client) and boto3 (storage) are
+# loaded on first use via the accessors below, so /health and auth-only workers
+# don't pay for them at boot.
 from src.email_generator import EmailGenerator
 from src.tracker import EmailTracker
-from src.gmail_client import GmailClient
-from src.database import engine, Base
+from src.database import engine
 from src.auth_routes import router as auth_router
 from src.stripe_routes import router as stripe_router
+from src import dashboard, data_version, metrics, pregeneration, uploads
+from src.etags import etag_matches
+from src.responses import FastJSONResponse
+from src.logger import get_logger
+
+if TYPE_CHECKING:
+    from src.data_processor import DataProcessor
+    from src.gmail_client import GmailClient
 
 app = FastAPI(title="Cold Email Outreach", version="2.0")
+logger = get_logger("app.log")
 
 # Rate limiting: per-IP limits on /api/draft, /api/send/{id}, /api/send-all (20/min each)
 limiter = Limiter(key_func=get_remote_address)
@@ -41,6 +53,20 @@ app.add_middleware(
 )
 
 
+# Routes taking file uploads. Starlette spools a multipart body to disk before
+# the handler runs, so oversized requests are refused by Content-Length first.
+UPLOAD_ROUTES = ("/api/upload", "/api/draft")
+
+
+@app.middleware("http")
+async def reject_oversized_uploads(request: Request, call_next):
+    """Return 413 for upload requests declaring more than UPLOAD_MAX_BYTES, before the body is read."""
+    if (request.method == "POST" and request.url.path in UPLOAD_ROUTES
+            and uploads.declared_too_large(request.headers.get("content-length"))):
+        return FastJSONResponse({"detail": str(uploads.UploadTooLarge(uploads.UPLOAD_MAX_BYTES))}, status_code=413)
+    return await call_next(request)
+
+
 # CORS configuration: FRONTEND_URL + optional FRONTEND_URL_EXTRA (e.g. Vercel URL + custom domain)
 _extra = os.getenv("FRONTEND_URL_EXTRA", "")
 origins = [
@@ -57,37 +83,63 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """Record request latency per route template (bounded label cardinality)."""
+    start = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        metrics.HTTP_REQUEST_DURATION.observe(
+            time.perf_counter() - start,
+            method=request.method,
+            route=getattr(route, "path", "unmatched"),
+            status=status_code,
+        )
+
+
 # Store uploaded files
-UPLOAD_DIR = Path("uploads")
+UPLOAD_DIR = Path(os.getenv("UPLOAD_DIR", "uploads"))
 UPLOAD_DIR.mkdir(exist_ok=True)
 
+# Concurrent Gmail API calls per request (drafts are created in parallel)
+GMAIL_CONCURRENCY = int(os.getenv("GMAIL_CONCURRENCY", 10))
+
+# Most previews one /api/preview/stream request may generate
+PREVIEW_STREAM_MAX = 20
+
 # Global state
 current_file: Optional[str] = None
-gmail_client: Optional[GmailClient] = None # type: ignore
 
 
-# Database table creation on startup
+# Schema check on startup. Migrations are applied once per deploy with
+# `python scripts/cli.py migrate` (or `python -m src.migrations`), not by every worker.
 @app.on_event("startup")
 async def startup():
-    """Create database tables on startup and run migrations."""
-    Base.metadata.create_all(bind=engine)
+    """Check the database schema version (single read, no DDL)."""
+    from src.migrations import check_schema, run_migrations
 
-    # Migration: Add password_hash column if missing (for Render free tier)
-    from sqlalchemy import inspect, text
+    if os.getenv("AUTO_MIGRATE", "").lower() in ("1", "true", "yes"):
+        # Opt-in for single-instance/dev setups
+        run_migrations(engine)
+
+    app.state.schema = check_schema(engine)
+    if not app.state.schema["ok"]:
+        print(
+            f"Warning: database schema version is {app.state.schema['current']}, "
+            f"expected {app.state.schema['expected']}. Run `python scripts/cli.py migrate`."
+        )
 
-    try:
-        inspector = inspect(engine)
-        columns = [col["name"] for col in inspector.get_columns("users")]
-        if "password_hash" not in columns:
-            print("Adding password_hash column to users table...")
-            with engine.connect() as conn:
-                conn.execute(text("ALTER TABLE users ADD COLUMN password_hash VARCHAR(255)"))
-                conn.commit()
-            print("Password hash column added successfully.")
-        else:
-            print("Password hash column already exists.")
-    except Exception as e:
-        print(f"Migration check: {e}")
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Close the shared Gmail connection pool."""
+    from src.gmail_transport import close_async_client
+    await close_async_client()
 
 
 @app.get("/health")
@@ -102,7 +154,21 @@ async def health():
     except Exception:
         pass
     status = "ok" if db_ok else "degraded"
-    return {"status": status, "database": "ok" if db_ok else "error"}
+    schema = getattr(app.state, "schema", None)
+    return {
+        "status": status,
+        "database": "ok" if db_ok else "error",
+        "schema": "ok" if schema and schema["ok"] else "outdated",
+    }
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics_endpoint(request: Request):
+    """Prometheus metrics for this worker. Set METRICS_TOKEN to require a bearer token."""
+    token = os.getenv("METRICS_TOKEN")
+    if token and request.headers.get("authorization") != f"Bearer {token}":
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
 
 
 # Include auth router
@@ -134,14 +200,41 @@ async def root():
     return {"message": "OutreachPro API", "docs": "/docs", "health": "/health"}
 
 
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from src.database import get_db
 from src.auth import require_auth
 from src.models import User, Contact, EmailLog
 
+
+def get_data_processor() -> "DataProcessor":
+    """Create a DataProcessor, importing pandas on first use."""
+    from src.data_processor import DataProcessor
+    return DataProcessor()
+
+
+def get_gmail_client(user: User) -> "GmailClient":
+    """Create a GmailClient for a user, importing the Google API client on first use."""
+    from src.gmail_client import GmailClient
+    return GmailClient(user=user)
+
+
+def not_modified(request: Request, response: Response, user: User) -> Optional[Response]:
+    """Set the ETag of a per-user read; returns a 304 when the client's copy is current."""
+    etag = data_version.etag(request, user)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=dict(response.headers))
+    return None
+
+
 @app.get("/api/stats")
-async def get_stats(user: User = Depends(require_auth), db: Session = Depends(get_db)):
+async def get_stats(request: Request, response: Response, user: User = Depends(require_auth), db: Session = Depends(get_db)):
     """Get email tracking statistics and credits from database."""
+    cached = not_modified(request, response, user)
+    if cached:
+        return cached
     from sqlalchemy import func
 
     # Query actual counts from EmailLog table
@@ -162,50 +255,43 @@ async def get_stats(user: User = Depends(require_auth), db: Session = Depends(ge
 
 
 @app.get("/api/history")
-async def get_history(status: Optional[str] = None, limit: int = 50, user: User = Depends(require_auth), db: Session = Depends(get_db)):
+async def get_history(request: Request, response: Response, status: Optional[str] = None, limit: int = 50, user: User = Depends(require_auth), db: Session = Depends(get_db)):
     """Get email history from database."""
-    query = db.query(EmailLog).filter(EmailLog.user_id == user.id)
+    cached = not_modified(request, response, user)
+    if cached:
+        return cached
+    # Row tuples of the listed columns: no ORM objects, identity map or change tracking
+    query = db.query(*dashboard.log_columns()).filter(EmailLog.user_id == user.id)
     if status:
         query = query.filter(EmailLog.status == status)
     logs = query.order_by(EmailLog.created_at.desc()).limit(limit).all()
-    return [
-        {
-            "id": log.id,
-            "recipient_email": log.recipient_email,
-            "recipient_name": log.recipient_name,
-            "company": log.company,
-            "subject": log.subject,
-            "status": log.status,
-            "created_at": log.created_at.isoformat() if log.created_at else None,
-            "sent_at": log.sent_at.isoformat() if log.sent_at else None,
-        }
-        for log in logs
-    ]
+    return FastJSONResponse([dashboard.serialize_log(log) for log in logs], headers=dict(response.headers))
 
 
 @app.get("/api/contacts")
-async def get_contacts(status: Optional[str] = None, limit: int = 100, user: User = Depends(require_auth), db: Session = Depends(get_db)):
+async def get_contacts(request: Request, response: Response, status: Optional[str] = None, limit: int = 100, user: User = Depends(require_auth), db: Session = Depends(get_db)):
     """Get user's contacts from database."""
-    query = db.query(Contact).filter(Contact.user_id == user.id)
+    cached = not_modified(request, response, user)
+    if cached:
+        return cached
+    query = db.query(*dashboard.contact_columns()).filter(Contact.user_id == user.id)
     if status:
         query = query.filter(Contact.status == status)
     contacts = query.order_by(Contact.created_at.desc()).limit(limit).all()
-    return [
-        {
-            "id": contact.id,
-            "name": contact.name,
-            "email": contact.email,
-            "company": contact.company,
-            "role": contact.role,
-            "status": contact.status,
-            "created_at": contact.created_at.isoformat() if contact.created_at else None,
-        }
-        for contact in contacts
-    ]
+    return FastJSONResponse([dashboard.serialize_contact(contact) for contact in contacts], headers=dict(response.headers))
+
+
+@app.get("/api/dashboard")
+async def get_dashboard(request: Request, user: User = Depends(require_auth), db: Session = Depends(get_db)):
+    """Credits, stats, recent history and recent contacts in one cached snapshot."""
+    snapshot, etag = dashboard.get(db, user)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return FastJSONResponse(snapshot, headers=headers)
 
 
 from fastapi import BackgroundTasks
-from src.storage import upload_file
 
 @app.post("/api/upload")
 async def upload_csv(
@@ -219,39 +305,56 @@ async def upload_csv(
     if not file.filename or not file.filename.endswith('.csv'):
         raise HTTPException(status_code=400, detail="Only CSV files are supported")
     
-    # Save the file to user specific path
+    # Save the file to user specific path, hashing it as it is written
     user_upload_dir = UPLOAD_DIR / str(user.id)
     user_upload_dir.mkdir(exist_ok=True)
     
-    file_path = user_upload_dir / file.filename
-    with open(file_path, "wb") as f:
-        shutil.copyfileobj(file.file, f)
+    filename = Path(file.filename).name
+    try:
+        saved = await uploads.asave_upload(file, uploads.temp_path(user_upload_dir))
+    except uploads.UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
     
-    # Define background upload task
-    def backup_to_r2(local_path, object_name):
-        try:
-            with open(local_path, "rb") as f:
-                upload_file(f, object_name)
-        except Exception as e:
-            print(f"Background upload failed: {e}")
-
-    # Schedule upload
-    object_name = f"users/{user.id}/uploads/{file.filename}"
-    background_tasks.add_task(backup_to_r2, str(file_path), object_name)
+    # Same file imported before: return that summary, skip parsing and the R2 backup
+    previous = uploads.find_import(db, user.id, saved.sha256)
+    if previous is not None:
+        saved.path.unlink(missing_ok=True)
+        logger.info("Duplicate upload skipped", user_id=user.id, sha256=saved.sha256, filename=filename)
+        return {**previous, "filename": filename, "duplicate": True}
+    
+    file_path = user_upload_dir / filename
+    os.replace(saved.path, file_path)
     
     # Load and process data
     try:
-        processor = DataProcessor()
-        recruiters = processor.load(str(file_path))
+        import_start = time.perf_counter()
+        processor = get_data_processor()
+        # Invalid, duplicate and disposable addresses never reach the database
+        recruiters, validation = processor.load_validated(str(file_path))
+        
+        # Domains that cannot receive mail (MX lookups, cached across imports)
+        from src import companies, deliverability
+        deliverable = await deliverability.check_domains(
+            db, [deliverability.email_domain(r.get("recruiter_email")) for r in recruiters]
+        )
+        
+        # One profile per company, shared by its recruiters
+        profiles = companies.upsert_profiles(db, user.id, recruiters)
         
         # Save to DB
         count_new = 0
         count_existing = 0
+        count_undeliverable = 0
         
         for r in recruiters:
-            # Check if contact exists for this user by email
+            # Check if contact exists for this user by email (stored lower-case:
+            # normalized at import, legacy rows by migration 10)
             email = r.get("recruiter_email")
             existing = db.query(Contact).filter(Contact.user_id == user.id, Contact.email == email).first()
+            profile = profiles.get(companies.company_key(r))
+            # Tagged contacts are never drafted, so they cost no credits or quota
+            dead = not deliverable.get(deliverability.email_domain(email), True)
+            count_undeliverable += dead
             
             if not existing:
                 contact = Contact(
@@ -260,21 +363,63 @@ async def upload_csv(
                     email=email,
                     company=r.get("company"),
                     role=r.get("role"),
-                    status="new"
+                    company_profile_id=profile.id if profile is not None else None,
+                    status=deliverability.UNDELIVERABLE if dead else "new"
                 )
                 db.add(contact)
+                if profile is not None:
+                    profile.contact_count = (profile.contact_count or 0) + 1
                 count_new += 1
             else:
+                # Link contacts imported before company profiles existed
+                if profile is not None and existing.company_profile_id is None:
+                    existing.company_profile_id = profile.id
+                    profile.contact_count = (profile.contact_count or 0) + 1
+                if dead and existing.status == "new":
+                    existing.status = deliverability.UNDELIVERABLE
                 count_existing += 1
         
-        db.commit()
-        
-        return {
-            "filename": file.filename,
+        summary = {
+            "filename": filename,
             "total_contacts": len(recruiters),
             "new_added": count_new,
-            "already_exists": count_existing
+            "already_exists": count_existing,
+            "undeliverable": count_undeliverable,
+            "rejected": validation["total"] - validation["accepted"],
+            "validation": validation
         }
+        # Remembered by content hash in the contacts' transaction, so re-uploading this file is a no-op
+        uploads.record_import(db, user.id, saved, filename, summary)
+        try:
+            db.commit()
+        except IntegrityError:
+            # The same file was imported concurrently and its contacts are saved
+            db.rollback()
+            previous = uploads.find_import(db, user.id, saved.sha256)
+            if previous is None:
+                raise
+            logger.info("Concurrent duplicate upload skipped", user_id=user.id, sha256=saved.sha256, filename=filename)
+            return {**previous, "filename": filename, "duplicate": True}
+        dashboard.invalidate(user.id)
+        
+        # Back up from disk after the response (shared R2 client, multipart for big files)
+        background_tasks.add_task(
+            uploads.backup_import, user.id, saved.sha256, str(file_path), f"users/{user.id}/uploads/{filename}"
+        )
+        
+        # Warm the LLM email cache for the new contacts (opt-in, low priority)
+        if count_new and pregeneration.PREGENERATE_ENABLED:
+            background_tasks.add_task(pregeneration.schedule, user.id)
+        
+        elapsed = time.perf_counter() - import_start
+        metrics.IMPORT_ROWS.inc(validation["total"])
+        for reason, rejected in validation["rejected"].items():
+            if rejected:
+                metrics.IMPORT_ROWS_REJECTED.inc(rejected, reason=reason)
+        if elapsed > 0:
+            metrics.IMPORT_ROWS_PER_SECOND.observe(validation["total"] / elapsed)
+        
+        return {**summary, "duplicate": False}
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=400, detail=f"Processing Error: {str(e)}")
@@ -284,8 +429,8 @@ async def upload_csv(
 async def preview_emails(limit: int = 5, use_llm: bool = False, user: User = Depends(require_auth), db: Session = Depends(get_db)):
     """Preview generated emails for new contacts."""
     
-    # Fetch new contacts from DB
-    contacts = db.query(Contact).filter(
+    # Fetch new contacts from DB (only the columns the generator reads)
+    contacts = db.query(*pregeneration.contact_columns()).filter(
         Contact.user_id == user.id,
         Contact.status == "new"
     ).limit(limit).all()
@@ -293,16 +438,10 @@ async def preview_emails(limit: int = 5, use_llm: bool = False, user: User = Dep
     if not contacts:
         return {"emails": [], "message": "No new contacts found. Please upload a CSV first."}
     
-    # Convert contacts to dicts for generator
-    recruiters = []
-    for c in contacts:
-        recruiters.append({
-            "recruiter_name": c.name,
-            "recruiter_email": c.email,
-            "company": c.company,
-            "role": c.role,
-            "company_type": "unknown" # Fallback
-        })
+    # Convert contacts to dicts for generator (company profiles loaded once)
+    from src import companies
+    profiles = companies.profiles_for(db, contacts)
+    recruiters = pregeneration.recruiters_for(db, contacts, profiles=profiles)
     
     # Get generator
     generator: EmailGenerator | LLMEmailGenerator
@@ -312,10 +451,16 @@ async def preview_emails(limit: int = 5, use_llm: bool = False, user: User = Dep
     else:
         generator = EmailGenerator()
     
+    if use_llm:
+        # Pregenerated emails where warm; the rest several per Gemini call, off the event loop
+        emails = await pregeneration.agenerate_with_cache(db, user.id, contacts, generator, profiles=profiles)
+    else:
+        emails = [None] * len(recruiters)
+    
     previews = []
-    for recruiter in recruiters:
+    for recruiter, email in zip(recruiters, emails):
         try:
-            result = generator.generate(recruiter)
+            result = email or generator.generate(recruiter)
             previews.append({
                 "recruiter_name": recruiter.get("recruiter_name", ""),
                 "recruiter_email": recruiter.get("recruiter_email", ""),
@@ -332,6 +477,80 @@ async def preview_emails(limit: int = 5, use_llm: bool = False, user: User = Dep
     return {"emails": previews}
 
 
+@app.get("/api/preview/stream")
+async def preview_emails_stream(limit: int = Query(5, ge=1, le=PREVIEW_STREAM_MAX), user: User = Depends(require_auth), db: Session = Depends(get_db)):
+    """
+    Stream LLM previews for new contacts as newline-delimited JSON.
+    
+    All generations run concurrently and stream as Gemini produces them, so
+    the first preview arrives after a single model latency. Events:
+    {"type": "delta", "index", "text"} for partial text, {"type": "email",
+    "index", "recruiter_name", "recruiter_email", "company", "subject", "body"}
+    when an email is complete (pregenerated ones come first), then {"type": "done"}.
+    """
+    import json
+    from src.llm_generator import LLMEmailGenerator
+    
+    contacts = db.query(*pregeneration.contact_columns()).filter(
+        Contact.user_id == user.id,
+        Contact.status == "new"
+    ).limit(limit).all()
+    
+    generator = LLMEmailGenerator()
+    recruiters = pregeneration.recruiters_for(db, contacts)
+    cached = pregeneration.lookup(db, user.id, [c.id for c in contacts], generator.profile_hash)
+    
+    def email_event(index: int, email: dict) -> dict:
+        recruiter = recruiters[index]
+        return {
+            "type": "email",
+            "index": index,
+            "recruiter_name": recruiter.get("recruiter_name", ""),
+            "recruiter_email": recruiter.get("recruiter_email", ""),
+            "company": recruiter.get("company", ""),
+            "subject": email["subject"],
+            "body": email["body"]
+        }
+    
+    async def events():
+        queue: asyncio.Queue = asyncio.Queue()
+        
+        async def stream_one(index: int):
+            parts = []
+            try:
+                async for text in generator.astream(recruiters[index]):
+                    parts.append(text)
+                    await queue.put({"type": "delta", "index": index, "text": text})
+                email = generator.parse_email("".join(parts))
+            except Exception as e:
+                logger.error("Streaming preview failed", user_id=user.id, contact_id=contacts[index].id, error=str(e))
+                email = generator.fallback_email(recruiters[index])
+            await queue.put(email_event(index, email))
+        
+        for index, contact in enumerate(contacts):
+            if contact.id in cached:
+                yield json.dumps(email_event(index, cached[contact.id])) + "\n"
+        
+        tasks = [
+            asyncio.create_task(stream_one(index))
+            for index, contact in enumerate(contacts) if contact.id not in cached
+        ]
+        try:
+            pending = len(tasks)
+            while pending:
+                event = await queue.get()
+                if event["type"] == "email":
+                    pending -= 1
+                yield json.dumps(event) + "\n"
+        finally:
+            # Client went away: stop the remaining generations
+            for task in tasks:
+                task.cancel()
+        yield json.dumps({"type": "done", "count": len(contacts)}) + "\n"
+    
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
 @app.get("/api/auth/status")
 async def auth_status(user: User = Depends(require_auth)):
     """Check if User has Gmail connected."""
@@ -355,15 +574,19 @@ async def create_drafts(
     use_llm_bool = use_llm.lower() in ('true', '1', 'yes', 'on')
     has_attachments = len(attachments) > 0
     
-    print(f"Creating drafts for user {user.email} (LLM: {use_llm_bool})")
+    logger.info("Creating drafts", user_id=user.id, use_llm=use_llm_bool)
     
     # Initialize Gmail client for this user
-    gmail_client = GmailClient(user=user)
-    if not gmail_client.authenticate():
+    gmail_client = get_gmail_client(user)
+    if not await gmail_client.aauthenticate():
         raise HTTPException(status_code=401, detail="Gmail not connected. Please login with Google again.")
     
-    # Fetch new contacts from DB
-    contacts = db.query(Contact).filter(
+    # This request generates the emails itself: a running pregeneration job
+    # would only spend Gemini tokens on contacts about to be drafted
+    pregeneration.cancel(user.id)
+    
+    # Fetch new contacts from DB as rows of the columns drafting reads
+    contacts = db.query(*pregeneration.contact_columns()).filter(
         Contact.user_id == user.id,
         Contact.status == "new"
     ).all()
@@ -382,9 +605,11 @@ async def create_drafts(
         user_att_dir.mkdir(parents=True, exist_ok=True)
         for att in attachments:
             if att.filename:
-                att_path = user_att_dir / att.filename
-                with open(att_path, "wb") as f:
-                    shutil.copyfileobj(att.file, f)
+                att_path = user_att_dir / Path(att.filename).name
+                try:
+                    await uploads.asave_upload(att, att_path, max_bytes=uploads.ATTACHMENT_MAX_BYTES)
+                except uploads.UploadTooLarge as e:
+                    raise HTTPException(status_code=413, detail=f"{att.filename}: {e}")
                 attachment_paths.append(str(att_path))
     
     # Get generator
@@ -398,32 +623,45 @@ async def create_drafts(
     success = 0
     failed = 0
     
-    for contact in contacts:
-        try:
-            # Prepare data dict for generator
-            recruiter_data = {
-                "recruiter_name": contact.name,
-                "recruiter_email": contact.email,
-                "company": contact.company,
-                "role": contact.role,
-                "company_type": "unknown"
-            }
-            
-            # Generate email
-            result = generator.generate(recruiter_data, has_attachments=has_attachments)
-            
-            # Create draft
-            draft_result = gmail_client.create_draft(
+    # Generate all emails first
+    generated = []
+    if use_llm_bool:
+        # Pregenerated emails where warm; the rest several per Gemini call, off the event loop
+        emails = await pregeneration.agenerate_with_cache(db, user.id, contacts, generator, has_attachments)
+        generated = list(zip(contacts, emails))
+    else:
+        recruiters = pregeneration.recruiters_for(db, contacts)
+        for contact, recruiter_data in zip(contacts, recruiters):
+            try:
+                generated.append((contact, generator.generate(recruiter_data, has_attachments=has_attachments)))
+            except Exception as e:
+                logger.error("Error generating email", user_id=user.id, contact_id=contact.id, error=str(e))
+                failed += 1
+    
+    # Create the Gmail drafts concurrently over the shared connection pool
+    semaphore = asyncio.Semaphore(GMAIL_CONCURRENCY)
+    
+    async def create_one(contact, result):
+        async with semaphore:
+            return await gmail_client.acreate_draft(
                 contact.email,
                 result["subject"],
                 result["body"],
                 attachment_paths if attachment_paths else None
             )
+    
+    draft_results = await asyncio.gather(
+        *(create_one(contact, result) for contact, result in generated),
+        return_exceptions=True
+    )
+    
+    drafted_ids = []
+    for (contact, result), draft_result in zip(generated, draft_results):
+        try:
+            if isinstance(draft_result, Exception):
+                raise draft_result
             
             if draft_result:
-                # Update Contact status
-                contact.status = "draft"
-                
                 # Log email
                 log = EmailLog(
                     user_id=user.id,
@@ -435,29 +673,46 @@ async def create_drafts(
                     gmail_draft_id=draft_result.get("id")
                 )
                 db.add(log)
+                drafted_ids.append(contact.id)
                 success += 1
             else:
                 failed += 1
         except Exception as e:
-            print(f"Error creating draft: {e}")
+            logger.error("Error creating draft", user_id=user.id, error=str(e))
             failed += 1
     
     # DEDUCT CREDITS based on success
     if success > 0:
         user.credits -= success
+        # Contacts were loaded as rows: move them to "draft" in bulk (the
+        # EmailLog rows added above bump the user's data version). Only
+        # contacts still "new" move, in case one changed while drafting.
+        for start in range(0, len(drafted_ids), 500):
+            db.query(Contact).filter(
+                Contact.id.in_(drafted_ids[start:start + 500]),
+                Contact.status == "new"
+            ).update(
+                {Contact.status: "draft"}, synchronize_session=False
+            )
+        pregeneration.consume(db, drafted_ids)
         db.commit()
+        dashboard.invalidate(user.id)
     
     return {"success": success, "failed": failed, "total": len(contacts), "attachments": len(attachment_paths), "remaining_credits": user.credits}
 
 
 @app.get("/api/drafts")
-async def get_drafts(user: User = Depends(require_auth), db: Session = Depends(get_db)):
+async def get_drafts(request: Request, response: Response, user: User = Depends(require_auth), db: Session = Depends(get_db)):
     """Get all drafted emails for the user."""
-    drafts = db.query(EmailLog).filter(
+    cached = not_modified(request, response, user)
+    if cached:
+        return cached
+    # Only the listed columns, as rows: no body, Gmail ids or ORM objects
+    drafts = db.query(*dashboard.log_columns()).filter(
         EmailLog.user_id == user.id,
         EmailLog.status == "draft"
     ).order_by(EmailLog.created_at.desc()).all()
-    return drafts
+    return FastJSONResponse([dashboard.serialize_log(log) for log in drafts], headers=dict(response.headers))
 
 
 @app.post("/api/send/{draft_id}")
@@ -505,8 +760,8 @@ async def send_draft(
     
     # Let's go with listing all Gmail drafts from the API for now, as it's the source of truth.
     
-    gmail_client = GmailClient(user=user)
-    if not gmail_client.authenticate():
+    gmail_client = get_gmail_client(user)
+    if not await gmail_client.aauthenticate():
          raise HTTPException(status_code=401, detail="Gmail authentication failed")
          
     try:
@@ -514,17 +769,18 @@ async def send_draft(
              # Legacy draft or failed to save ID, cannot send via copy
              raise HTTPException(status_code=400, detail="Draft ID missing for this email.")
         
-        sent_msg = gmail_client.send_draft(log.gmail_draft_id)
+        sent_msg = await gmail_client.asend_draft(log.gmail_draft_id)
         if sent_msg:
             log.status = "sent"
             log.sent_at = datetime.utcnow()
             db.commit()
+            dashboard.invalidate(user.id)
             return {"status": "sent", "message_id": sent_msg['id']}
         else:
             raise HTTPException(status_code=500, detail="Failed to send draft via Gmail API")
 
     except Exception as e:
-        print(f"Error sending draft: {e}")
+        logger.error("Error sending draft", user_id=user.id, draft_id=draft_id, error=str(e))
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -538,8 +794,8 @@ async def send_all_drafts(
     db: Session = Depends(get_db)
 ):
     """Send all drafted emails with rate limiting (Option B feature)."""
-    # Get all drafts for user
-    drafts = db.query(EmailLog).filter(
+    # Get all drafts for user (ids only; the sender prefetches the rest)
+    drafts = db.query(EmailLog.id).filter(
         EmailLog.user_id == user.id,
         EmailLog.status == "draft"
     ).all()
@@ -547,38 +803,11 @@ async def send_all_drafts(
     if not drafts:
         return {"queued": 0, "message": "No drafts to send"}
     
-    # Queue the batch send as a background task
-    def batch_send_task():
-        import time
-        from src.database import SessionLocal
-        from src.gmail_client import GmailClient
-        from src.models import User as UserModel, EmailLog as EmailLogModel
-        
-        db_session = SessionLocal()
-        try:
-            user_obj = db_session.query(UserModel).filter(UserModel.id == user.id).first()
-            gmail = GmailClient(user=user_obj)
-            if not gmail.authenticate():
-                print(f"Batch send failed: Gmail auth failed for {user_obj.email}")
-                return
-            
-            for draft in drafts:
-                try:
-                    log = db_session.query(EmailLogModel).filter(EmailLogModel.id == draft.id).first()
-                    if log and log.gmail_draft_id:
-                        result = gmail.send_draft(log.gmail_draft_id)
-                        if result:
-                            log.status = "sent"
-                            log.sent_at = datetime.utcnow()
-                            db_session.commit()
-                            print(f"Sent: {log.recipient_email}")
-                        time.sleep(delay_seconds)
-                except Exception as e:
-                    print(f"Error sending {draft.recipient_email}: {e}")
-        finally:
-            db_session.close()
+    # Sent in the background; statuses are written in bulk (src/sender.py)
+    from src import sender
     
-    background_tasks.add_task(batch_send_task)
+    metrics.SEND_QUEUE_DEPTH.inc(len(drafts))
+    background_tasks.add_task(sender.send_batch, user.id, [draft.id for draft in drafts], delay_seconds, get_gmail_client)
     
     return {
         "queued": len(drafts),
@@ -591,10 +820,12 @@ async def send_all_drafts(
 async def clear_tracking():
     """Clear all tracking records to allow re-sending."""
     tracker = EmailTracker()
-    tracker.records = {}
-    tracker._save()
+    tracker.clear()
     return {"status": "cleared"}
 
 
 if __name__ == "__main__":
+    # Local development: bring the schema up to date before serving
+    from src.migrations import run_migrations
+    run_migrations(engine)
     uvicorn.run(app, host="0.0.0.0", port=int(os.getenv("PORT", 8000)))  # nosec
@@ -0,0 +1 @@
+"""Benchmarks and load-testing harness (not part of the deployed app)."""
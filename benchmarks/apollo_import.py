@@ -0,0 +1,144 @@
+"""
+Apollo import benchmark: DataProcessor._parse_csv_frame on a synthetic export.
+
+Writes an Apollo-style CSV (the 9 columns the importer uses plus filler
+columns, as in a real ~60-column export), then times the current import
+against the previous implementation (full-width read_csv, per-row apply
+for company_type, notes built per row) and checks that both produce the same rows.
+
+Run from the project root:
+    python -m benchmarks.apollo_import --rows 1000000
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.companies import company_notes, website_domain
+from src.data_processor import DataProcessor
+
+COMPARED_COLUMNS = ["recruiter_name", "recruiter_email", "company", "role", "company_type", "notes"]
+
+
+def write_export(path: Path, rows: int, companies: int, extra_columns: int, seed: int = 0):
+    """Write a synthetic Apollo export with realistic repetition per company."""
+    rng = np.random.default_rng(seed)
+    company_ids = rng.integers(0, companies, rows)
+    company_names = np.array([f"Company {i} Inc." for i in range(companies)], dtype=object)
+    employees = rng.choice(
+        np.array(["12", "49", "50", "120", "499", "500", "12000", "", "n/a"], dtype=object),
+        companies
+    )
+    industries = rng.choice(np.array(["Fintech", "Information Technology & Services", "Retail", ""], dtype=object), companies)
+    keywords = np.array([
+        ", ".join(f"keyword {(i * 7 + k) % 500}" for k in range(20)) for i in range(companies)
+    ], dtype=object)
+
+    frame = pd.DataFrame({
+        "First Name": rng.choice(np.array(["Jane", "John", "Ann", "Raj", ""], dtype=object), rows),
+        "Last Name": rng.choice(np.array(["Doe", "Roe", "Lee", "Shah"], dtype=object), rows),
+        "Title": rng.choice(np.array(["Recruiter", "Talent Partner", ""], dtype=object), rows),
+        "Email": [f"person{i}@company{c}.com" for i, c in enumerate(company_ids)],
+        "Company Name": company_names[company_ids],
+        "# Employees": employees[company_ids],
+        "Industry": industries[company_ids],
+        "Keywords": keywords[company_ids],
+        "Website": [f"https://www.company{c}.com" for c in company_ids],
+    })
+    for i in range(extra_columns):
+        frame[f"Extra {i}"] = "x" * 12
+    frame.to_csv(path, index=False)
+
+
+def legacy_read(path: Path) -> pd.DataFrame:
+    """The previous import: every column parsed, company_type and notes per row."""
+    df = pd.read_csv(path)
+    df['recruiter_name'] = df['First Name'].fillna('') + ' ' + df['Last Name'].fillna('')
+    df['recruiter_name'] = df['recruiter_name'].str.strip()
+    df['recruiter_email'] = df['Email']
+    df['company'] = df['Company Name']
+    df['role'] = df.get('Title', 'AI/ML Engineer').fillna('AI/ML Engineer')
+
+    def get_company_type(employees):
+        try:
+            emp = int(employees)
+            if emp < 50:
+                return 'startup'
+            elif emp < 500:
+                return 'mid-size'
+            else:
+                return 'enterprise'
+        except (ValueError, TypeError):
+            return 'unknown'
+
+    df['company_type'] = df['# Employees'].apply(get_company_type)
+    df['notes'] = [company_notes(i, k) for i, k in zip(df['Industry'].fillna(''), df['Keywords'].fillna(''))]
+    df['company_domain'] = df['Website'].fillna('').map(website_domain)
+    return df[COMPARED_COLUMNS + ['company_domain']]
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def run(rows: int, companies: int, extra_columns: int, skip_legacy: bool = False) -> Dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "apollo.csv"
+        _, write_s = timed(write_export, path, rows, companies, extra_columns)
+
+        current, current_s = timed(DataProcessor()._parse_csv_frame, str(path))
+        report = {
+            "config": {"rows": rows, "companies": companies, "columns": 9 + extra_columns},
+            "csv_mb": round(path.stat().st_size / 1e6, 1),
+            "write_s": round(write_s, 2),
+            "current_s": round(current_s, 2),
+            "current_rows_per_s": round(rows / current_s),
+        }
+        if not skip_legacy:
+            legacy, legacy_s = timed(legacy_read, path)
+            pd.testing.assert_frame_equal(
+                current[COMPARED_COLUMNS + ['company_domain']].reset_index(drop=True),
+                legacy.reset_index(drop=True),
+                check_dtype=False
+            )
+            report.update(legacy_s=round(legacy_s, 2), speedup=round(legacy_s / current_s, 2))
+        return report
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Rows in the synthetic export")
+    parser.add_argument("--companies", type=int, default=50_000, help="Distinct companies")
+    parser.add_argument("--extra-columns", type=int, default=51, help="Unused filler columns")
+    parser.add_argument("--skip-legacy", action="store_true", help="Only time the current import")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> Dict:
+    args = parse_args(argv)
+    report = run(args.rows, args.companies, args.extra_columns, args.skip_legacy)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"Rows: {report['config']['rows']:,}  columns: {report['config']['columns']}  CSV: {report['csv_mb']} MB")
+        print(f"current: {report['current_s']}s ({report['current_rows_per_s']} rows/s)")
+        if "legacy_s" in report:
+            print(f"legacy:  {report['legacy_s']}s  speedup: {report['speedup']}x (outputs identical)")
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Columnar cache benchmark: parsing an Apollo export vs loading its Arrow
+sidecar (src/columnar_cache.py).
+
+Writes a synthetic Apollo export of about --size-mb megabytes (see
+benchmarks/apollo_import.py), then times:
+
+- csv: parsing and converting the CSV (every uncached load)
+- first load: hashing, parsing and writing the sidecar
+- sidecar: a repeat load (e.g. the next CLI command), hashing and
+  memory-mapping the sidecar
+- sidecar, recruiter columns: a repeat load of only the columns the CLI
+  reads (RECRUITER_COLUMNS)
+
+and checks that the sidecar load returns the parsed rows. Needs pyarrow.
+
+Run from the project root:
+    python -m benchmarks.columnar_cache --size-mb 500
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict
+
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from benchmarks.apollo_import import write_export
+from src import columnar_cache
+from src.data_processor import RECRUITER_COLUMNS, DataProcessor
+
+SAMPLE_ROWS = 2_000
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def rows_for_size(directory: Path, size_mb: float, extra_columns: int) -> int:
+    """Rows needed for an export of about size_mb, measured on a small sample."""
+    sample = directory / "sample.csv"
+    write_export(sample, SAMPLE_ROWS, max(SAMPLE_ROWS // 20, 1), extra_columns)
+    bytes_per_row = sample.stat().st_size / SAMPLE_ROWS
+    sample.unlink()
+    return max(int(size_mb * 1e6 / bytes_per_row), 1)
+
+
+def run(size_mb: float, extra_columns: int = 51) -> Dict:
+    if not columnar_cache.enabled():
+        raise SystemExit("pyarrow is not installed (or COLUMNAR_CACHE=off): nothing to compare")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        rows = rows_for_size(directory, size_mb, extra_columns)
+        path = directory / "apollo.csv"
+        write_export(path, rows, max(rows // 20, 1), extra_columns)
+        processor = DataProcessor()
+
+        parsed, csv_s = timed(processor._parse_csv_frame, str(path))
+        sha256, hash_s = timed(columnar_cache.file_sha256, path)
+        _, first_s = timed(processor._read_csv_frame, str(path), cache=True)
+        cached, sidecar_s = timed(processor._read_csv_frame, str(path), cache=True)
+        projected, projected_s = timed(processor._read_csv_frame, str(path), cache=True, columns=RECRUITER_COLUMNS)
+
+        pd.testing.assert_frame_equal(cached, parsed.reset_index(drop=True), check_dtype=False)
+        assert list(projected.columns) == RECRUITER_COLUMNS
+
+        return {
+            "rows": rows,
+            "csv_mb": round(path.stat().st_size / 1e6, 1),
+            "sidecar_mb": round(columnar_cache.sidecar_path(path, sha256).stat().st_size / 1e6, 1),
+            "csv_s": round(csv_s, 2),
+            "hash_s": round(hash_s, 2),
+            "first_load_s": round(first_s, 2),
+            "sidecar_s": round(sidecar_s, 2),
+            "sidecar_recruiter_columns_s": round(projected_s, 2),
+            "speedup": round(csv_s / sidecar_s, 1),
+            "speedup_recruiter_columns": round(csv_s / projected_s, 1),
+        }
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=float, default=500, help="Approximate size of the synthetic export")
+    parser.add_argument("--extra-columns", type=int, default=51, help="Unused filler columns")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> Dict:
+    args = parse_args(argv)
+    report = run(args.size_mb, args.extra_columns)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"Rows: {report['rows']:,}  CSV: {report['csv_mb']} MB  sidecar: {report['sidecar_mb']} MB")
+        print(f"csv:                {report['csv_s']}s")
+        print(f"first load:         {report['first_load_s']}s (parse + write sidecar; hashing {report['hash_s']}s)")
+        print(f"sidecar:            {report['sidecar_s']}s  speedup: {report['speedup']}x (includes hashing)")
+        print(f"sidecar, projected: {report['sidecar_recruiter_columns_s']}s  "
+              f"speedup: {report['speedup_recruiter_columns']}x")
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Email validation benchmark: src.email_validation.validate_frame on a
+synthetic import.
+
+Builds a DataFrame of addresses with realistic noise (mixed case, padding,
+duplicates, invalid, disposable and role addresses), times validation and
+prints the rejection counts.
+
+Run from the project root:
+    python -m benchmarks.email_validation --rows 1000000
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.email_validation import validate_frame
+
+
+def make_frame(rows: int, domains: int = 20_000, seed: int = 0) -> pd.DataFrame:
+    """Addresses where ~5% are duplicates, ~1% invalid, ~1% disposable and ~1% role mailboxes."""
+    rng = np.random.default_rng(seed)
+    ids = np.arange(rows)
+    # ~5% of rows repeat another row's address
+    repeated = rng.random(rows) < 0.05
+    ids[repeated] = rng.integers(0, max(rows, 1), repeated.sum())
+    emails = [f"  Person.{i}@Company{i % domains}.com " for i in ids]
+    noise = rng.random(rows)
+    for i in np.flatnonzero(noise < 0.01):
+        emails[i] = f"person{i} at company.com"
+    for i in np.flatnonzero((noise >= 0.01) & (noise < 0.02)):
+        emails[i] = f"person{i}@mailinator.com"
+    for i in np.flatnonzero((noise >= 0.02) & (noise < 0.03)):
+        emails[i] = f"careers@company{i}.com"
+    return pd.DataFrame({"recruiter_name": "Jane", "recruiter_email": emails})
+
+
+def run(rows: int) -> Dict:
+    df = make_frame(rows)
+
+    start = time.perf_counter()
+    _, report = validate_frame(df)
+    seconds = time.perf_counter() - start
+
+    return {
+        "rows": rows,
+        "seconds": round(seconds, 3),
+        "rows_per_s": round(rows / seconds) if seconds else None,
+        "accepted": report["accepted"],
+        "rejected": report["rejected"],
+        "flagged": report["flagged"],
+    }
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Addresses to validate")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> Dict:
+    args = parse_args(argv)
+    result = run(args.rows)
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(f"Rows: {result['rows']:,}")
+        print(f"validate_frame: {result['seconds']}s ({result['rows_per_s']} rows/s)")
+        print(f"  accepted={result['accepted']} rejected={result['rejected']} flagged={result['flagged']}")
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""
+Local stand-in servers for the Gmail API, Gemini API, Google OAuth token
+endpoint and Stripe API, used by the load-testing harness.
+
+Each server answers with canned JSON after a configurable latency (plus
+jitter) and fails a configurable fraction of requests with 429/503, so
+throughput can be measured without touching real Google or Stripe endpoints.
+"""
+
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+
+Handler = Callable[[str, Dict], Tuple[int, Dict]]
+
+
+class SSE(list):
+    """Handler payload sent as a server-sent event stream, one event per item.
+
+    The profile latency is spread over the events, so the first one arrives
+    after latency / len(events) like a streamed model response.
+    """
+
+
+@dataclass
+class FakeProfile:
+    """Latency and error behaviour of a stand-in server."""
+
+    latency: float = 0.0  # seconds
+    jitter: float = 0.0  # +/- seconds, uniform
+    error_rate: float = 0.0  # fraction of requests answered with error_status
+    error_status: int = 503
+
+    def delay(self) -> float:
+        return max(0.0, self.latency + random.uniform(-self.jitter, self.jitter))
+
+
+@dataclass
+class CallLog:
+    """Per-route latencies observed by a stand-in server."""
+
+    latencies: Dict[str, List[float]] = field(default_factory=dict)
+    errors: Dict[str, int] = field(default_factory=dict)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def record(self, route: str, seconds: float, error: bool):
+        with self.lock:
+            self.latencies.setdefault(route, []).append(seconds)
+            if error:
+                self.errors[route] = self.errors.get(route, 0) + 1
+
+
+class FakeServer:
+    """Threaded HTTP server dispatching POST requests to route handlers."""
+
+    def __init__(self, name: str, routes: List[Tuple[str, Handler]], profile: Optional[FakeProfile] = None):
+        self.name = name
+        self.routes = routes
+        self.profile = profile or FakeProfile()
+        self.calls = CallLog()
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeServer":
+        server = self
+
+        class RequestHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                start = time.perf_counter()
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                path = self.path.split("?", 1)[0]
+                route, handler = server._match(path)
+
+                delay = server.profile.delay()
+                failed = random.random() < server.profile.error_rate
+                if handler is None:
+                    status, payload = 404, {"error": {"code": 404, "message": f"No route for {path}"}}
+                elif failed:
+                    status = server.profile.error_status
+                    payload = {"error": {"code": status, "message": "Injected failure", "status": "UNAVAILABLE"}}
+                else:
+                    status, payload = handler(path, _parse_body(raw, self.headers.get("Content-Type", "")))
+
+                if isinstance(payload, SSE) and status < 400:
+                    self._stream(payload, delay)
+                    server.calls.record(route or path, time.perf_counter() - start, False)
+                    return
+
+                time.sleep(delay)
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                if status == 429:
+                    self.send_header("Retry-After", "1")
+                self.end_headers()
+                self.wfile.write(body)
+                server.calls.record(route or path, time.perf_counter() - start, status >= 400)
+
+            def _stream(self, events: SSE, delay: float):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for event in events:
+                    time.sleep(delay / max(1, len(events)))
+                    data = f"data: {json.dumps(event)}\r\n\r\n".encode()
+                    self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                    self.wfile.flush()
+                self.wfile.write(b"0\r\n\r\n")
+
+            def log_message(self, format, *args):
+                pass  # keep benchmark output clean
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), RequestHandler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name=f"fake-{self.name}", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+
+    def _match(self, path: str):
+        for route, handler in self.routes:
+            if route.endswith("*") and path.startswith(route[:-1]):
+                return route, handler
+            if path == route:
+                return route, handler
+        return None, None
+
+
+def _parse_body(raw: bytes, content_type: str) -> Dict:
+    if not raw:
+        return {}
+    if "json" in content_type:
+        return json.loads(raw)
+    # OAuth token and Stripe requests are form encoded
+    from urllib.parse import parse_qs
+    return {k: v[0] for k, v in parse_qs(raw.decode()).items()}
+
+
+# Route handlers
+# --------------
+
+def _gmail_create_draft(path: str, body: Dict):
+    return 200, {"id": f"r-{uuid.uuid4().hex[:16]}", "message": {"id": uuid.uuid4().hex[:16]}}
+
+
+def _gmail_send(path: str, body: Dict):
+    return 200, {"id": uuid.uuid4().hex[:16], "threadId": uuid.uuid4().hex[:16], "labelIds": ["SENT"]}
+
+
+def _oauth_token(path: str, body: Dict):
+    return 200, {"access_token": f"fake-{uuid.uuid4().hex}", "expires_in": 3600, "token_type": "Bearer"}
+
+
+FAKE_EMAIL = (
+    "Subject: Agentic Workflows // Ansh Agrawal (Motilal Oswal)\n\n"
+    "Hi there,\n\nI've been building multi-agent systems at Motilal Oswal.\n\nBest, Ansh"
+)
+
+
+def _gemini_generate(path: str, body: Dict):
+    text = FAKE_EMAIL
+    if body.get("generationConfig", {}).get("responseMimeType") == "application/json":
+        # Batched mode: one item per "[n]" recipient section in the prompt
+        prompt = "".join(p.get("text", "") for c in body.get("contents", []) for p in c.get("parts", []))
+        subject, _, email_body = FAKE_EMAIL.partition("\n\n")
+        text = json.dumps([
+            {"id": int(n), "subject": subject[len("Subject: "):], "body": email_body}
+            for n in re.findall(r"^\[(\d+)\]$", prompt, re.MULTILINE)
+        ])
+    return 200, {
+        "candidates": [{
+            "content": {"role": "model", "parts": [{"text": text}]},
+            "finishReason": "STOP",
+        }],
+        "usageMetadata": {"promptTokenCount": 400, "candidatesTokenCount": 80, "totalTokenCount": 480},
+    }
+
+
+def _gemini_stream(path: str, body: Dict):
+    """streamGenerateContent: FAKE_EMAIL split into a few text chunks."""
+    words = FAKE_EMAIL.split(" ")
+    size = max(1, len(words) // 4)
+    chunks = [" ".join(words[i:i + size]) + (" " if i + size < len(words) else "") for i in range(0, len(words), size)]
+    return 200, SSE(
+        {"candidates": [{"content": {"role": "model", "parts": [{"text": chunk}]}}]}
+        for chunk in chunks
+    )
+
+
+def _stripe_checkout(path: str, body: Dict):
+    session_id = f"cs_test_{uuid.uuid4().hex[:24]}"
+    return 200, {"id": session_id, "object": "checkout.session", "url": f"https://checkout.stripe.test/{session_id}"}
+
+
+def gmail_server(profile: Optional[FakeProfile] = None) -> FakeServer:
+    return FakeServer("gmail", [
+        ("/gmail/v1/users/me/drafts/send", _gmail_send),
+        ("/gmail/v1/users/me/drafts", _gmail_create_draft),
+        ("/gmail/v1/users/me/messages/send", _gmail_send),
+    ], profile)
+
+
+def oauth_server(profile: Optional[FakeProfile] = None) -> FakeServer:
+    return FakeServer("oauth", [("/token", _oauth_token)], profile)
+
+
+def gemini_server(profile: Optional[FakeProfile] = None) -> FakeServer:
+    def route(path: str, body: Dict):
+        if path.endswith(":streamGenerateContent"):
+            return _gemini_stream(path, body)
+        return _gemini_generate(path, body)
+
+    return FakeServer("gemini", [("/v1beta/models/*", route)], profile)
+
+
+def stripe_server(profile: Optional[FakeProfile] = None) -> FakeServer:
+    return FakeServer("stripe", [("/v1/checkout/sessions", _stripe_checkout)], profile)
@@ -0,0 +1,133 @@
+"""
+JSON response benchmark: rendering list endpoints before and after
+FastJSONResponse (src/responses.py).
+
+Builds N EmailLog rows in memory and times rendering the response body:
+
+- history, before: dicts with isoformat() per datetime, jsonable_encoder,
+  JSONResponse (what /api/history did)
+- history, after: dicts with raw datetimes, FastJSONResponse
+- drafts, before: ORM objects through jsonable_encoder (what /api/drafts did)
+- drafts, after: the listed columns only (serialize_log), FastJSONResponse
+
+and checks that the history bodies decode to the same rows.
+
+Run from the project root:
+    python -m benchmarks.json_responses --rows 10000
+"""
+
+import argparse
+import json
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from src.dashboard import serialize_log
+from src.models import EmailLog
+from src.responses import HAS_ORJSON, FastJSONResponse
+
+
+def make_logs(rows: int) -> List[EmailLog]:
+    start = datetime(2025, 1, 1, 9, 30)
+    return [
+        EmailLog(
+            id=i,
+            user_id=1,
+            recipient_email=f"person{i}@company{i % 500}.com",
+            recipient_name=f"Person {i}",
+            company=f"Company {i % 500}",
+            subject=f"Quick question about the ML Engineer role #{i}",
+            status="sent" if i % 3 else "draft",
+            created_at=start + timedelta(minutes=i, microseconds=i),
+            sent_at=start + timedelta(minutes=i + 5) if i % 3 else None,
+            gmail_draft_id=f"r-{i:012d}",
+        )
+        for i in range(rows)
+    ]
+
+
+def legacy_history(logs) -> bytes:
+    rows = [
+        {
+            "id": log.id,
+            "recipient_email": log.recipient_email,
+            "recipient_name": log.recipient_name,
+            "company": log.company,
+            "subject": log.subject,
+            "status": log.status,
+            "created_at": log.created_at.isoformat() if log.created_at else None,
+            "sent_at": log.sent_at.isoformat() if log.sent_at else None,
+        }
+        for log in logs
+    ]
+    return JSONResponse(jsonable_encoder(rows)).body
+
+
+def fast_history(logs) -> bytes:
+    return FastJSONResponse([serialize_log(log) for log in logs]).body
+
+
+def legacy_drafts(logs) -> bytes:
+    return JSONResponse(jsonable_encoder(logs)).body
+
+
+def fast_drafts(logs) -> bytes:
+    return FastJSONResponse([serialize_log(log) for log in logs]).body
+
+
+def best_of(fn, logs, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(logs)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(rows: int, repeat: int = 5) -> Dict:
+    logs = make_logs(rows)
+    assert json.loads(legacy_history(logs)) == json.loads(fast_history(logs))
+
+    timings = {name: best_of(fn, logs, repeat) for name, fn in [
+        ("history_before", legacy_history),
+        ("history_after", fast_history),
+        ("drafts_before", legacy_drafts),
+        ("drafts_after", fast_drafts),
+    ]}
+    report = {"rows": rows, "orjson": HAS_ORJSON}
+    report.update({f"{name}_ms": round(seconds * 1000, 1) for name, seconds in timings.items()})
+    report["history_speedup"] = round(timings["history_before"] / timings["history_after"], 1)
+    report["drafts_speedup"] = round(timings["drafts_before"] / timings["drafts_after"], 1)
+    return report
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000, help="History rows to serialize")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per variant (best is reported)")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> Dict:
+    args = parse_args(argv)
+    report = run(args.rows, args.repeat)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"Rows: {report['rows']:,}  orjson: {report['orjson']}")
+        print(f"history: {report['history_before_ms']} ms -> {report['history_after_ms']} ms ({report['history_speedup']}x)")
+        print(f"drafts:  {report['drafts_before_ms']} ms -> {report['drafts_after_ms']} ms ({report['drafts_speedup']}x)")
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,324 @@
+"""
+End-to-end load test: /api/upload -> /api/draft -> /api/send-all.
+
+Starts local stand-in servers for Gmail, Gemini, the OAuth token endpoint
+and Stripe, boots the API with uvicorn against a temporary SQLite database,
+then runs the pipeline for several concurrent users and reports throughput
+and p50/p95/p99 latency per stage.
+
+Run from the project root:
+    python -m benchmarks.load_test --users 10 --contacts 50 --gemini-latency 0.8
+"""
+
+import argparse
+import asyncio
+import csv
+import hashlib
+import hmac
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from benchmarks.fakes import FakeProfile, gemini_server, gmail_server, oauth_server, stripe_server
+
+WEBHOOK_SECRET = "whsec_loadtest"
+STAGES = ["checkout", "upload", "preview", "draft", "send"]
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, int(round(pct / 100 * len(ordered) + 0.5)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def summarize(samples: List[float]) -> Dict:
+    return {
+        "count": len(samples),
+        "p50_ms": round(percentile(samples, 50) * 1000, 1),
+        "p95_ms": round(percentile(samples, 95) * 1000, 1),
+        "p99_ms": round(percentile(samples, 99) * 1000, 1),
+    }
+
+
+def make_csv(user_index: int, contacts: int) -> bytes:
+    """Synthetic recruiter CSV in the standard format."""
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(["recruiter_name", "recruiter_email", "company", "role", "company_type", "notes"])
+    for i in range(contacts):
+        writer.writerow([
+            f"Recruiter {i}", f"r{i}.u{user_index}@company{i % 97}.test", f"Company {i % 97}",
+            "Talent Partner", "startup", "AI | Keywords: machine learning, agents",
+        ])
+    return buf.getvalue().encode()
+
+
+def stripe_webhook(credits: int, user_id: int):
+    """Signed checkout.session.completed payload, as Stripe would send it."""
+    payload = json.dumps({
+        "id": "evt_loadtest",
+        "object": "event",
+        "type": "checkout.session.completed",
+        "data": {"object": {"client_reference_id": str(user_id), "metadata": {"credits_amount": str(credits)}}},
+    })
+    timestamp = int(time.time())
+    signature = hmac.new(WEBHOOK_SECRET.encode(), f"{timestamp}.{payload}".encode(), hashlib.sha256).hexdigest()
+    return payload, f"t={timestamp},v1={signature}"
+
+
+class Harness:
+    """Boots the fakes and the API, then drives users through the pipeline."""
+
+    def __init__(self, args):
+        self.args = args
+        self.samples: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+        self.stage_windows: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+        self.errors: Dict[str, int] = {stage: 0 for stage in STAGES}
+        self.first_preview: List[float] = []  # time to the first streamed preview email
+        self.fakes = {
+            "gmail": gmail_server(FakeProfile(args.gmail_latency, args.jitter, args.error_rate)),
+            "gemini": gemini_server(FakeProfile(args.gemini_latency, args.jitter, args.error_rate)),
+            "oauth": oauth_server(FakeProfile(args.oauth_latency, args.jitter)),
+            "stripe": stripe_server(FakeProfile(args.stripe_latency, args.jitter)),
+        }
+        self.workdir = Path(tempfile.mkdtemp(prefix="outreach-load-"))
+
+    def start(self):
+        for fake in self.fakes.values():
+            fake.start()
+
+        # Everything the app reads at import time must be set before importing it
+        os.environ.update({
+            "DATABASE_URL": f"sqlite:///{self.workdir / 'load.db'}",
+            "AUTO_MIGRATE": "true",
+            "LOG_DIR": str(self.workdir / "logs"),
+            "UPLOAD_DIR": str(self.workdir / "uploads"),
+            "GMAIL_API_ENDPOINT": self.fakes["gmail"].url,
+            "GOOGLE_TOKEN_URI": f"{self.fakes['oauth'].url}/token",
+            "GEMINI_BASE_URL": self.fakes["gemini"].url,
+            "GEMINI_API_KEY": "fake-gemini-key",
+            "STRIPE_API_BASE": self.fakes["stripe"].url,
+            "STRIPE_SECRET_KEY": "sk_test_loadtest",
+            "STRIPE_WEBHOOK_SECRET": WEBHOOK_SECRET,
+            "GOOGLE_CLIENT_ID": "loadtest-client",
+            "GOOGLE_CLIENT_SECRET": "loadtest-secret",
+            # The synthetic company{i}.test domains do not resolve: real MX
+            # checks would mark every contact undeliverable (or time out offline)
+            "DELIVERABILITY_RESOLVER": "none",
+        })
+        os.chdir(PROJECT_ROOT)  # templates/ and config/ are relative paths
+
+        import uvicorn
+        from app import app
+
+        app.state.limiter.enabled = False  # per-IP limits would throttle every simulated user
+        config = uvicorn.Config(app, host="127.0.0.1", port=self.args.port, log_level="warning", access_log=False)
+        self.server = uvicorn.Server(config)
+        self.server_thread = threading.Thread(target=self.server.run, daemon=True)
+        self.server_thread.start()
+        while not self.server.started:
+            time.sleep(0.05)
+        port = self.server.servers[0].sockets[0].getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{port}"
+
+    def stop(self):
+        self.server.should_exit = True
+        self.server_thread.join(timeout=10)
+        for fake in self.fakes.values():
+            fake.stop()
+
+    def create_user(self, index: int) -> Dict:
+        """Create a Gmail-connected user directly in the DB and return its id and JWT.
+
+        Tokens are stored already expired, so every Gmail client exercises the
+        OAuth refresh endpoint the way a returning user would.
+        """
+        from src.auth import create_access_token
+        from src.database import SessionLocal
+        from src.models import User
+
+        db = SessionLocal()
+        try:
+            user = User(
+                email=f"loadtest{index}@example.test",
+                name=f"Load Test {index}",
+                access_token="expired-token",
+                refresh_token="refresh-token",
+                token_expiry=datetime.utcnow() - timedelta(minutes=5),
+                credits=0,
+            )
+            db.add(user)
+            db.commit()
+            return {"id": user.id, "token": create_access_token(data={"sub": str(user.id)})}
+        finally:
+            db.close()
+
+    async def timed(self, stage: str, coro):
+        start = time.perf_counter()
+        try:
+            return await coro
+        except Exception as e:
+            self.errors[stage] += 1
+            print(f"[{stage}] {type(e).__name__}: {e}", file=sys.stderr)
+            return None
+        finally:
+            end = time.perf_counter()
+            self.samples[stage].append(end - start)
+            self.stage_windows[stage].extend([start, end])
+
+    async def run_user(self, client, index: int):
+        me = await asyncio.to_thread(self.create_user, index)
+        headers = {"Authorization": f"Bearer {me['token']}"}
+
+        async def checkout():
+            r = await client.post(
+                "/api/stripe/create-checkout-session",
+                json={"credits": self.args.contacts, "amount": 500}, headers=headers,
+            )
+            r.raise_for_status()
+            payload, signature = stripe_webhook(self.args.contacts, me["id"])
+            r = await client.post("/api/stripe/webhook", content=payload, headers={"stripe-signature": signature})
+            r.raise_for_status()
+
+        async def upload():
+            files = {"file": (f"contacts_{index}.csv", make_csv(index, self.args.contacts), "text/csv")}
+            r = await client.post("/api/upload", files=files, headers=headers)
+            r.raise_for_status()
+
+        async def preview():
+            start = time.perf_counter()
+            first = None
+            params = {"limit": self.args.preview_limit}
+            async with client.stream("GET", "/api/preview/stream", params=params, headers=headers) as r:
+                r.raise_for_status()
+                async for line in r.aiter_lines():
+                    if first is None and line and json.loads(line)["type"] == "email":
+                        first = time.perf_counter() - start
+                        self.first_preview.append(first)
+
+        async def draft():
+            r = await client.post("/api/draft", data={"use_llm": str(self.args.use_llm).lower()}, headers=headers)
+            r.raise_for_status()
+
+        async def send():
+            r = await client.post("/api/send-all", params={"delay_seconds": 0}, headers=headers)
+            r.raise_for_status()
+            queued = r.json()["queued"]
+            deadline = time.monotonic() + self.args.timeout
+            # Sending happens in a background task; the stage ends when every draft is sent
+            while time.monotonic() < deadline:
+                stats = (await client.get("/api/stats", headers=headers)).json()
+                if stats["total_sent"] >= queued:
+                    return
+                await asyncio.sleep(self.args.poll_interval)
+            raise TimeoutError(f"{queued - stats['total_sent']} drafts still unsent")
+
+        await self.timed("checkout", checkout())
+        await self.timed("upload", upload())
+        await self.timed("preview", preview())
+        await self.timed("draft", draft())
+        await self.timed("send", send())
+
+    async def run(self):
+        import httpx
+
+        limits = httpx.Limits(max_connections=self.args.users * 2)
+        async with httpx.AsyncClient(base_url=self.base_url, timeout=self.args.timeout, limits=limits) as client:
+            await asyncio.gather(*(self.run_user(client, i) for i in range(self.args.users)))
+
+    def report(self) -> Dict:
+        contacts_total = self.args.users * self.args.contacts
+        stages = {}
+        for stage in STAGES:
+            window = self.stage_windows[stage]
+            wall = (max(window) - min(window)) if window else 0.0
+            units = {
+                "checkout": self.args.users,
+                "preview": self.args.users * min(self.args.preview_limit, self.args.contacts),
+            }.get(stage, contacts_total)
+            stages[stage] = {
+                **summarize(self.samples[stage]),
+                "errors": self.errors[stage],
+                "wall_s": round(wall, 3),
+                "throughput_per_s": round(units / wall, 1) if wall else None,
+                "unit": "users" if stage == "checkout" else "contacts",
+            }
+        stages["preview"]["first_email"] = summarize(self.first_preview)
+        upstream = {}
+        for name, fake in self.fakes.items():
+            for route, latencies in fake.calls.latencies.items():
+                upstream[f"{name} {route}"] = {**summarize(latencies), "errors": fake.calls.errors.get(route, 0)}
+        return {
+            "config": {k: v for k, v in vars(self.args).items() if k != "json"},
+            "stages": stages,
+            "upstream": upstream,
+        }
+
+
+def print_report(report: Dict):
+    print(f"\nUsers: {report['config']['users']}  contacts/user: {report['config']['contacts']}  "
+          f"use_llm: {report['config']['use_llm']}")
+    header = f"{'stage':<10}{'n':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}{'wall s':>9}  throughput"
+    print(header)
+    print("-" * len(header))
+    for stage, s in report["stages"].items():
+        throughput = f"{s['throughput_per_s']} {s['unit']}/s" if s["throughput_per_s"] else "-"
+        print(f"{stage:<10}{s['count']:>6}{s['p50_ms']:>10}{s['p95_ms']:>10}{s['p99_ms']:>10}"
+              f"{s['errors']:>8}{s['wall_s']:>9}  {throughput}")
+    first = report["stages"]["preview"]["first_email"]
+    print(f"\nStreaming preview, time to first email: p50={first['p50_ms']}ms p95={first['p95_ms']}ms")
+    print("\nUpstream calls (stand-in server side):")
+    for route, s in report["upstream"].items():
+        print(f"  {route:<45} n={s['count']:<6} p50={s['p50_ms']}ms p95={s['p95_ms']}ms errors={s['errors']}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=5, help="Concurrent simulated users")
+    parser.add_argument("--contacts", type=int, default=20, help="Contacts per user CSV")
+    parser.add_argument("--preview-limit", type=int, default=5, help="Contacts per streaming preview")
+    parser.add_argument("--no-llm", dest="use_llm", action="store_false", help="Use templates instead of Gemini")
+    parser.add_argument("--gemini-latency", type=float, default=0.5, help="Seconds per Gemini call")
+    parser.add_argument("--gmail-latency", type=float, default=0.1, help="Seconds per Gmail call")
+    parser.add_argument("--oauth-latency", type=float, default=0.05, help="Seconds per token refresh")
+    parser.add_argument("--stripe-latency", type=float, default=0.2, help="Seconds per Stripe call")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Uniform +/- latency jitter (seconds)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of Gmail/Gemini calls failing with 503")
+    parser.add_argument("--port", type=int, default=0, help="Port for the API under test (0 = any free port)")
+    parser.add_argument("--timeout", type=float, default=600, help="Per-request and send-completion timeout")
+    parser.add_argument("--poll-interval", type=float, default=0.2, help="Stats polling interval during send")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> Dict:
+    args = parse_args(argv)
+    harness = Harness(args)
+    harness.start()
+    try:
+        asyncio.run(harness.run())
+    finally:
+        harness.stop()
+    report = harness.report()
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    return report
+
+
+if __name__ == "__main__":
+    main()
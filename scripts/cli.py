@@ -16,11 +16,10 @@ from rich.panel import Panel
 from rich.prompt import Confirm
 from rich import print as rprint
 
-from src.data_processor import DataProcessor
-from src.email_generator import EmailGenerator
 from src.tracker import EmailTracker
-from src.gmail_client import GmailClient
-from src.utils import load_env
+
+# pandas, jinja2 and the Google API client are imported by the accessors below
+# so that commands like `stats` and `history` start instantly.
 
 
 def get_generator(use_llm: bool = False):
@@ -28,9 +27,40 @@ def get_generator(use_llm: bool = False):
     if use_llm:
         from src.llm_generator import LLMEmailGenerator
         return LLMEmailGenerator()
+    from src.email_generator import EmailGenerator
     return EmailGenerator()
 
 
+def get_processor():
+    """Get a DataProcessor (imports pandas)."""
+    from src.data_processor import DataProcessor
+    return DataProcessor()
+
+
+def get_gmail_client():
+    """Get a GmailClient (imports the Google API client)."""
+    from src.gmail_client import GmailClient
+    return GmailClient()
+
+
+def load_unsent(input_file: str, tracker: EmailTracker, limit: int = None):
+    """Load recruiters and drop already-contacted ones with a single DataFrame anti-join.
+    
+    preview, draft and send usually run on the same file, so parsed CSVs are
+    kept as Arrow sidecars when pyarrow is installed (src/columnar_cache.py),
+    and only the columns the generators read are loaded.
+    
+    Returns:
+        Tuple of (number loaded, list of unsent recruiter dicts)
+    """
+    from src.data_processor import RECRUITER_COLUMNS
+    
+    df = get_processor().load_dataframe(input_file, cache=True, columns=RECRUITER_COLUMNS)
+    if limit:
+        df = df.head(limit)
+    return len(df), tracker.filter_unsent_df(df).to_dict('records')
+
+
 console = Console()
 
 
@@ -51,18 +81,11 @@ def preview(input_file: str, template: str, limit: int, llm: bool):
     mode_text = "🤖 LLM Preview Mode" if llm else "📧 Email Preview Mode"
     console.print(Panel.fit(mode_text, style="bold blue"))
     
-    # Load data
-    processor = DataProcessor()
-    recruiters = processor.load(input_file)
-    
-    if limit:
-        recruiters = recruiters[:limit]
-    
-    console.print(f"Loaded {len(recruiters)} recruiters from {input_file}")
-    
-    # Filter already contacted
+    # Load data and filter already contacted
     tracker = EmailTracker()
-    recruiters = tracker.filter_unsent(recruiters)
+    loaded, recruiters = load_unsent(input_file, tracker, limit)
+    
+    console.print(f"Loaded {loaded} recruiters from {input_file}")
     console.print(f"After filtering: {len(recruiters)} new contacts")
     
     if not recruiters:
@@ -93,11 +116,8 @@ def draft(input_file: str, template: str, attachment: str, llm: bool):
     console.print(Panel.fit(mode_text, style="bold yellow"))
     
     # Load and process
-    processor = DataProcessor()
-    recruiters = processor.load(input_file)
-    
     tracker = EmailTracker()
-    recruiters = tracker.filter_unsent(recruiters)
+    _, recruiters = load_unsent(input_file, tracker)
     
     console.print(f"Creating drafts for {len(recruiters)} recruiters")
     
@@ -112,7 +132,7 @@ def draft(input_file: str, template: str, attachment: str, llm: bool):
     
     # Generate emails
     generator = get_generator(use_llm=llm)
-    gmail = GmailClient()
+    gmail = get_gmail_client()
     
     if not gmail.authenticate():
         console.print("[red]Gmail authentication failed![/red]")
@@ -163,11 +183,8 @@ def send(input_file: str, template: str, delay: int, attachment: str, dry_run: b
     console.print(Panel.fit(f"🚀 {mode} Mode", style="bold green" if not dry_run else "bold magenta"))
     
     # Load and process
-    processor = DataProcessor()
-    recruiters = processor.load(input_file)
-    
     tracker = EmailTracker()
-    recruiters = tracker.filter_unsent(recruiters)
+    _, recruiters = load_unsent(input_file, tracker)
     
     console.print(f"Emails to send: {len(recruiters)}")
     console.print(f"Delay between emails: {delay}s")
@@ -183,8 +200,8 @@ def send(input_file: str, template: str, delay: int, attachment: str, dry_run: b
             return
     
     # Generate and send
-    generator = EmailGenerator()
-    gmail = GmailClient()
+    generator = get_generator()
+    gmail = get_gmail_client()
     
     if not dry_run and not gmail.authenticate():
         console.print("[red]Gmail authentication failed![/red]")
@@ -302,7 +319,7 @@ def templates():
     """List available email templates."""
     console.print(Panel.fit("📄 Available Templates", style="bold blue"))
     
-    generator = EmailGenerator()
+    generator = get_generator()
     templates = generator.get_available_templates()
     
     for name in templates:
@@ -326,12 +343,44 @@ def stats():
     console.print(f"  Failed: [red]{stats['failed']}[/red]")
 
 
+@cli.command()
+@click.option('--status', 'show_status', is_flag=True, help='Show applied and pending migrations without running them')
+def migrate(show_status: bool):
+    """Apply pending database schema migrations."""
+    console.print(Panel.fit("🗄️  Database Migrations", style="bold blue"))
+    
+    from src.database import engine
+    from src.migrations import MIGRATIONS, applied_versions, run_migrations
+    
+    if show_status:
+        done = applied_versions(engine)
+        table = Table(show_header=True)
+        table.add_column("Version", justify="right")
+        table.add_column("Name")
+        table.add_column("Applied")
+        for m in MIGRATIONS:
+            applied_at = done.get(m.version)
+            table.add_row(
+                str(m.version),
+                m.name,
+                f"[green]{applied_at:%Y-%m-%d %H:%M}[/green]" if applied_at else "[yellow]pending[/yellow]"
+            )
+        console.print(table)
+        return
+    
+    applied = run_migrations(engine)
+    if applied:
+        console.print(f"[green]Applied {len(applied)} migration(s).[/green]")
+    else:
+        console.print("[dim]Schema is up to date.[/dim]")
+
+
 @cli.command()
 def auth():
     """Test Gmail API authentication."""
     console.print(Panel.fit("🔐 Gmail Authentication", style="bold blue"))
     
-    gmail = GmailClient()
+    gmail = get_gmail_client()
     if gmail.test_connection():
         console.print("[green]Authentication successful![/green]")
     else:
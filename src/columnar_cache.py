@@ -0,0 +1,137 @@
+"""
+Columnar Cache Module
+Arrow IPC sidecars of parsed CSV files, for fast re-processing.
+
+Used by the CLI (scripts/cli.py), whose preview, draft and send commands
+load the same input file again and again; web uploads are parsed once and
+never cached. The first cached load of a CSV parses it (and converts Apollo
+exports) as usual, then writes the normalized DataFrame next to it as an
+uncompressed Arrow IPC (Feather v2) file named after the CSV and its SHA-256.
+Later loads of the same content memory-map the sidecar instead of parsing the
+CSV again, reading only the columns the caller asks for: unread columns of
+an uncompressed sidecar are never paged in. A changed file has a new hash,
+so a stale sidecar is never read.
+
+Each CSV keeps at most one sidecar: writing a new one deletes the CSV's older
+ones, and sidecars whose CSV is gone are deleted too.
+
+Needs the optional pyarrow package (`pip install pyarrow`, not in
+requirements.txt); without it (or with COLUMNAR_CACHE=off) CSVs are always
+parsed.
+"""
+
+import hashlib
+import importlib.util
+import os
+import re
+import uuid
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional
+
+import pandas as pd
+
+from src.logger import get_logger
+
+logger = get_logger("columnar_cache.log")
+
+# "auto" (on when pyarrow is installed) or "off"
+COLUMNAR_CACHE = os.getenv("COLUMNAR_CACHE", "auto")
+
+# Bump when the normalized frame changes shape, so old sidecars are ignored
+CACHE_FORMAT = 1
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+@lru_cache(maxsize=None)
+def enabled() -> bool:
+    """True when sidecars are read and written."""
+    return COLUMNAR_CACHE != "off" and importlib.util.find_spec("pyarrow") is not None
+
+
+def file_sha256(path) -> str:
+    """SHA-256 hex digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def sidecar_path(path, sha256: str) -> Path:
+    """Sidecar for a CSV with this content hash, hidden in the CSV's directory."""
+    path = Path(path)
+    return path.parent / f".{path.name}.{sha256}.v{CACHE_FORMAT}.arrow"
+
+
+_SIDECAR_NAME = re.compile(r"^\.(?P<csv>.+)\.[0-9a-f]{64}\.v\d+\.arrow$")
+
+
+def read(path, sha256: str, columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+    """
+    Memory-map the sidecar of a CSV and read it as a DataFrame.
+
+    Args:
+        path: CSV file
+        sha256: Content hash of the CSV
+        columns: Columns to read (None = all); missing ones are skipped
+
+    Returns:
+        The DataFrame, or None when there is no readable sidecar
+    """
+    import pyarrow as pa
+    from pyarrow import feather
+
+    sidecar = sidecar_path(path, sha256)
+    if not sidecar.exists():
+        return None
+    try:
+        table = feather.read_table(sidecar, memory_map=True)
+        if columns is not None:
+            table = table.select([c for c in columns if c in table.column_names])
+        return table.to_pandas()
+    except (pa.ArrowException, OSError) as e:
+        logger.warning("Unreadable columnar cache", path=str(sidecar), error=str(e))
+        return None
+
+
+def write(df: pd.DataFrame, path, sha256: str) -> bool:
+    """Write the sidecar of a CSV atomically (uncompressed, so it can be memory-mapped) and prune stale ones."""
+    import pyarrow as pa
+    from pyarrow import feather
+
+    sidecar = sidecar_path(path, sha256)
+    tmp = sidecar.with_name(f"{sidecar.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        feather.write_feather(df.reset_index(drop=True), tmp, compression="uncompressed")
+        os.replace(tmp, sidecar)
+    except (pa.ArrowException, OSError, TypeError, ValueError) as e:
+        # e.g. a column mixing numbers and text: keep parsing that file instead
+        tmp.unlink(missing_ok=True)
+        logger.warning("Columnar cache not written", path=str(sidecar), error=str(e))
+        return False
+    prune(sidecar.parent, keep=sidecar)
+    return True
+
+
+def prune(directory, keep: Optional[Path] = None) -> int:
+    """
+    Delete stale sidecars in a directory: older ones of the CSV that keep
+    belongs to, and those whose CSV no longer exists.
+
+    Returns:
+        Number of sidecars deleted
+    """
+    directory = Path(directory)
+    kept_csv = _SIDECAR_NAME.match(keep.name).group("csv") if keep is not None else None
+    removed = 0
+    for sidecar in directory.glob(".*.arrow"):
+        match = _SIDECAR_NAME.match(sidecar.name)
+        if match is None or sidecar == keep:
+            continue
+        csv = match.group("csv")
+        if csv == kept_csv or not (directory / csv).exists():
+            sidecar.unlink(missing_ok=True)
+            removed += 1
+    return removed
@@ -0,0 +1,283 @@
+"""
+Company Profiles Module
+Company context shared by all of a user's recruiters at the same company.
+
+Apollo exports repeat the company's industry, keyword list and website on
+every recruiter row. At import the rows are grouped by normalized company
+name and domain into one CompanyProfile each, holding the company type, a
+cleaned keyword set and, once a company has several contacts, a short
+LLM-written blurb. Generation then reads the profile instead of re-deriving
+the same company framing for every recruiter.
+"""
+
+import os
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from src.logger import get_logger
+
+logger = get_logger("companies.log")
+
+# Companies need at least this many contacts before a blurb is generated;
+# below it the extra Gemini call costs more than it saves
+COMPANY_BLURB_MIN_CONTACTS = int(os.getenv("COMPANY_BLURB_MIN_CONTACTS", 2))
+
+# Webmail domains say nothing about the employer
+FREE_MAIL_DOMAINS = frozenset({
+    "gmail.com", "googlemail.com", "yahoo.com", "outlook.com", "hotmail.com",
+    "live.com", "icloud.com", "aol.com", "proton.me", "protonmail.com",
+})
+
+_LEGAL_SUFFIXES = frozenset({
+    "inc", "incorporated", "llc", "llp", "ltd", "limited", "pvt", "private",
+    "corp", "corporation", "co", "company", "gmbh", "plc", "ag", "sa", "bv",
+})
+_NON_WORD = re.compile(r"[^\w\s]+")
+
+CompanyKey = Tuple[str, str]
+
+
+def normalize_company(name) -> str:
+    """Lower-case company name without punctuation or trailing legal suffixes ("Acme, Inc." -> "acme")."""
+    if not isinstance(name, str):
+        return ""
+    words = _NON_WORD.sub(" ", name.lower().replace("&", " and ")).split()
+    while len(words) > 1 and words[-1] in _LEGAL_SUFFIXES:
+        words.pop()
+    return " ".join(words)
+
+
+def website_domain(url) -> str:
+    """Bare host of a website URL ("https://www.acme.io/about" -> "acme.io"), or ""."""
+    if not isinstance(url, str) or not url.strip():
+        return ""
+    url = url.strip().lower()
+    host = urlsplit(url if "//" in url else f"//{url}").hostname or ""
+    return host[4:] if host.startswith("www.") else host
+
+
+def email_domain(email) -> str:
+    """Employer domain of an email address ("" for webmail or invalid addresses)."""
+    if not isinstance(email, str) or "@" not in email:
+        return ""
+    domain = email.rsplit("@", 1)[1].strip().lower()
+    return "" if domain in FREE_MAIL_DOMAINS else domain
+
+
+def clean_keywords(keywords) -> List[str]:
+    """Split a comma-separated keyword list, dropping blanks and case-insensitive duplicates."""
+    if not isinstance(keywords, str):
+        return []
+    seen = set()
+    cleaned = []
+    for keyword in keywords.split(","):
+        keyword = " ".join(keyword.split())
+        if keyword and keyword.lower() not in seen:
+            seen.add(keyword.lower())
+            cleaned.append(keyword)
+    return cleaned
+
+
+def company_notes(industry, keywords) -> str:
+    """Recruiter notes for a company: "Industry | Keywords: a, b, c"."""
+    industry = industry.strip() if isinstance(industry, str) else ""
+    keywords = ", ".join(clean_keywords(keywords))
+    if not keywords:
+        return industry
+    return f"{industry} | Keywords: {keywords}" if industry else f"Keywords: {keywords}"
+
+
+def company_key(recruiter: Dict) -> Optional[CompanyKey]:
+    """(normalized name, domain) for a recruiter dict, or None if both are unknown."""
+    name_key = normalize_company(recruiter.get("company"))
+    domain = recruiter.get("company_domain") or email_domain(recruiter.get("recruiter_email"))
+    domain = domain if isinstance(domain, str) else ""
+    if not name_key and not domain:
+        return None
+    return name_key, domain
+
+
+def _split_notes(notes) -> Tuple[str, str]:
+    """(industry, keywords) from "Industry | Keywords: ..." style notes."""
+    if not isinstance(notes, str):
+        return "", ""
+    head, sep, keywords = notes.partition("Keywords:")
+    if not sep:
+        return "", notes
+    return head.strip(" |"), keywords
+
+
+def _existing_profiles(db, user_id: int, keys: Iterable[CompanyKey]) -> Dict[CompanyKey, object]:
+    """The user's stored profiles for the given company keys."""
+    from src.models import CompanyProfile
+
+    keys = set(keys)
+    existing = db.query(CompanyProfile).filter(
+        CompanyProfile.user_id == user_id,
+        CompanyProfile.name_key.in_({name_key for name_key, _ in keys})
+    ).all()
+    return {(p.name_key, p.domain): p for p in existing if (p.name_key, p.domain) in keys}
+
+
+def _new_profile(user_id: int, key: CompanyKey, fields: Dict):
+    """Unsaved CompanyProfile for a company grouped by upsert_profiles()."""
+    from src.models import CompanyProfile
+
+    return CompanyProfile(
+        user_id=user_id,
+        name_key=key[0],
+        domain=key[1],
+        name=fields["name"],
+        company_type=fields["company_type"] or "unknown",
+        industry=fields["industry"],
+        keywords=", ".join(fields["keywords"]),
+        contact_count=0
+    )
+
+
+def _merge_profile(profile, fields: Dict):
+    """Apply a re-imported company's fields to its stored profile, merging keywords."""
+    if fields["company_type"]:
+        profile.company_type = fields["company_type"]
+    profile.industry = fields["industry"] or profile.industry
+    merged = ", ".join(clean_keywords(f"{profile.keywords or ''},{','.join(fields['keywords'])}"))
+    if merged != (profile.keywords or ""):
+        profile.keywords = merged
+
+
+def upsert_profiles(db, user_id: int, recruiters: Iterable[Dict]) -> Dict[CompanyKey, object]:
+    """
+    Create or update the user's company profiles for imported recruiters.
+
+    Rows are grouped by company_key() first, so each company is looked up and
+    cleaned once; keywords of an existing profile are merged with the new ones.
+    New profiles are flushed so their ids can be used right away (caller commits).
+    A profile created by a concurrent import of the same company since the
+    lookup is re-selected and merged instead of failing the unique constraint.
+
+    Args:
+        db: Database session
+        user_id: Owner of the profiles
+        recruiters: Recruiter dicts from DataProcessor.load()
+
+    Returns:
+        Dict of company key -> CompanyProfile
+    """
+    from sqlalchemy.exc import IntegrityError
+
+    grouped: Dict[CompanyKey, Dict] = {}
+    for r in recruiters:
+        key = company_key(r)
+        if key is None or key in grouped:
+            continue
+        industry, keywords = r.get("industry"), r.get("keywords")
+        if not industry and not keywords:
+            industry, keywords = _split_notes(r.get("notes"))
+        company_type = r.get("company_type")
+        grouped[key] = {
+            "name": r.get("company") if isinstance(r.get("company"), str) else None,
+            "company_type": company_type if company_type and company_type != "unknown" else None,
+            "industry": industry.strip() if isinstance(industry, str) and industry.strip() else None,
+            "keywords": clean_keywords(keywords),
+        }
+    if not grouped:
+        return {}
+
+    profiles = _existing_profiles(db, user_id, grouped)
+    for key, profile in profiles.items():
+        _merge_profile(profile, grouped[key])
+
+    missing = [key for key in grouped if key not in profiles]
+    created = 0
+    if missing:
+        try:
+            with db.begin_nested():
+                new = {key: _new_profile(user_id, key, grouped[key]) for key in missing}
+                db.add_all(new.values())
+            profiles.update(new)
+            created = len(new)
+        except IntegrityError:
+            # Another import created some of these companies since the lookup:
+            # insert them one by one and merge into the rows that now exist
+            for key in missing:
+                try:
+                    with db.begin_nested():
+                        profile = _new_profile(user_id, key, grouped[key])
+                        db.add(profile)
+                    created += 1
+                except IntegrityError:
+                    profile = _existing_profiles(db, user_id, [key])[key]
+                    _merge_profile(profile, grouped[key])
+                profiles[key] = profile
+    db.flush()
+
+    logger.info("Company profiles upserted", user_id=user_id, companies=len(grouped), created=created)
+    return profiles
+
+
+def profiles_for(db, contacts: Iterable) -> Dict[int, object]:
+    """Company profiles of the given contacts in one query, keyed by profile id."""
+    from src.models import CompanyProfile
+
+    ids = {c.company_profile_id for c in contacts if isinstance(getattr(c, "company_profile_id", None), int)}
+    if not ids:
+        return {}
+    return {p.id: p for p in db.query(CompanyProfile).filter(CompanyProfile.id.in_(ids)).all()}
+
+
+def blurb_requests(profiles: Iterable) -> Dict[int, Dict]:
+    """
+    Generator inputs for profiles that lack a blurb and have enough contacts.
+
+    The inputs are plain dicts, so the Gemini call can run in a worker thread
+    while the profiles stay with the session's thread.
+
+    Returns:
+        Dict of profile id -> company dict for generator.company_blurbs()
+    """
+    return {
+        p.id: {"company": p.name or p.name_key, "company_type": p.company_type, "industry": p.industry, "keywords": p.keywords}
+        for p in profiles
+        if not p.blurb and (p.contact_count or 0) >= COMPANY_BLURB_MIN_CONTACTS
+    }
+
+
+def store_blurbs(profiles: Dict[int, object], blurbs: Dict[int, Optional[str]]) -> int:
+    """
+    Set generated blurbs on their profiles (caller commits).
+
+    Failed generations (None or empty) are left unset and retried on a later call.
+
+    Args:
+        profiles: Dict of profile id -> CompanyProfile
+        blurbs: Dict of profile id -> generated blurb
+
+    Returns:
+        Number of blurbs stored
+    """
+    stored = 0
+    for profile_id, blurb in blurbs.items():
+        if blurb and profile_id in profiles:
+            profiles[profile_id].blurb = blurb
+            stored += 1
+    logger.info("Company blurbs generated", requested=len(blurbs), stored=stored)
+    return stored
+
+
+def ensure_blurbs(db, profiles: Iterable, generator) -> int:
+    """
+    Generate, store and commit missing blurbs (for callers that own the session's thread).
+
+    Returns:
+        Number of blurbs stored
+    """
+    profiles = {p.id: p for p in profiles}
+    requests = blurb_requests(profiles.values())
+    if not requests:
+        return 0
+    blurbs = generator.company_blurbs(list(requests.values()))
+    stored = store_blurbs(profiles, dict(zip(requests, blurbs)))
+    if stored:
+        db.commit()
+    return stored
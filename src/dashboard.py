@@ -0,0 +1,163 @@
+"""
+Dashboard Module
+One snapshot of everything the dashboard shows, cached per user in memory.
+
+GET /api/dashboard returns the user's credits, email stats, recent history
+and recent contacts in a single response instead of four. Snapshots are kept
+in-process for DASHBOARD_CACHE_TTL seconds and dropped by invalidate()
+whenever drafts, sends, uploads or Stripe payments change the user's data.
+A snapshot is also only served while the user's data_version (see
+src/data_version.py) is the one it was built at, so changes made by other
+workers are picked up on the next request. Each snapshot carries an ETag,
+so an unchanged dashboard is a 304.
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Tuple
+
+from src.etags import etag_for
+from src.logger import get_logger
+from src.metrics import DASHBOARD_CACHE
+
+logger = get_logger("dashboard.log")
+
+DASHBOARD_CACHE_TTL = float(os.getenv("DASHBOARD_CACHE_TTL", 300))
+DASHBOARD_CACHE_MAX_USERS = int(os.getenv("DASHBOARD_CACHE_MAX_USERS", 10_000))
+DASHBOARD_HISTORY_LIMIT = 10
+DASHBOARD_CONTACTS_LIMIT = 10
+
+# user_id -> (data_version, expires_at, snapshot, etag)
+_cache: Dict[int, Tuple[int, float, Dict, str]] = {}
+_lock = threading.Lock()
+
+
+def log_columns() -> Tuple:
+    """EmailLog columns listed by /api/history and /api/drafts (rows, not ORM objects, are loaded)."""
+    from src.models import EmailLog
+
+    return (
+        EmailLog.id, EmailLog.recipient_email, EmailLog.recipient_name, EmailLog.company,
+        EmailLog.subject, EmailLog.status, EmailLog.created_at, EmailLog.sent_at,
+    )
+
+
+def contact_columns() -> Tuple:
+    """Contact columns listed by /api/contacts."""
+    from src.models import Contact
+
+    return (Contact.id, Contact.name, Contact.email, Contact.company, Contact.role, Contact.status, Contact.created_at)
+
+
+def serialize_log(log) -> Dict:
+    """EmailLog as returned by /api/history and /api/drafts (datetimes are formatted by FastJSONResponse)."""
+    return {
+        "id": log.id,
+        "recipient_email": log.recipient_email,
+        "recipient_name": log.recipient_name,
+        "company": log.company,
+        "subject": log.subject,
+        "status": log.status,
+        "created_at": log.created_at,
+        "sent_at": log.sent_at,
+    }
+
+
+def serialize_contact(contact) -> Dict:
+    """Contact as returned by /api/contacts (datetimes are formatted by FastJSONResponse)."""
+    return {
+        "id": contact.id,
+        "name": contact.name,
+        "email": contact.email,
+        "company": contact.company,
+        "role": contact.role,
+        "status": contact.status,
+        "created_at": contact.created_at,
+    }
+
+
+def email_stats(db, user_id: int) -> Dict:
+    """Email counts by status in one grouped query (same fields as /api/stats)."""
+    from sqlalchemy import func
+    from src.models import EmailLog
+
+    counts = {}
+    for status, count in db.query(EmailLog.status, func.count(EmailLog.id)).filter(
+        EmailLog.user_id == user_id
+    ).group_by(EmailLog.status).all():
+        counts[status] = count
+    total = sum(counts.values())
+    sent, draft, failed = counts.get("sent", 0), counts.get("draft", 0), counts.get("failed", 0)
+    return {
+        "total_sent": sent,
+        "total_drafted": draft,
+        "pending": max(total - sent - draft - failed, 0),
+        "failed_emails": failed,
+    }
+
+
+def build(db, user) -> Dict:
+    """
+    Query a fresh dashboard snapshot.
+
+    Args:
+        db: Database session
+        user: Authenticated User
+
+    Returns:
+        Dict with user, credits_available, stats, history and contacts
+    """
+    from src.models import Contact, EmailLog
+
+    logs = db.query(*log_columns()).filter(EmailLog.user_id == user.id).order_by(
+        EmailLog.created_at.desc()
+    ).limit(DASHBOARD_HISTORY_LIMIT).all()
+    contacts = db.query(*contact_columns()).filter(Contact.user_id == user.id).order_by(
+        Contact.created_at.desc()
+    ).limit(DASHBOARD_CONTACTS_LIMIT).all()
+    return {
+        "user": {
+            "id": user.id,
+            "email": user.email,
+            "name": user.name,
+            "picture": user.picture,
+        },
+        "credits_available": user.credits,
+        "stats": email_stats(db, user.id),
+        "history": [serialize_log(log) for log in logs],
+        "contacts": [serialize_contact(contact) for contact in contacts],
+    }
+
+
+def get(db, user) -> Tuple[Dict, str]:
+    """The user's snapshot and its ETag, from the cache or freshly built."""
+    now = time.monotonic()
+    with _lock:
+        cached = _cache.get(user.id)
+    if cached and cached[0] == user.data_version and cached[1] > now:
+        DASHBOARD_CACHE.inc(result="hit")
+        return cached[2], cached[3]
+
+    DASHBOARD_CACHE.inc(result="miss")
+    snapshot = build(db, user)
+    etag = etag_for(snapshot)
+    with _lock:
+        if len(_cache) >= DASHBOARD_CACHE_MAX_USERS:
+            # Drop the oldest entry (dicts keep insertion order)
+            _cache.pop(next(iter(_cache)), None)
+        _cache.pop(user.id, None)
+        _cache[user.id] = (user.data_version, now + DASHBOARD_CACHE_TTL, snapshot, etag)
+    return snapshot, etag
+
+
+def invalidate(user_id: int):
+    """Drop a user's snapshot after a change to their contacts, emails or credits."""
+    with _lock:
+        _cache.pop(user_id, None)
+
+
+def clear():
+    """Drop all snapshots."""
+    with _lock:
+        _cache.clear()
@@ -3,11 +3,21 @@ Data Processor Module
 Handles loading and processing recruiter data from CSV/JSON files.
 """
 
+import numpy as np
 import pandas as pd
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import json
 
+# Apollo.io export columns used by _convert_apollo_format
+APOLLO_COLUMNS = [
+    'First Name', 'Last Name', 'Email', 'Company Name', 'Title',
+    '# Employees', 'Industry', 'Keywords', 'Website',
+]
+
+# Columns the email generators and the CLI tracker read from a recruiter
+RECRUITER_COLUMNS = ['recruiter_name', 'recruiter_email', 'company', 'role', 'company_type', 'notes']
+
 
 class DataProcessor:
     """Processes recruiter data from CSV files."""
@@ -18,11 +28,52 @@ class DataProcessor:
     
     def load_csv(self, filepath: str) -> List[Dict]:
         """Load recruiter data from CSV file. Supports both standard and Apollo.io format."""
-        df = pd.read_csv(filepath)
-        
+        self.recruiters = self._read_csv_frame(filepath).to_dict('records')
+        return self.recruiters
+    
+    def _read_csv_frame(self, filepath: str, cache: bool = False, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Read a CSV file into a DataFrame with the standard recruiter columns.
+        
+        With cache=True, uses the file's Arrow sidecar when one exists for its
+        content (see src/columnar_cache.py) and writes one after parsing otherwise.
+        
+        Args:
+            filepath: CSV file
+            cache: Read and write the Arrow sidecar
+            columns: Columns to return (None = all); missing ones are skipped
+        """
+        from src import columnar_cache
+        
+        if not cache or not columnar_cache.enabled():
+            return self._project(self._parse_csv_frame(filepath), columns)
+        
+        sha256 = columnar_cache.file_sha256(filepath)
+        df = columnar_cache.read(filepath, sha256, columns)
+        if df is not None:
+            return df
+        df = self._parse_csv_frame(filepath)
+        columnar_cache.write(df, filepath, sha256)
+        return self._project(df, columns)
+    
+    @staticmethod
+    def _project(df: pd.DataFrame, columns: Optional[List[str]]) -> pd.DataFrame:
+        return df if columns is None else df[[col for col in columns if col in df.columns]]
+    
+    def _parse_csv_frame(self, filepath: str) -> pd.DataFrame:
+        """Parse a CSV file (standard or Apollo.io format) into the standard recruiter columns."""
         # Check if this is an Apollo.io export (has 'First Name' column)
-        if 'First Name' in df.columns:
+        header = pd.read_csv(filepath, nrows=0).columns
+        if 'First Name' in header:
+            # Apollo exports carry ~60 columns; parse only the ones we use
+            df = pd.read_csv(
+                filepath,
+                usecols=[col for col in APOLLO_COLUMNS if col in header],
+                dtype=str,
+            )
             df = self._convert_apollo_format(df)
+        else:
+            df = pd.read_csv(filepath)
         
         # Validate required columns
         required_cols = ['recruiter_name', 'recruiter_email', 'company', 'role']
@@ -36,44 +87,55 @@ class DataProcessor:
         if 'notes' not in df.columns:
             df['notes'] = ''
         
-        self.recruiters = df.to_dict('records')
-        return self.recruiters
+        return df
     
     def _convert_apollo_format(self, df: pd.DataFrame) -> pd.DataFrame:
         """Convert Apollo.io export format to standard format."""
+        from src.companies import company_notes, website_domain
+        
+        def column(name: str) -> pd.Series:
+            if name in df.columns:
+                return df[name].fillna('').astype(str)
+            return pd.Series('', index=df.index, dtype=str)
+        
+        out = pd.DataFrame(index=df.index)
+        
         # Create recruiter_name from First Name + Last Name
-        df['recruiter_name'] = df['First Name'].fillna('') + ' ' + df['Last Name'].fillna('')
-        df['recruiter_name'] = df['recruiter_name'].str.strip()
+        out['recruiter_name'] = column('First Name').str.cat(column('Last Name'), sep=' ').str.strip()
         
         # Map other columns
-        df['recruiter_email'] = df['Email']
-        df['company'] = df['Company Name']
-        df['role'] = df.get('Title', 'AI/ML Engineer').fillna('AI/ML Engineer')
-        
-        # Determine company_type based on employee count
-        def get_company_type(employees):
-            try:
-                emp = int(employees)
-                if emp < 50:
-                    return 'startup'
-                elif emp < 500:
-                    return 'mid-size'
-                else:
-                    return 'enterprise'
-            except (ValueError, TypeError):
-                return 'unknown'
+        out['recruiter_email'] = df['Email']
+        out['company'] = df['Company Name']
+        out['role'] = column('Title').replace('', 'AI/ML Engineer')
         
+        # Determine company_type based on employee count (non-numeric -> unknown)
         if '# Employees' in df.columns:
-            df['company_type'] = df['# Employees'].apply(get_company_type)
+            employees = pd.to_numeric(df['# Employees'], errors='coerce')
+            out['company_type'] = pd.cut(
+                employees,
+                bins=[-np.inf, 50, 500, np.inf],
+                labels=['startup', 'mid-size', 'enterprise'],
+                right=False
+            ).astype(object).fillna('unknown')
         else:
-            df['company_type'] = 'unknown'
-        
-        # Use Industry + Keywords as notes
-        df['notes'] = df.get('Industry', '').fillna('') + ' | Keywords: ' + df.get('Keywords', '').fillna('')
-        df['notes'] = df['notes'].str.strip(' |: ')
-        
-        # Keep only the columns we need
-        return df[['recruiter_name', 'recruiter_email', 'company', 'role', 'company_type', 'notes']]
+            out['company_type'] = 'unknown'
+        
+        # Industry, Keywords and Website describe the company: build the notes
+        # once per company and share them across its recruiters
+        industry, keywords, website = column('Industry'), column('Keywords'), column('Website')
+        key = df['Company Name'].fillna('')
+        first = ~key.duplicated()
+        notes = pd.Series(
+            [company_notes(i, k) for i, k in zip(industry[first], keywords[first])],
+            index=key[first]
+        )
+        domains = pd.Series(website[first].map(website_domain).to_numpy(), index=key[first])
+        
+        out['notes'] = key.map(notes)
+        out['industry'] = industry
+        out['keywords'] = keywords
+        out['company_domain'] = key.map(domains)
+        return out
     
     def load_json(self, filepath: str) -> List[Dict]:
         """Load recruiter data from JSON file."""
@@ -98,30 +160,53 @@ class DataProcessor:
         else:
             raise ValueError(f"Unsupported file type: {path.suffix}")
     
+    def load_dataframe(self, filepath: str, cache: bool = False, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Auto-detect file type and load data as a DataFrame (for vectorized filtering).
+        
+        cache=True keeps an Arrow sidecar of parsed CSVs for callers that load
+        the same file repeatedly (the CLI); columns limits CSV loads to the
+        columns the caller reads.
+        """
+        path = Path(filepath)
+        
+        if path.suffix.lower() == '.csv':
+            return self._read_csv_frame(filepath, cache, columns)
+        elif path.suffix.lower() == '.json':
+            return pd.DataFrame(self.load_json(filepath))
+        else:
+            raise ValueError(f"Unsupported file type: {path.suffix}")
+    
+    def load_validated(self, filepath: str) -> Tuple[List[Dict], Dict]:
+        """
+        Load a file and drop rows with invalid, duplicate or disposable addresses.
+        
+        Args:
+            filepath: CSV or JSON file
+        
+        Returns:
+            (accepted recruiters with normalized addresses, rejection report
+            from src.email_validation.validate_frame)
+        """
+        from src.email_validation import validate_frame
+        
+        accepted, report = validate_frame(self.load_dataframe(filepath))
+        self.recruiters = accepted.to_dict('records')
+        return self.recruiters, report
+    
     def validate_emails(self) -> List[Dict]:
-        """Basic email validation."""
-        import re
-        email_pattern = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
-        
-        valid_recruiters = []
-        invalid_emails = []
-        
-        for recruiter in self.recruiters:
-            email = recruiter.get('recruiter_email', '')
-            if email_pattern.match(email):
-                valid_recruiters.append(recruiter)
-            else:
-                invalid_emails.append({
-                    'name': recruiter.get('recruiter_name'),
-                    'email': email
-                })
-        
-        if invalid_emails:
-            print(f"Warning: {len(invalid_emails)} invalid emails found:")
-            for item in invalid_emails:
-                print(f"  - {item['name']}: {item['email']}")
-        
-        return valid_recruiters
+        """Normalize loaded recruiters' addresses and drop the rejected ones."""
+        from src.email_validation import validate_frame
+        
+        if not self.recruiters:
+            return []
+        accepted, report = validate_frame(pd.DataFrame(self.recruiters))
+        
+        rejected = report["total"] - report["accepted"]
+        if rejected:
+            reasons = ", ".join(f"{n} {reason}" for reason, n in report["rejected"].items() if n)
+            print(f"Warning: {rejected} emails rejected ({reasons})")
+        
+        return accepted.to_dict('records')
     
     def filter_by_company_type(self, company_type: str) -> List[Dict]:
         """Filter recruiters by company type."""
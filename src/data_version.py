@@ -0,0 +1,71 @@
+"""
+Data Version Module
+Per-user change counters behind the ETags of the read endpoints.
+
+users.data_version is incremented in the same transaction as every write to
+the user's contacts, email logs or credits, by a before_flush hook on all
+ORM sessions. Read endpoints derive their ETag from the request URL and the
+authenticated user's data_version (loaded anyway by require_auth), so an
+If-None-Match request for unchanged data is answered with 304 without
+running the endpoint's queries.
+
+Bulk statements (query.update()/delete(), Core update()) skip the flush
+hook: call bump() for the affected users when using them on these tables.
+"""
+
+from typing import Iterable, Set
+
+from sqlalchemy import event, func, inspect
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.util import identity_key
+
+from src.etags import etag_for
+
+
+def bump(db, user_ids: Iterable[int]):
+    """Increment the data version of users changed outside the ORM unit of work."""
+    from src.models import User
+
+    ids = sorted({uid for uid in user_ids if uid is not None})
+    if not ids:
+        return
+    # Increment in SQL so concurrent transactions cannot lose a bump
+    db.connection().execute(
+        User.__table__.update()
+        .where(User.__table__.c.id.in_(ids))
+        .values(data_version=func.coalesce(User.__table__.c.data_version, 0) + 1)
+    )
+    # Users loaded in this session re-read the new value on next access
+    for uid in ids:
+        user = db.identity_map.get(identity_key(User, uid))
+        if user is not None:
+            db.expire(user, ["data_version"])
+
+
+def _changed_user_ids(session: Session) -> Set[int]:
+    """Users whose contacts, email logs or credits this flush writes."""
+    from src.models import Contact, EmailLog, User
+
+    user_ids = set()
+    for obj in session.new:
+        if isinstance(obj, (Contact, EmailLog)):
+            user_ids.add(obj.user_id)
+    for obj in session.deleted:
+        if isinstance(obj, (Contact, EmailLog)):
+            user_ids.add(obj.user_id)
+    for obj in session.dirty:
+        if isinstance(obj, (Contact, EmailLog)) and session.is_modified(obj):
+            user_ids.add(obj.user_id)
+        elif isinstance(obj, User) and inspect(obj).attrs.credits.history.has_changes():
+            user_ids.add(obj.id)
+    return user_ids
+
+
+@event.listens_for(Session, "before_flush")
+def _bump_on_flush(session, flush_context, instances):
+    bump(session, _changed_user_ids(session))
+
+
+def etag(request, user) -> str:
+    """ETag of a per-user read endpoint: the request URL plus the user's data version."""
+    return etag_for([request.url.path, str(request.query_params), user.id, user.data_version or 0])
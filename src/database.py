@@ -1,9 +1,16 @@
 """Database configuration and session management."""
 
 import os
-from sqlalchemy import create_engine
+import time
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, declarative_base
 
+from src.metrics import DB_QUERY_DURATION
+
+# Load .env so scripts (e.g. `python -m src.migrations`) see DATABASE_URL
+load_dotenv()
+
 # Use SQLite for local development, PostgreSQL for production
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./cold_outreach.db")
 
@@ -16,6 +23,20 @@ engine = create_engine(
     connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {},
 )
 
+
+# Query timing for /metrics
+@event.listens_for(engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_start = time.perf_counter()
+
+
+@event.listens_for(engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._query_start
+    operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "UNKNOWN"
+    DB_QUERY_DURATION.observe(elapsed, operation=operation)
+
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
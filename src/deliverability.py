@@ -0,0 +1,234 @@
+"""
+Deliverability Module
+Domain-level mail deliverability checks, run during CSV import.
+
+Each distinct recipient domain is resolved once: its MX records, or its
+A/AAAA records when there is no MX (implicit MX, RFC 5321). Domains that do
+not exist, publish a null MX (RFC 7505) or have no address at all cannot
+receive mail. Their contacts are imported with status "undeliverable", so
+drafting and sending skip them and spend no quota or credits.
+
+- Pluggable resolvers: DnsResolver (dnspython, in requirements.txt; checks
+  are skipped with a warning when it is missing) and StaticResolver, a local
+  table used by tests. DELIVERABILITY_RESOLVER=none disables the checks, as
+  the load-testing harness (benchmarks/load_test.py) does.
+- Results are kept in the domain_checks table for DELIVERABILITY_TTL
+  seconds (DELIVERABILITY_NEGATIVE_TTL for dead domains). Lookups that
+  time out or fail are not cached, and their domains count as deliverable.
+- Lookups run concurrently (DELIVERABILITY_CONCURRENCY at a time).
+"""
+
+import asyncio
+import importlib.util
+import os
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from src.logger import get_logger
+from src.metrics import DELIVERABILITY_CHECKS
+
+logger = get_logger("deliverability.log")
+
+# "dns" (default when dnspython is installed) or "none" to disable checks
+DELIVERABILITY_RESOLVER = os.getenv("DELIVERABILITY_RESOLVER", "dns")
+DELIVERABILITY_TTL = int(os.getenv("DELIVERABILITY_TTL", 7 * 24 * 3600))
+DELIVERABILITY_NEGATIVE_TTL = int(os.getenv("DELIVERABILITY_NEGATIVE_TTL", 24 * 3600))
+DELIVERABILITY_CONCURRENCY = int(os.getenv("DELIVERABILITY_CONCURRENCY", 50))
+DELIVERABILITY_TIMEOUT = float(os.getenv("DELIVERABILITY_TIMEOUT", 5))
+
+UNDELIVERABLE = "undeliverable"
+
+
+class DomainResult(NamedTuple):
+    """Outcome of resolving one domain."""
+
+    deliverable: Optional[bool]  # None = lookup failed, unknown
+    mx: List[str] = []
+
+
+class Resolver:
+    """Interface: resolve a domain's mail routing."""
+
+    async def check(self, domain: str) -> DomainResult:
+        raise NotImplementedError
+
+
+class StaticResolver(Resolver):
+    """
+    Answers from a local table: domain -> MX hosts.
+
+    An empty list means the domain exists without a mail route, None (or a
+    missing entry) that it does not exist. Optional latency per lookup.
+    """
+
+    def __init__(self, table: Dict[str, Optional[List[str]]], latency: float = 0.0):
+        self.table = table
+        self.latency = latency
+        self.lookups: List[str] = []
+
+    async def check(self, domain: str) -> DomainResult:
+        self.lookups.append(domain)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        hosts = self.table.get(domain)
+        return DomainResult(bool(hosts), list(hosts or []))
+
+
+class DnsResolver(Resolver):
+    """MX lookups through dnspython's async resolver, with A/AAAA fallback."""
+
+    def __init__(self, timeout: float = DELIVERABILITY_TIMEOUT):
+        import dns.asyncresolver
+
+        self.timeout = timeout
+        self.resolver = dns.asyncresolver.Resolver()
+
+    async def _has_records(self, domain: str, rdtype: str) -> bool:
+        import dns.resolver
+
+        try:
+            await self.resolver.resolve(domain, rdtype, lifetime=self.timeout)
+            return True
+        except dns.resolver.NoAnswer:
+            return False
+
+    async def check(self, domain: str) -> DomainResult:
+        import dns.exception
+        import dns.resolver
+
+        try:
+            try:
+                answer = await self.resolver.resolve(domain, "MX", lifetime=self.timeout)
+            except dns.resolver.NoAnswer:
+                # No MX: mail goes to the domain's own address, if it has one
+                for rdtype in ("A", "AAAA"):
+                    if await self._has_records(domain, rdtype):
+                        return DomainResult(True, [domain])
+                return DomainResult(False)
+        except dns.resolver.NXDOMAIN:
+            return DomainResult(False)
+        except (dns.exception.Timeout, dns.resolver.NoNameservers) as e:
+            logger.warning("MX lookup failed", domain=domain, error=type(e).__name__)
+            return DomainResult(None)
+
+        hosts = [r.exchange.to_text(omit_final_dot=True) for r in sorted(answer, key=lambda r: r.preference)]
+        # Null MX ("0 .") declares that the domain accepts no mail
+        hosts = [host for host in hosts if host]
+        return DomainResult(bool(hosts), hosts)
+
+
+@lru_cache(maxsize=None)
+def get_resolver() -> Optional[Resolver]:
+    """The configured resolver (shared), or None when checks are disabled or dnspython is missing."""
+    if DELIVERABILITY_RESOLVER == "none":
+        return None
+    if importlib.util.find_spec("dns") is None:
+        logger.warning("dnspython not installed; deliverability checks disabled")
+        return None
+    return DnsResolver()
+
+
+def _chunks(items: List[str], size: int = 500):
+    """Split IN (...) lists to stay under database parameter limits."""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _store(db, results: Dict[str, DomainResult], now: datetime):
+    """Insert or refresh cache rows for resolved domains."""
+    from sqlalchemy.exc import IntegrityError
+    from src.models import DomainCheck
+
+    if not results:
+        return
+    stored = {}
+    for chunk in _chunks(list(results)):
+        stored.update({row.domain: row for row in db.query(DomainCheck).filter(DomainCheck.domain.in_(chunk))})
+    for domain, result in results.items():
+        ttl = DELIVERABILITY_TTL if result.deliverable else DELIVERABILITY_NEGATIVE_TTL
+        row = stored.get(domain) or DomainCheck(domain=domain)
+        row.deliverable = result.deliverable
+        row.mx_hosts = ",".join(result.mx)[:512]
+        row.checked_at = now
+        row.expires_at = now + timedelta(seconds=ttl)
+        db.add(row)
+    try:
+        db.commit()
+    except IntegrityError:
+        # Another import cached the same domain first; its row is as good as ours
+        db.rollback()
+        logger.info("Domain cache write raced with another import", domains=len(results))
+
+
+def _result_label(deliverable: Optional[bool]) -> str:
+    return {True: "deliverable", False: UNDELIVERABLE}.get(deliverable, "error")
+
+
+async def _resolve_all(domains: List[str], resolver: Resolver, concurrency: int) -> Dict[str, DomainResult]:
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def one(domain: str) -> DomainResult:
+        async with semaphore:
+            try:
+                return await resolver.check(domain)
+            except Exception as e:
+                logger.warning("Domain check failed", domain=domain, error=str(e))
+                return DomainResult(None)
+
+    results = await asyncio.gather(*(one(d) for d in domains))
+    return dict(zip(domains, results))
+
+
+async def check_domains(
+    db,
+    domains: Iterable[str],
+    resolver: Optional[Resolver] = None,
+    concurrency: int = DELIVERABILITY_CONCURRENCY,
+) -> Dict[str, bool]:
+    """
+    Deliverability of each distinct domain, from the cache or resolved concurrently.
+
+    Args:
+        db: Database session (fresh results are committed to domain_checks)
+        domains: Recipient domains (duplicates are fine)
+        resolver: Resolver to use (defaults to get_resolver())
+        concurrency: Maximum lookups in flight
+
+    Returns:
+        Dict of domain -> False for domains that cannot receive mail, True otherwise
+    """
+    from src.models import DomainCheck
+
+    domains = sorted({d for d in domains if d})
+    resolver = resolver or get_resolver()
+    if not domains or resolver is None:
+        return {d: True for d in domains}
+
+    now = datetime.utcnow()
+    cached: Dict[str, bool] = {}
+    for chunk in _chunks(domains):
+        cached.update(db.query(DomainCheck.domain, DomainCheck.deliverable).filter(
+            DomainCheck.domain.in_(chunk),
+            DomainCheck.expires_at > now
+        ).all())
+    misses = [d for d in domains if d not in cached]
+    for deliverable in cached.values():
+        DELIVERABILITY_CHECKS.inc(source="cache", result=_result_label(deliverable))
+
+    resolved = await _resolve_all(misses, resolver, concurrency) if misses else {}
+    for result in resolved.values():
+        DELIVERABILITY_CHECKS.inc(source="dns", result=_result_label(result.deliverable))
+    _store(db, {d: r for d, r in resolved.items() if r.deliverable is not None}, now)
+
+    results = {d: True for d in domains}
+    results.update(cached)
+    results.update({d: r.deliverable is not False for d, r in resolved.items()})
+    dead = sum(1 for ok in results.values() if not ok)
+    logger.info("Domains checked", domains=len(domains), cached=len(cached), resolved=len(misses), undeliverable=dead)
+    return results
+
+
+def email_domain(email) -> str:
+    """Domain part of an address ("" if there is none)."""
+    return email.rpartition("@")[2].lower() if isinstance(email, str) else ""
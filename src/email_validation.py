@@ -0,0 +1,129 @@
+"""
+Email Validation Module
+Import-time validation of recipient addresses, over whole DataFrame columns.
+
+validate_frame() normalizes addresses (trimmed, lower-case, "mailto:" and
+angle brackets removed) and rejects rows that are:
+
+- invalid: not a plausible address
+- duplicate: same normalized address as an earlier row in the file
+- disposable: on a throwaway domain (config/disposable_domains.txt)
+
+Shared role mailboxes (config/role_addresses.txt, e.g. careers@) are kept
+but flagged. The column is handled as one object array: each check is a
+single pass of C-level string methods or the compiled regex, and per-domain
+checks run once per distinct domain, so a million rows take a second or two.
+"""
+
+import re
+from functools import lru_cache
+from operator import methodcaller
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+CONFIG_DIR = Path(__file__).resolve().parent.parent / "config"
+ROLE_ADDRESSES_PATH = CONFIG_DIR / "role_addresses.txt"
+DISPOSABLE_DOMAINS_PATH = CONFIG_DIR / "disposable_domains.txt"
+
+EMAIL_REGEX = re.compile(r"[a-z0-9._%+-]+@[a-z0-9.-]+\.[a-z]{2,}")
+
+# Rejection reasons, in order of precedence
+INVALID = "invalid"
+DUPLICATE = "duplicate"
+DISPOSABLE = "disposable"
+REASONS = [INVALID, DUPLICATE, DISPOSABLE]
+
+# Rejected rows listed individually in the report
+MAX_REPORTED_ROWS = 100
+
+
+def _read_list(path: Path) -> List[str]:
+    """Non-empty, non-comment lines of a bundled list, lower-cased."""
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.strip().lower() for line in f if line.strip() and not line.startswith("#")]
+
+
+@lru_cache(maxsize=None)
+def role_prefixes() -> Tuple[str, ...]:
+    """Address prefixes of role mailboxes ("careers@", ...)."""
+    return tuple(f"{name}@" for name in _read_list(ROLE_ADDRESSES_PATH))
+
+
+@lru_cache(maxsize=None)
+def disposable_domains() -> frozenset:
+    """Disposable email domains."""
+    return frozenset(_read_list(DISPOSABLE_DOMAINS_PATH))
+
+
+def is_disposable(domain: str) -> bool:
+    """True for a disposable domain or one of its subdomains."""
+    domains = disposable_domains()
+    while domain:
+        if domain in domains:
+            return True
+        domain = domain.partition(".")[2]
+    return False
+
+
+def normalize_emails(emails: pd.Series) -> np.ndarray:
+    """Trimmed, lower-case addresses as an object array (missing -> "")."""
+    values = emails.fillna("").astype(str).to_numpy(dtype=object)
+    return np.array(list(map(str.lower, map(str.strip, values))), dtype=object)
+
+
+def _undecorate(email: str) -> str:
+    """Strip "mailto:" and angle brackets ("mailto:<a@b.io>" -> "a@b.io")."""
+    return email.removeprefix("mailto:").strip("<> ")
+
+
+def validate_frame(df: pd.DataFrame, column: str = "recruiter_email") -> Tuple[pd.DataFrame, Dict]:
+    """
+    Normalize and validate the address column of an imported file.
+
+    Args:
+        df: Imported rows (not modified)
+        column: Column holding the addresses
+
+    Returns:
+        (accepted rows with the normalized addresses, report) where report has
+        total, accepted, rejected (count per reason), flagged (role count) and
+        rows (up to MAX_REPORTED_ROWS rejected rows: row number, email, reason)
+    """
+    emails = normalize_emails(df[column])
+    count = len(emails)
+    match = EMAIL_REGEX.fullmatch
+    valid = np.fromiter(map(bool, map(match, emails)), bool, count)
+    # Decorated addresses are rare: only re-check the rows that failed
+    for i in np.flatnonzero(~valid):
+        emails[i] = _undecorate(emails[i])
+        valid[i] = match(emails[i]) is not None
+    invalid = ~valid
+    duplicate = valid & pd.Series(emails).duplicated().to_numpy()
+
+    role = np.fromiter(map(methodcaller("startswith", role_prefixes()), emails), bool, count)
+    # Domains repeat across rows: classify each distinct domain once
+    codes, domains = pd.factorize(np.array([e[e.rfind("@") + 1:] for e in emails], dtype=object))
+    disposable = valid & ~duplicate & np.fromiter(map(is_disposable, domains), bool, len(domains))[codes]
+
+    reason = np.select([invalid, duplicate, disposable], REASONS, default="")
+    rejected = reason != ""
+    accepted = df.loc[~rejected].copy()
+    accepted[column] = emails[~rejected]
+
+    # Row numbers as in a spreadsheet: header is row 1
+    positions = np.flatnonzero(rejected)[:MAX_REPORTED_ROWS]
+    original = df[column].iloc[positions]
+    report = {
+        "total": count,
+        "accepted": len(accepted),
+        "rejected": {r: int(n) for r, n in zip(REASONS, (invalid.sum(), duplicate.sum(), disposable.sum()))},
+        "flagged": {"role": int((role & ~rejected).sum())},
+        "rows": [
+            {"row": int(pos) + 2, "email": email if isinstance(email, str) else "", "reason": str(reason[pos])}
+            for pos, email in zip(positions, original.tolist())
+        ],
+    }
+    return accepted, report
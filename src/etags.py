@@ -0,0 +1,22 @@
+"""
+ETags Module
+Entity tags for JSON responses and If-None-Match handling.
+"""
+
+import hashlib
+import json
+from typing import Optional
+
+
+def etag_for(payload) -> str:
+    """Strong ETag of a JSON-serializable payload (stable across key order)."""
+    body = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return '"' + hashlib.sha256(body.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """True when an If-None-Match header lists etag (weak comparison, RFC 9110)."""
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag.removeprefix("W/") in (tag.removeprefix("W/") for tag in tags)
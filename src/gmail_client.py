@@ -3,6 +3,7 @@ Gmail Client Module
 Handles Gmail API integration for sending emails and creating drafts.
 """
 
+import asyncio
 import base64
 import time
 from email.mime.text import MIMEText
@@ -15,10 +16,36 @@ import os
 
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
+from src.gmail_transport import (
+    GMAIL_API_ENDPOINT,
+    GMAIL_MAX_CONNECTIONS,
+    GMAIL_TRANSPORT,
+    DiscoveryTransport,
+    GmailAPIError,
+    GmailTransport,
+    HttpxTransport,
+)
+from src.logger import get_logger
+from src.metrics import GMAIL_ERRORS, GMAIL_REQUEST_DURATION
+from src.retry import (
+    NETWORK,
+    QUOTA,
+    RATE_LIMIT,
+    SERVER,
+    AdaptiveLimiter,
+    CircuitBreaker,
+    CircuitOpenError,
+    ErrorInfo,
+    RetryPolicy,
+    classify_status,
+    parse_retry_after,
+)
+
+logger = get_logger("gmail_client.log")
+
 
 # Gmail API scopes - only request what we need
 SCOPES = [
@@ -30,6 +57,44 @@ SCOPES = [
 TOKEN_FILE = 'token.json'
 CREDENTIALS_FILE = 'credentials.json'
 
+# Endpoint override, e.g. for the local stand-in server in benchmarks/
+GOOGLE_TOKEN_URI = os.getenv("GOOGLE_TOKEN_URI", "https://oauth2.googleapis.com/token")
+
+# Gmail reports per-user limits as 403 or 429 with one of these reasons (or,
+# for concurrent requests, this message). They are retried as QUOTA, so one
+# user over quota does not open the shared breaker or shrink the shared limit
+# for every other user.
+RATE_LIMIT_REASONS = ("rateLimitExceeded", "userRateLimitExceeded", "concurrent requests for user")
+
+
+def classify_gmail_error(error: Exception) -> ErrorInfo:
+    """Map a Gmail API failure to a retry error class."""
+    if isinstance(error, GmailAPIError):
+        status, retry_after, detail = error.status_code, error.retry_after, str(error)
+    elif isinstance(error, HttpError):
+        status, retry_after = error.resp.status, parse_retry_after(error.resp.get('retry-after'))
+        detail = str(error.content)
+    elif isinstance(error, (OSError, TimeoutError)):
+        return ErrorInfo(NETWORK)
+    else:
+        return ErrorInfo(None)
+
+    if status in (403, 429) and any(reason in detail for reason in RATE_LIMIT_REASONS):
+        return ErrorInfo(QUOTA, retry_after)
+    return ErrorInfo(classify_status(status), retry_after)
+
+
+# One breaker and AIMD limiter per process, shared by the sync and async paths
+GMAIL_BREAKER = CircuitBreaker("gmail")
+GMAIL_LIMITER = AdaptiveLimiter("gmail", initial=10, maximum=GMAIL_MAX_CONNECTIONS)
+GMAIL_RETRY = RetryPolicy("gmail", classify_gmail_error, breaker=GMAIL_BREAKER, limiter=GMAIL_LIMITER)
+# messages.send is not idempotent: a network error may hide a send that went through
+GMAIL_SEND_RETRY = RetryPolicy(
+    "gmail", classify_gmail_error,
+    budgets={RATE_LIMIT: 5, QUOTA: 5, SERVER: 3, NETWORK: 0},
+    breaker=GMAIL_BREAKER, limiter=GMAIL_LIMITER,
+)
+
 
 class GmailClient:
     """Gmail API client for sending emails and creating drafts."""
@@ -37,6 +102,7 @@ class GmailClient:
     def __init__(self, user=None):
         self.creds = None
         self.service = None
+        self.transport: Optional[GmailTransport] = None
         self.user_email = None
         self.user = user
         
@@ -51,12 +117,33 @@ class GmailClient:
 
     def authenticate(self) -> bool:
         """Authenticate with Gmail API using User object."""
+        if not self._load_credentials():
+            return False
+        try:
+            client_options = {'api_endpoint': GMAIL_API_ENDPOINT} if GMAIL_API_ENDPOINT else None
+            self.service = build('gmail', 'v1', credentials=self.creds, client_options=client_options)
+            return True
+        except Exception as e:
+            logger.error("Authentication error", error=str(e))
+            return False
+
+    async def aauthenticate(self) -> bool:
+        """
+        Load (and if needed refresh) credentials for the async methods.
+
+        Unlike authenticate(), this skips building the discovery service; the
+        blocking token refresh runs in a worker thread.
+        """
+        return await asyncio.to_thread(self._load_credentials)
+
+    def _load_credentials(self) -> bool:
+        """Build Credentials from the User's stored tokens, refreshing them if expired."""
         if not self.user:
-            print("Error: No user provided for GmailClient")
+            logger.error("No user provided for GmailClient")
             return False
             
         if not self.user.access_token:
-            print(f"Error: User {self.user.email} has no access token")
+            logger.error("User has no access token", user_id=self.user.id)
             return False
             
         try:
@@ -68,7 +155,7 @@ class GmailClient:
             self.creds = Credentials(
                 token=self.user.access_token,
                 refresh_token=self.user.refresh_token,
-                token_uri="https://oauth2.googleapis.com/token",
+                token_uri=GOOGLE_TOKEN_URI,
                 client_id=self.client_id,
                 client_secret=self.client_secret,
                 scopes=SCOPES,
@@ -84,15 +171,15 @@ class GmailClient:
                     # For now, we utilize the refreshed credentials in memory.
                     # TODO: Implement token update callback
                 except Exception as e:
-                    print(f"Error refreshing token: {e}")
+                    logger.error("Error refreshing token", user_id=self.user.id, error=str(e))
+                    self.creds = None
                     return False
             
-            self.service = build('gmail', 'v1', credentials=self.creds)
             self.user_email = self.user.email
             return True
             
         except Exception as e:
-            print(f"Authentication error: {e}")
+            logger.error("Authentication error", error=str(e))
             return False
     
     def _create_message(
@@ -131,6 +218,13 @@ class GmailClient:
         raw = base64.urlsafe_b64encode(message.as_bytes()).decode('utf-8')
         return {'raw': raw}
     
+    def _execute(self, operation: str, request, policy: RetryPolicy = GMAIL_RETRY) -> Dict:
+        """Execute a googleapiclient request, retrying transient failures."""
+        def attempt():
+            with GMAIL_REQUEST_DURATION.time(operation=operation):
+                return request.execute()
+        return policy.call(attempt)
+    
     def create_draft(
         self,
         to: str,
@@ -145,18 +239,19 @@ class GmailClient:
         
         try:
             message = self._create_message(to, subject, body, attachment_paths)
-            draft = self.service.users().drafts().create(
+            draft = self._execute('create_draft', self.service.users().drafts().create(
                 userId='me',
                 body={'message': message}
-            ).execute()
+            ))
             
             return {
                 'id': draft['id'],
                 'message_id': draft['message']['id'],
                 'status': 'draft'
             }
-        except HttpError as e:
-            print(f"Error creating draft: {e}")
+        except (HttpError, CircuitOpenError) as e:
+            GMAIL_ERRORS.inc(operation='create_draft')
+            logger.error("Error creating draft", error=str(e))
             return None
     
     def send_draft(self, draft_id: str) -> Optional[Dict]:
@@ -166,20 +261,41 @@ class GmailClient:
                 return None
         
         try:
-            sent = self.service.users().drafts().send(
+            sent = self._execute('send_draft', self.service.users().drafts().send(
                 userId='me',
                 body={'id': draft_id}
-            ).execute()
+            ))
             
             return {
                 'id': sent['id'],
                 'thread_id': sent.get('threadId'),
                 'status': 'sent'
             }
-        except HttpError as e:
-            print(f"Error sending draft: {e}")
+        except (HttpError, CircuitOpenError) as e:
+            GMAIL_ERRORS.inc(operation='send_draft')
+            logger.error("Error sending draft", draft_id=draft_id, error=str(e))
             return None
-    
+
+    def draft_exists(self, draft_id: str) -> Optional[bool]:
+        """Whether a draft still exists (sending deletes it); None when Gmail can't tell."""
+        if not self.service:
+            if not self.authenticate():
+                return None
+
+        try:
+            self._execute('get_draft', self.service.users().drafts().get(
+                userId='me',
+                id=draft_id,
+                format='minimal'
+            ))
+            return True
+        except (HttpError, CircuitOpenError) as e:
+            if isinstance(e, HttpError) and e.resp.status == 404:
+                return False
+            GMAIL_ERRORS.inc(operation='get_draft')
+            logger.error("Error checking draft", draft_id=draft_id, error=str(e))
+            return None
+
     def send_email(
         self,
         to: str,
@@ -193,19 +309,20 @@ class GmailClient:
                 return None
         
         try:
-            message = self._create_message(to, subject, body, attachment_path)
-            sent = self.service.users().messages().send(
+            message = self._create_message(to, subject, body, [attachment_path] if attachment_path else None)
+            sent = self._execute('send_email', self.service.users().messages().send(
                 userId='me',
                 body=message
-            ).execute()
+            ), policy=GMAIL_SEND_RETRY)
             
             return {
                 'id': sent['id'],
                 'thread_id': sent.get('threadId'),
                 'status': 'sent'
             }
-        except HttpError as e:
-            print(f"Error sending email: {e}")
+        except (HttpError, CircuitOpenError) as e:
+            GMAIL_ERRORS.inc(operation='send_email')
+            logger.error("Error sending email", error=str(e))
             return None
     
     def send_batch(
@@ -264,6 +381,98 @@ class GmailClient:
         
         return results
     
+    # Async API
+    # ---------
+    # Same results as the blocking methods above, but through a GmailTransport,
+    # so endpoints can run many Gmail calls concurrently on the event loop.
+
+    def get_transport(self) -> GmailTransport:
+        """Return the async transport selected by GMAIL_TRANSPORT (httpx or discovery)."""
+        if self.transport is None:
+            if GMAIL_TRANSPORT == "discovery":
+                if not self.service and not self.authenticate():
+                    raise GmailAPIError("Gmail authentication failed")
+                self.transport = DiscoveryTransport(self.service)
+            else:
+                self.transport = HttpxTransport(self.creds, lambda: self.creds.refresh(Request()))
+        return self.transport
+
+    async def _acall(
+        self, operation: str, call, policy: RetryPolicy = GMAIL_RETRY, **log_fields
+    ) -> Optional[Dict]:
+        """Run one transport call with retries and metrics; returns None on failure like the blocking methods."""
+        if not self.creds:
+            if not await self.aauthenticate():
+                return None
+
+        async def attempt():
+            with GMAIL_REQUEST_DURATION.time(operation=operation):
+                return await call(self.get_transport())
+
+        try:
+            return await policy.acall(attempt)
+        except (GmailAPIError, CircuitOpenError) as e:
+            GMAIL_ERRORS.inc(operation=operation)
+            logger.error(
+                f"Error in {operation}", status_code=getattr(e, 'status_code', None), error=str(e), **log_fields
+            )
+            return None
+
+    async def acreate_draft(
+        self,
+        to: str,
+        subject: str,
+        body: str,
+        attachment_paths: Optional[list] = None
+    ) -> Optional[Dict]:
+        """Create a draft email without blocking the event loop."""
+        if not self.creds and not await self.aauthenticate():
+            return None
+        # Reading and base64-encoding attachments is blocking work
+        message = await asyncio.to_thread(self._create_message, to, subject, body, attachment_paths)
+        draft = await self._acall('create_draft', lambda t: t.create_draft(message))
+        if not draft:
+            return None
+        return {
+            'id': draft['id'],
+            'message_id': draft['message']['id'],
+            'status': 'draft'
+        }
+
+    async def asend_draft(self, draft_id: str) -> Optional[Dict]:
+        """Send an existing draft without blocking the event loop."""
+        sent = await self._acall('send_draft', lambda t: t.send_draft(draft_id), draft_id=draft_id)
+        if not sent:
+            return None
+        return {
+            'id': sent['id'],
+            'thread_id': sent.get('threadId'),
+            'status': 'sent'
+        }
+
+    async def asend_email(
+        self,
+        to: str,
+        subject: str,
+        body: str,
+        attachment_path: Optional[str] = None
+    ) -> Optional[Dict]:
+        """Send an email directly without blocking the event loop."""
+        if not self.creds and not await self.aauthenticate():
+            return None
+        # Reading and base64-encoding attachments is blocking work
+        message = await asyncio.to_thread(
+            self._create_message, to, subject, body, [attachment_path] if attachment_path else None
+        )
+        sent = await self._acall('send_email', lambda t: t.send_message(message), policy=GMAIL_SEND_RETRY)
+        if not sent:
+            return None
+        return {
+            'id': sent['id'],
+            'thread_id': sent.get('threadId'),
+            'status': 'sent'
+        }
+
     def test_connection(self) -> bool:
         """Test Gmail API connection."""
         if self.authenticate():
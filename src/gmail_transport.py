@@ -0,0 +1,171 @@
+"""
+Gmail Transport Module
+Pluggable async transports for the Gmail REST API.
+
+GmailClient's blocking methods go through googleapiclient (httplib2, one
+connection per call). The async methods use a GmailTransport instead:
+
+- HttpxTransport (default): calls the REST endpoints directly through one
+  shared httpx.AsyncClient per event loop, so concurrent requests reuse a
+  keep-alive connection pool, multiplexed over HTTP/2 (h2 comes with
+  httpx[http2] in requirements.txt; without it the pool falls back to HTTP/1.1).
+- DiscoveryTransport: runs the googleapiclient calls in worker threads.
+  Select it with GMAIL_TRANSPORT=discovery.
+
+This module does not import googleapiclient or httpx at import time.
+"""
+
+import asyncio
+import importlib.util
+import os
+from typing import Callable, Dict, Optional
+
+GMAIL_API_ENDPOINT = os.getenv("GMAIL_API_ENDPOINT")
+GMAIL_TRANSPORT = os.getenv("GMAIL_TRANSPORT", "httpx")
+GMAIL_MAX_CONNECTIONS = int(os.getenv("GMAIL_MAX_CONNECTIONS", 100))
+GMAIL_TIMEOUT = float(os.getenv("GMAIL_TIMEOUT", 30))
+
+DEFAULT_ENDPOINT = "https://gmail.googleapis.com"
+
+
+class GmailAPIError(Exception):
+    """A Gmail API call failed (HTTP error status or transport failure)."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class GmailTransport:
+    """Interface: async Gmail API calls returning the decoded JSON response."""
+
+    async def create_draft(self, message: Dict) -> Dict:
+        raise NotImplementedError
+
+    async def send_draft(self, draft_id: str) -> Dict:
+        raise NotImplementedError
+
+    async def send_message(self, message: Dict) -> Dict:
+        raise NotImplementedError
+
+
+# Shared connection pool
+# ----------------------
+# httpx connections belong to the event loop that opened them, so the pool is
+# recreated if it is first used from a different loop (e.g. in tests).
+
+_client = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def http2_available() -> bool:
+    """HTTP/2 needs the h2 package (installed by httpx[http2])."""
+    return importlib.util.find_spec("h2") is not None
+
+
+def get_async_client():
+    """Return the shared httpx.AsyncClient for the running event loop."""
+    global _client, _client_loop
+    import httpx
+
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = httpx.AsyncClient(
+            base_url=GMAIL_API_ENDPOINT or DEFAULT_ENDPOINT,
+            http2=http2_available(),
+            timeout=GMAIL_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=GMAIL_MAX_CONNECTIONS,
+                max_keepalive_connections=GMAIL_MAX_CONNECTIONS,
+            ),
+        )
+        _client_loop = loop
+    return _client
+
+
+async def close_async_client():
+    """Close the shared pool (call on application shutdown)."""
+    global _client, _client_loop
+    if _client is not None and _client_loop is asyncio.get_running_loop():
+        await _client.aclose()
+    _client = None
+    _client_loop = None
+
+
+def _retry_after(headers) -> Optional[float]:
+    value = headers.get("Retry-After")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class HttpxTransport(GmailTransport):
+    """Gmail REST calls over the shared httpx connection pool."""
+
+    def __init__(self, creds, refresh: Callable[[], None]):
+        """
+        Args:
+            creds: google.oauth2 Credentials; creds.token is read on every call
+            refresh: Blocking callback that refreshes creds (run in a thread on 401)
+        """
+        self.creds = creds
+        self.refresh = refresh
+
+    async def _post(self, path: str, payload: Dict) -> Dict:
+        import httpx
+
+        client = get_async_client()
+        for attempt in range(2):
+            try:
+                response = await client.post(
+                    path, json=payload, headers={"Authorization": f"Bearer {self.creds.token}"}
+                )
+            except httpx.HTTPError as e:
+                raise GmailAPIError(f"{type(e).__name__}: {e}") from e
+
+            # Access token expired mid-batch: refresh once and retry
+            if response.status_code == 401 and attempt == 0 and self.creds.refresh_token:
+                await asyncio.to_thread(self.refresh)
+                continue
+            if response.status_code >= 400:
+                raise GmailAPIError(
+                    f"Gmail API returned {response.status_code}: {response.text[:200]}",
+                    status_code=response.status_code,
+                    retry_after=_retry_after(response.headers),
+                )
+            return response.json()
+
+    async def create_draft(self, message: Dict) -> Dict:
+        return await self._post("/gmail/v1/users/me/drafts", {"message": message})
+
+    async def send_draft(self, draft_id: str) -> Dict:
+        return await self._post("/gmail/v1/users/me/drafts/send", {"id": draft_id})
+
+    async def send_message(self, message: Dict) -> Dict:
+        return await self._post("/gmail/v1/users/me/messages/send", message)
+
+
+class DiscoveryTransport(GmailTransport):
+    """googleapiclient calls run in worker threads (one blocking connection each)."""
+
+    def __init__(self, service):
+        self.service = service
+
+    async def _execute(self, request) -> Dict:
+        from googleapiclient.errors import HttpError
+
+        try:
+            return await asyncio.to_thread(request.execute)
+        except HttpError as e:
+            raise GmailAPIError(str(e), status_code=e.resp.status, retry_after=_retry_after(e.resp)) from e
+
+    async def create_draft(self, message: Dict) -> Dict:
+        return await self._execute(self.service.users().drafts().create(userId='me', body={'message': message}))
+
+    async def send_draft(self, draft_id: str) -> Dict:
+        return await self._execute(self.service.users().drafts().send(userId='me', body={'id': draft_id}))
+
+    async def send_message(self, message: Dict) -> Dict:
+        return await self._execute(self.service.users().messages().send(userId='me', body=message))
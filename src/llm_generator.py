@@ -3,90 +3,196 @@ LLM Email Generator Module
 Uses Gemini to generate personalized cold emails.
 """
 
+import hashlib
 import os
 import json
-import asyncio
-import logging
+import time
 from datetime import datetime
-from pathlib import Path
-from typing import Dict, Optional
-from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Dict, List, Optional
 from dotenv import load_dotenv
 from google import genai
+from google.genai import errors as genai_errors
+
+from src.companies import company_notes
+from src.logger import get_logger
+from src.metrics import GEMINI_BATCH_ITEMS, GEMINI_ERRORS, GEMINI_REQUEST_DURATION, GEMINI_TOKENS
+from src.retry import (
+    NETWORK,
+    AdaptiveLimiter,
+    CircuitBreaker,
+    CircuitOpenError,
+    ErrorInfo,
+    RetryPolicy,
+    classify_status,
+    parse_retry_after,
+)
 
 # Load environment variables
 load_dotenv()
 
-# Setup async logging
-LOG_DIR = Path("logs")
-LOG_DIR.mkdir(exist_ok=True)
+# Global logger instance
+logger = get_logger("llm_generator.log")
 
-# Thread pool for async file operations
-_executor = ThreadPoolExecutor(max_workers=2)
+# Static part of every prompt, sent as the system instruction. Keeping it
+# byte-identical across calls lets Gemini's implicit prefix caching apply;
+# each request then carries only the recruiter variables.
+SYSTEM_INSTRUCTION = """Role: You are a Technical Career Strategist. Your goal is to write a short, high-impact cold email for Ansh Agrawal to recruiters.
 
+Candidate Data (Ansh):
 
-class AsyncLogger:
-    """Async logger that writes to file without blocking."""
-    
-    def __init__(self, log_file: str = "llm_generator.log"):
-        self.log_path = LOG_DIR / log_file
-        self._loop = None
-    
-    def _get_loop(self):
-        """Get or create event loop."""
-        try:
-            return asyncio.get_event_loop()
-        except RuntimeError:
-            return None
-    
-    def _write_sync(self, message: str):
-        """Synchronous file write."""
-        with open(self.log_path, 'a', encoding='utf-8') as f:
-            f.write(message + '\n')
-    
-    async def _write_async(self, message: str):
-        """Async file write using thread pool."""
-        loop = asyncio.get_event_loop()
-        await loop.run_in_executor(_executor, self._write_sync, message)
-    
-    def _format_message(self, level: str, message: str, **kwargs) -> str:
-        """Format log message with timestamp and metadata."""
-        timestamp = datetime.now().isoformat()
-        log_entry = {
-            "timestamp": timestamp,
-            "level": level,
-            "message": message,
-            **kwargs
-        }
-        return json.dumps(log_entry)
-    
-    def log(self, level: str, message: str, **kwargs):
-        """Log message - async if in event loop, sync otherwise."""
-        formatted = self._format_message(level, message, **kwargs)
-        
-        loop = self._get_loop()
-        if loop and loop.is_running():
-            # Schedule async write
-            asyncio.create_task(self._write_async(formatted))
-        else:
-            # Fall back to sync write
-            self._write_sync(formatted)
-    
-    def info(self, message: str, **kwargs):
-        self.log("INFO", message, **kwargs)
-    
-    def error(self, message: str, **kwargs):
-        self.log("ERROR", message, **kwargs)
-    
-    def debug(self, message: str, **kwargs):
-        self.log("DEBUG", message, **kwargs)
-    
-    def warning(self, message: str, **kwargs):
-        self.log("WARNING", message, **kwargs)
+Current Role: Data Science Intern @ Motilal Oswal Financial Services (6+ months).
 
+Education: Final-year B.Tech CS (AI/ML) at Bennett University (Graduating May 2026).
 
-# Global logger instance
-logger = AsyncLogger()
+Technical Edge: Building production-grade GraphRAG/LightRAG for entity reasoning and Supervisor-led multi-agent systems using LangGraph and Claude 3.5.
+
+Data Edge: Developing ReAct-style SQL agents to bridge natural language and financial databases.
+
+Instructions:
+
+Each request gives the Recruiter, Company, Company Type and Notes. Analyze the Company Type and Notes:
+
+For Startups: Highlight "Agentic Workflows" and "Multi-agent systems" (speed and autonomy).
+
+For MNCs/Fintech: Highlight "SQL-Agents" and "GraphRAG" (accuracy, structured data, and insights).
+
+Subject Line: Must be professional and technical. Format: [Technical Focus/Keyword] // Ansh Agrawal (Motilal Oswal)
+
+The Hook: Start with the current work at Motilal Oswal. Frame Ansh as a pre-grad professional with 6+ months of experience.
+
+Tone: Direct, technical, and confident. Use "I've been building..." instead of "I am looking for..."
+
+Constraints: Max 4 sentences in the body. No "I hope you are well." Address the recruiter by first name.
+
+Format: Subject: [subject line]
+
+[body]
+
+Best, Ansh"""
+
+# Recipients per Gemini call in generate_many (1 = one call per recipient)
+LLM_BATCH_SIZE = int(os.getenv("LLM_BATCH_SIZE", 10))
+
+BATCH_RESPONSE_SCHEMA = {
+    "type": "ARRAY",
+    "items": {
+        "type": "OBJECT",
+        "properties": {
+            "id": {"type": "INTEGER"},
+            "subject": {"type": "STRING"},
+            "body": {"type": "STRING"},
+        },
+        "required": ["id", "subject", "body"],
+    },
+}
+
+# Company blurbs (src/companies.py): written once per company, reused by every
+# email to its recruiters in place of the raw keyword notes
+BLURB_INSTRUCTION = """For each company below, write one sentence (at most 30 words) saying what the company does and which data, ML or AI problems it is likely working on. Be specific and factual; do not invent products. Return a JSON array with one object per company: "id" (the number in brackets) and "blurb"."""
+
+BLURB_RESPONSE_SCHEMA = {
+    "type": "ARRAY",
+    "items": {
+        "type": "OBJECT",
+        "properties": {
+            "id": {"type": "INTEGER"},
+            "blurb": {"type": "STRING"},
+        },
+        "required": ["id", "blurb"],
+    },
+}
+
+# Apollo notes can carry hundreds of keywords; only this many tokens are sent
+NOTES_TOKEN_BUDGET = int(os.getenv("LLM_NOTES_TOKEN_BUDGET", 60))
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for English text (~4 characters per token)."""
+    return (len(text) + 3) // 4
+
+
+def compact_notes(notes, max_tokens: int = NOTES_TOKEN_BUDGET) -> str:
+    """
+    Trim recruiter notes to a token budget.
+
+    Apollo notes look like "Industry | Keywords: a, b, c". The industry is
+    kept, keywords are de-duplicated (case-insensitively, first spelling wins)
+    and added in order until the budget is used. Other notes are cut at a word
+    boundary.
+
+    Args:
+        notes: Notes string (None/NaN treated as empty)
+        max_tokens: Budget as estimated by estimate_tokens
+
+    Returns:
+        Notes that fit the budget
+    """
+    if not isinstance(notes, str):
+        return ""
+    notes = " ".join(notes.split())
+    if estimate_tokens(notes) <= max_tokens:
+        return notes
+    max_chars = max_tokens * 4
+
+    head, sep, keywords = notes.partition("Keywords:")
+    if not sep:
+        return notes[:max_chars].rsplit(" ", 1)[0]
+
+    result = (head + sep).strip()
+    seen = set()
+    kept = []
+    for keyword in keywords.split(","):
+        keyword = keyword.strip()
+        if not keyword or keyword.lower() in seen:
+            continue
+        candidate = f"{result} {', '.join(kept + [keyword])}"
+        if len(candidate) > max_chars:
+            break
+        seen.add(keyword.lower())
+        kept.append(keyword)
+    return f"{result} {', '.join(kept)}" if kept else result[:max_chars]
+
+# Concurrent Gemini calls per process (adapts down on 429 RESOURCE_EXHAUSTED)
+GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", 16))
+GEMINI_MAX_STREAMS = int(os.getenv("GEMINI_MAX_STREAMS", GEMINI_MAX_CONCURRENCY))
+
+
+def _retry_delay(details) -> Optional[float]:
+    """Read google.rpc.RetryInfo.retryDelay (e.g. "17s") from a Gemini error body."""
+    error = details.get("error", {}) if isinstance(details, dict) else {}
+    for detail in error.get("details") or []:
+        delay = detail.get("retryDelay") if isinstance(detail, dict) else None
+        if isinstance(delay, str) and delay.endswith("s"):
+            return parse_retry_after(delay[:-1])
+    return None
+
+
+def classify_gemini_error(error: Exception) -> ErrorInfo:
+    """Map a Gemini API failure to a retry error class."""
+    import httpx
+    from google.genai import errors
+
+    if isinstance(error, errors.APIError):
+        headers = getattr(error.response, "headers", None) or {}
+        retry_after = parse_retry_after(headers.get("retry-after")) or _retry_delay(error.details)
+        return ErrorInfo(classify_status(error.code), retry_after)
+    if isinstance(error, (httpx.TransportError, OSError, TimeoutError)):
+        return ErrorInfo(NETWORK)
+    return ErrorInfo(None)
+
+
+GEMINI_RETRY = RetryPolicy(
+    "gemini",
+    classify_gemini_error,
+    max_delay=20.0,
+    breaker=CircuitBreaker("gemini"),
+    limiter=AdaptiveLimiter("gemini", initial=GEMINI_MAX_CONCURRENCY, maximum=GEMINI_MAX_CONCURRENCY),
+)
+# Open streams per process (fixed). GEMINI_RETRY's slot only covers opening a
+# stream, so astream() holds one of these until the stream is consumed.
+GEMINI_STREAMS = AdaptiveLimiter(
+    "gemini_stream", initial=GEMINI_MAX_STREAMS, minimum=GEMINI_MAX_STREAMS, maximum=GEMINI_MAX_STREAMS
+)
 
 
 class LLMEmailGenerator:
@@ -104,6 +210,15 @@ class LLMEmailGenerator:
         with open(profile_path, 'r', encoding='utf-8') as f:
             return json.load(f)
     
+    @property
+    def profile_hash(self) -> str:
+        """Hash of everything besides the recipient that shapes an email (model, instruction, profile)."""
+        key = json.dumps(
+            [self.model, SYSTEM_INSTRUCTION, NOTES_TOKEN_BUDGET, self.profile],
+            sort_keys=True, default=str
+        )
+        return hashlib.sha256(key.encode()).hexdigest()
+    
     def _setup_gemini(self):
         """Configure Gemini API."""
         api_key = os.getenv("GEMINI_API_KEY")
@@ -111,74 +226,75 @@ class LLMEmailGenerator:
             logger.error("GEMINI_API_KEY not set")
             raise ValueError("GEMINI_API_KEY environment variable not set")
         
-        self.client = genai.Client(api_key=api_key)
+        # GEMINI_BASE_URL points the client at a stand-in server (see benchmarks/)
+        base_url = os.getenv("GEMINI_BASE_URL")
+        http_options = genai.types.HttpOptions(base_url=base_url) if base_url else None
+        self.client = genai.Client(api_key=api_key, http_options=http_options)
         self.model = "gemini-2.5-flash"
+        # Built once and shared by every call
+        self.config = genai.types.GenerateContentConfig(system_instruction=SYSTEM_INSTRUCTION)
+        self.batch_config = genai.types.GenerateContentConfig(
+            system_instruction=SYSTEM_INSTRUCTION,
+            response_mime_type="application/json",
+            response_schema=BATCH_RESPONSE_SCHEMA,
+        )
+        self.blurb_config = genai.types.GenerateContentConfig(
+            system_instruction=BLURB_INSTRUCTION,
+            response_mime_type="application/json",
+            response_schema=BLURB_RESPONSE_SCHEMA,
+        )
         logger.info("Gemini client configured", model=self.model)
     
     def _build_prompt(self, recruiter: Dict) -> str:
-        """Build the prompt for Gemini."""
+        """Build the per-recipient part of the prompt (the rest is SYSTEM_INSTRUCTION)."""
         recruiter_name = recruiter.get("recruiter_name", "Hiring Manager")
         first_name = recruiter_name.split()[0] if recruiter_name else "there"
         company = recruiter.get("company", "your company")
         company_type = recruiter.get("company_type", "")
-        notes = recruiter.get("notes", "")
+        # A stored company blurb replaces the (longer) keyword notes
+        notes = recruiter.get("company_blurb") or compact_notes(recruiter.get("notes", ""), NOTES_TOKEN_BUDGET)
         
-        prompt = f"""Role: You are a Technical Career Strategist. Your goal is to write a short, high-impact cold email for Ansh Agrawal to recruiters.
-
-Candidate Data (Ansh):
-
-
-Current Role: Data Science Intern @ Motilal Oswal Financial Services (6+ months).
-
-
-Education: Final-year B.Tech CS (AI/ML) at Bennett University (Graduating May 2026).
-
-
-
-
-Technical Edge: Building production-grade GraphRAG/LightRAG for entity reasoning and Supervisor-led multi-agent systems using LangGraph and Claude 3.5.
-
-
-Data Edge: Developing ReAct-style SQL agents to bridge natural language and financial databases.
-
-Instructions for the AI:
-
-Analyze {company_type} and {notes}:
-
-
-For Startups: Highlight "Agentic Workflows" and "Multi-agent systems" (speed and autonomy).
-
-
-For MNCs/Fintech: Highlight "SQL-Agents" and "GraphRAG" (accuracy, structured data, and insights).
-
-
-Subject Line: Must be professional and technical. Format: [Technical Focus/Keyword] // Ansh Agrawal (Motilal Oswal)
-
-The Hook: Start with the current work at Motilal Oswal. Frame Ansh as a pre-grad professional with 6+ months of experience.
-
-
-
-Tone: Direct, technical, and confident. Use "I've been building..." instead of "I am looking for..."
-
-Constraints: Max 4 sentences in the body. No "I hope you are well."
-
-Variables:
-
-Recruiter: {recruiter_name} (First name: {first_name})
-
+        return f"""Recruiter: {recruiter_name} (First name: {first_name})
 Company: {company}
-
 Company Type: {company_type}
-
-Notes: {notes}
-
-Format: Subject: [subject line]
-
-[body]
-
-Best, Ansh"""
-        
-        return prompt
+Notes: {notes}"""
+    
+    def _build_batch_prompt(self, recruiters: List[Dict]) -> str:
+        """Build one prompt asking for an email per recruiter, numbered from 1."""
+        sections = [f"[{i}]\n{self._build_prompt(r)}" for i, r in enumerate(recruiters, 1)]
+        return (
+            f"Write one email for each of the {len(recruiters)} recipients below. "
+            'Return a JSON array with one object per recipient: "id" (the number in brackets), '
+            '"subject" (the subject line only) and "body" (the email body ending with the sign-off, '
+            "without the subject line).\n\n" + "\n\n".join(sections)
+        )
+    
+    def add_attachment_note(self, body: str, has_attachments: bool) -> str:
+        """Append the resume mention when attachments are included."""
+        if not has_attachments:
+            return body
+        return body.rstrip() + "\n\nI've attached my resume for your reference."
+    
+    def _generate_content(self, prompt: str, config=None):
+        """Single Gemini call, timed and counted per attempt."""
+        start = time.perf_counter()
+        try:
+            response = self.client.models.generate_content(
+                model=self.model,
+                contents=prompt,
+                config=config or self.config
+            )
+        except Exception as e:
+            GEMINI_REQUEST_DURATION.observe(time.perf_counter() - start, outcome='error')
+            GEMINI_ERRORS.inc(error_type=type(e).__name__)
+            raise
+        GEMINI_REQUEST_DURATION.observe(time.perf_counter() - start, outcome='success')
+        usage = getattr(response, 'usage_metadata', None)
+        if usage is not None:
+            GEMINI_TOKENS.inc(usage.prompt_token_count or 0, kind='prompt')
+            GEMINI_TOKENS.inc(usage.cached_content_token_count or 0, kind='cached')
+            GEMINI_TOKENS.inc(usage.candidates_token_count or 0, kind='output')
+        return response
     
     def generate(
         self,
@@ -200,35 +316,16 @@ Best, Ansh"""
         
         prompt = self._build_prompt(recruiter)
         
+        start_time = datetime.now()
+        duration_ms = None
         try:
-            start_time = datetime.now()
-            response = self.client.models.generate_content(
-                model=self.model,
-                contents=prompt
-            )
+            # Transient errors (429/5xx/network) are retried with backoff first
+            response = GEMINI_RETRY.call(self._generate_content, prompt)
             duration_ms = (datetime.now() - start_time).total_seconds() * 1000
             
-            text = response.text.strip()
-            
-            # Parse subject and body
-            lines = text.split('\n')
-            subject = ""
-            body_start = 0
-            
-            for i, line in enumerate(lines):
-                if line.lower().startswith("subject:"):
-                    subject = line[8:].strip()
-                    body_start = i + 1
-                    break
-            
-            body = '\n'.join(lines[body_start:]).strip()
-            
-            # Add attachment mention if present
-            if has_attachments:
-                body = body.rstrip()
-                if not body.endswith('\n'):
-                    body += '\n'
-                body += "\nI've attached my resume for your reference."
+            email = self.parse_email(response.text)
+            subject = email["subject"]
+            body = self.add_attachment_note(email["body"], has_attachments)
             
             logger.info(
                 "Email generated successfully",
@@ -241,6 +338,9 @@ Best, Ansh"""
             return {"subject": subject, "body": body}
             
         except Exception as e:
+            if duration_ms is not None or isinstance(e, CircuitOpenError):
+                # API call failures are already counted per attempt
+                GEMINI_ERRORS.inc(error_type=type(e).__name__)
             logger.error(
                 "Email generation failed",
                 company=company,
@@ -249,50 +349,192 @@ Best, Ansh"""
             )
             
             # Fallback to simple template if LLM fails
-            recruiter_name = recruiter.get("recruiter_name", "Hiring Manager")
-            first_name = recruiter_name.split()[0] if recruiter_name else "there"
-            company = recruiter.get("company", "your company")
-            
-            return {
-                "subject": f"GenAI Intern @ Motilal Oswal - AI/ML Opportunities at {company}",
-                "body": f"""Hi {first_name},
+            return self.fallback_email(recruiter)
+    
+    def parse_email(self, text: str) -> Dict:
+        """Split model output into subject and body (the "Subject:" line may be missing)."""
+        lines = text.strip().split('\n')
+        subject = ""
+        body_start = 0
+        
+        for i, line in enumerate(lines):
+            if line.lower().startswith("subject:"):
+                subject = line[8:].strip()
+                body_start = i + 1
+                break
+        
+        return {"subject": subject, "body": '\n'.join(lines[body_start:]).strip()}
+    
+    def fallback_email(self, recruiter: Dict) -> Dict:
+        """Simple template used when Gemini fails (flagged so it is never cached)."""
+        recruiter_name = recruiter.get("recruiter_name", "Hiring Manager")
+        first_name = recruiter_name.split()[0] if recruiter_name else "there"
+        company = recruiter.get("company", "your company")
+        
+        return {
+            "subject": f"GenAI Intern @ Motilal Oswal - AI/ML Opportunities at {company}",
+            "body": f"""Hi {first_name},
 
 I'm a final-year CS student at Bennett University with 6+ months experience as a GenAI Intern at Motilal Oswal, where I built production RAG systems and multi-agent architectures using LangChain and Claude. I'm interested in AI/ML opportunities at {company}.
 
 How can I start the interview process?
 
 Best,
-Ansh"""
-            }
+Ansh""",
+            "fallback": True
+        }
     
-    def generate_batch(self, recruiters: list, template_name: str = "professional") -> list:
-        """Generate emails for multiple recruiters."""
-        logger.info("Starting batch generation", count=len(recruiters))
-        results = []
+    async def astream(self, recruiter: Dict) -> AsyncIterator[str]:
+        """
+        Stream the email text for one recruiter as Gemini produces it.
+        
+        Opening the stream is retried like generate(); errors after the first
+        chunk are raised to the caller, which should use fallback_email().
+        A GEMINI_STREAMS slot is held until the stream ends.
+        
+        Yields:
+            Text chunks; joined they parse with parse_email()
+        """
+        start = time.perf_counter()
+        try:
+            async with GEMINI_STREAMS.slot_async():
+                stream = await GEMINI_RETRY.acall(
+                    self.client.aio.models.generate_content_stream,
+                    model=self.model,
+                    contents=self._build_prompt(recruiter),
+                    config=self.config
+                )
+                async for chunk in stream:
+                    if chunk.text:
+                        yield chunk.text
+        except Exception as e:
+            GEMINI_REQUEST_DURATION.observe(time.perf_counter() - start, outcome='error')
+            GEMINI_ERRORS.inc(error_type=type(e).__name__)
+            raise
+        GEMINI_REQUEST_DURATION.observe(time.perf_counter() - start, outcome='success')
+    
+    def generate_many(
+        self,
+        recruiters: List[Dict],
+        has_attachments: bool = False,
+        batch_size: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Generate emails for many recruiters, several per Gemini call.
+        
+        Each call asks for a JSON array of emails for up to batch_size
+        recruiters. Recruiters whose item is missing or invalid (or whose whole
+        batch failed) go through generate() one by one instead.
+        
+        Args:
+            recruiters: Recruiter dicts as accepted by generate()
+            has_attachments: Whether attachments are being added
+            batch_size: Recipients per call (defaults to LLM_BATCH_SIZE)
+        
+        Returns:
+            List of dicts with subject and body keys, in the order of recruiters
+        """
+        batch_size = max(1, batch_size or LLM_BATCH_SIZE)
+        if batch_size == 1:
+            return [self.generate(r, has_attachments=has_attachments) for r in recruiters]
+        
+        results: List[Optional[Dict]] = [None] * len(recruiters)
+        for start in range(0, len(recruiters), batch_size):
+            chunk = recruiters[start:start + batch_size]
+            for i, email in enumerate(self._generate_chunk(chunk)):
+                if email is not None:
+                    email["body"] = self.add_attachment_note(email["body"], has_attachments)
+                    results[start + i] = email
         
-        for i, recruiter in enumerate(recruiters):
+        missing = [i for i, email in enumerate(results) if email is None]
+        if missing:
+            logger.warning("Batched generation fell back to single calls", count=len(missing), total=len(recruiters))
+            GEMINI_BATCH_ITEMS.inc(len(missing), outcome='fallback')
+        for i in missing:
+            results[i] = self.generate(recruiters[i], has_attachments=has_attachments)
+        GEMINI_BATCH_ITEMS.inc(len(recruiters) - len(missing), outcome='batched')
+        return results
+    
+    def _generate_chunk(self, recruiters: List[Dict]) -> List[Optional[Dict]]:
+        """One batched call; returns an email (or None if unusable) per recruiter."""
+        start_time = datetime.now()
+        try:
+            response = GEMINI_RETRY.call(self._generate_content, self._build_batch_prompt(recruiters), self.batch_config)
+            items = json.loads(response.text)
+        except Exception as e:
+            if not isinstance(e, genai_errors.APIError):
+                # API call failures are already counted per attempt
+                GEMINI_ERRORS.inc(error_type=type(e).__name__)
+            logger.error("Batched generation failed", count=len(recruiters), error=str(e), error_type=type(e).__name__)
+            return [None] * len(recruiters)
+        
+        emails: List[Optional[Dict]] = [None] * len(recruiters)
+        for item in items if isinstance(items, list) else []:
+            if not isinstance(item, dict):
+                continue
+            index = item.get("id")
+            subject, body = item.get("subject"), item.get("body")
+            if (
+                isinstance(index, int) and 1 <= index <= len(recruiters)
+                and isinstance(subject, str) and subject.strip()
+                and isinstance(body, str) and body.strip()
+            ):
+                emails[index - 1] = {"subject": subject.strip(), "body": body.strip()}
+        
+        logger.info(
+            "Batch generated",
+            count=len(recruiters),
+            valid=sum(e is not None for e in emails),
+            duration_ms=round((datetime.now() - start_time).total_seconds() * 1000, 2)
+        )
+        return emails
+    
+    def company_blurbs(self, companies: List[Dict]) -> List[Optional[str]]:
+        """
+        Write a one-sentence blurb per company, LLM_BATCH_SIZE companies per call.
+        
+        Args:
+            companies: Dicts with company, company_type, industry and keywords keys
+        
+        Returns:
+            Blurb (or None if generation failed) per company, in order
+        """
+        blurbs: List[Optional[str]] = [None] * len(companies)
+        batch_size = max(1, LLM_BATCH_SIZE)
+        for start in range(0, len(companies), batch_size):
+            chunk = companies[start:start + batch_size]
+            prompt = "\n\n".join(
+                f"[{i}]\nCompany: {c.get('company')}\nCompany Type: {c.get('company_type') or 'unknown'}\n"
+                f"Notes: {compact_notes(company_notes(c.get('industry'), c.get('keywords')), NOTES_TOKEN_BUDGET)}"
+                for i, c in enumerate(chunk, 1)
+            )
             try:
-                result = self.generate(recruiter, template_name)
-                results.append({
-                    "recruiter": recruiter,
-                    "subject": result["subject"],
-                    "body": result["body"],
-                    "status": "generated"
-                })
+                response = GEMINI_RETRY.call(self._generate_content, prompt, self.blurb_config)
+                items = json.loads(response.text)
             except Exception as e:
-                logger.error(
-                    "Batch item failed",
-                    index=i,
-                    company=recruiter.get("company", "Unknown"),
-                    error=str(e)
-                )
-                results.append({
-                    "recruiter": recruiter,
-                    "subject": None,
-                    "body": None,
-                    "status": "error",
-                    "error": str(e)
-                })
+                if not isinstance(e, genai_errors.APIError):
+                    GEMINI_ERRORS.inc(error_type=type(e).__name__)
+                logger.error("Company blurb generation failed", count=len(chunk), error=str(e), error_type=type(e).__name__)
+                continue
+            for item in items if isinstance(items, list) else []:
+                index = item.get("id") if isinstance(item, dict) else None
+                blurb = item.get("blurb") if isinstance(item, dict) else None
+                if isinstance(index, int) and 1 <= index <= len(chunk) and isinstance(blurb, str) and blurb.strip():
+                    blurbs[start + index - 1] = " ".join(blurb.split())
+        return blurbs
+    
+    def generate_batch(self, recruiters: list, template_name: str = "professional") -> list:
+        """Generate emails for multiple recruiters."""
+        logger.info("Starting batch generation", count=len(recruiters))
+        results = [
+            {
+                "recruiter": recruiter,
+                "subject": email["subject"],
+                "body": email["body"],
+                "status": "generated"
+            }
+            for recruiter, email in zip(recruiters, self.generate_many(recruiters))
+        ]
         
         success_count = sum(1 for r in results if r["status"] == "generated")
         logger.info("Batch generation complete", total=len(recruiters), success=success_count)
@@ -0,0 +1,253 @@
+"""
+Logger Module
+Structured JSON logging through a shared, buffered background writer.
+
+Log calls only format the record and put it on a bounded queue; one daemon
+thread per log file drains the queue in batches through a single long-lived
+file handle, flushes, and rotates the file by size. When the queue is full
+records are dropped (and counted) instead of blocking the caller.
+"""
+
+import atexit
+import json
+import os
+import queue
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from src.metrics import Counter
+
+LOG_DIR = Path(os.getenv("LOG_DIR", "logs"))
+LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", 10 * 1024 * 1024))
+LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", 5))
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", 10000))
+
+LOG_RECORDS_WRITTEN = Counter(
+    "outreach_log_records_written_total",
+    "Log records written to disk by file.",
+    ["file"],
+)
+LOG_RECORDS_DROPPED = Counter(
+    "outreach_log_records_dropped_total",
+    "Log records dropped because the writer queue was full.",
+    ["file"],
+)
+
+_STOP = object()
+
+
+class LogWriter:
+    """Background writer for one log file: bounded queue, batched flushes, size rotation."""
+
+    def __init__(
+        self,
+        path: Path,
+        max_bytes: int = LOG_MAX_BYTES,
+        backup_count: int = LOG_BACKUP_COUNT,
+        queue_size: int = LOG_QUEUE_SIZE,
+        batch_size: int = 256,
+        flush_interval: float = 1.0,
+    ):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._file = None
+
+        # Counters
+        self.written = 0
+        self.dropped = 0
+        self.overflows = 0  # times the queue went from accepting to full
+        self._overflowing = False
+
+    def write(self, line: str) -> bool:
+        """Queue a line for writing. Never blocks; returns False if the line was dropped."""
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(line)
+            self._overflowing = False
+            return True
+        except queue.Full:
+            self.dropped += 1
+            if not self._overflowing:
+                self._overflowing = True
+                self.overflows += 1
+            LOG_RECORDS_DROPPED.inc(file=self.path.name)
+            return False
+
+    def flush(self, timeout: float = 5.0):
+        """Block until every queued line has been written and flushed."""
+        if self._thread is not None and self._thread.is_alive():
+            done = threading.Event()
+            try:
+                self._queue.put(done, timeout=timeout)
+            except queue.Full:
+                return
+            done.wait(timeout)
+
+    def close(self, timeout: float = 5.0):
+        """Drain the queue, close the file handle and stop the thread."""
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            pass
+        thread.join(timeout)
+
+    def stats(self) -> Dict:
+        return {
+            "file": str(self.path),
+            "written": self.written,
+            "dropped": self.dropped,
+            "overflows": self.overflows,
+            "queued": self._queue.qsize(),
+        }
+
+    def _ensure_started(self):
+        # Also restarts the thread in a forked child, where it doesn't exist
+        if self._pid == os.getpid() and self._thread is not None:
+            return
+        with self._lock:
+            if self._pid == os.getpid() and self._thread is not None:
+                return
+            self._pid = os.getpid()
+            self._file = None
+            self._thread = threading.Thread(target=self._run, name=f"log-writer:{self.path.name}", daemon=True)
+            self._thread.start()
+
+    def _open(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    def _rotate(self):
+        """Rename file -> file.1 -> file.2 ... and reopen (oldest backup is discarded)."""
+        self._file.close()
+        for i in range(self.backup_count - 1, 0, -1):
+            src = self.path.with_name(f"{self.path.name}.{i}")
+            if src.exists():
+                os.replace(src, self.path.with_name(f"{self.path.name}.{i + 1}"))
+        if self.backup_count > 0:
+            os.replace(self.path, self.path.with_name(f"{self.path.name}.1"))
+        else:
+            self.path.unlink(missing_ok=True)
+        self._open()
+
+    def _write_batch(self, lines: List[str]):
+        if not lines:
+            return
+        if self._file is None:
+            self._open()
+        self._file.write("\n".join(lines) + "\n")
+        self._file.flush()
+        self.written += len(lines)
+        LOG_RECORDS_WRITTEN.inc(len(lines), file=self.path.name)
+        if self.max_bytes and self._file.tell() >= self.max_bytes:
+            self._rotate()
+
+    def _run(self):
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+
+            batch: List[str] = []
+            waiters: List[threading.Event] = []
+            stop = False
+            while True:
+                if item is _STOP:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    batch.append(item)
+                if stop or len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            try:
+                self._write_batch(batch)
+            except OSError:
+                # Never let a disk error kill the writer thread
+                self.dropped += len(batch)
+                LOG_RECORDS_DROPPED.inc(len(batch), file=self.path.name)
+            for waiter in waiters:
+                waiter.set()
+
+            if stop:
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
+                return
+
+
+_writers: Dict[Path, LogWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def get_writer(log_file: str) -> LogWriter:
+    """Return the shared writer for a log file under LOG_DIR (one per file per process)."""
+    path = LOG_DIR / log_file
+    with _writers_lock:
+        writer = _writers.get(path)
+        if writer is None:
+            writer = _writers[path] = LogWriter(path)
+        return writer
+
+
+@atexit.register
+def close_all():
+    """Drain and close every writer (runs at interpreter exit)."""
+    for writer in list(_writers.values()):
+        writer.close()
+
+
+class AsyncLogger:
+    """Structured JSON logger that hands records to a shared background writer."""
+
+    def __init__(self, log_file: str = "app.log"):
+        self.writer = get_writer(log_file)
+        self.log_path = self.writer.path
+
+    def _format_message(self, level: str, message: str, **kwargs) -> str:
+        """Format log message with timestamp and metadata."""
+        log_entry = {
+            "timestamp": datetime.now().isoformat(),
+            "level": level,
+            "message": message,
+            **kwargs
+        }
+        return json.dumps(log_entry, default=str)
+
+    def log(self, level: str, message: str, **kwargs):
+        """Queue a log record; never blocks on disk I/O."""
+        self.writer.write(self._format_message(level, message, **kwargs))
+
+    def info(self, message: str, **kwargs):
+        self.log("INFO", message, **kwargs)
+
+    def error(self, message: str, **kwargs):
+        self.log("ERROR", message, **kwargs)
+
+    def debug(self, message: str, **kwargs):
+        self.log("DEBUG", message, **kwargs)
+
+    def warning(self, message: str, **kwargs):
+        self.log("WARNING", message, **kwargs)
+
+
+def get_logger(log_file: str = "app.log") -> AsyncLogger:
+    """Get a structured logger writing to LOG_DIR/log_file."""
+    return AsyncLogger(log_file)
@@ -0,0 +1,282 @@
+"""
+Metrics Module
+Lightweight in-process counters, gauges and histograms rendered in the
+Prometheus text exposition format (served at /metrics).
+
+Each observation is a dict lookup plus a bisect under a lock, so the
+instrumentation is cheap enough to leave on in production. Values are per
+process: with several uvicorn workers, scrape each worker or aggregate in
+Prometheus.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, List, Sequence, Tuple
+
+# Latency buckets in seconds (sub-ms DB queries up to slow LLM calls)
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_registry: List["_Metric"] = []
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    """Format a label set as {a="x",b="y"}."""
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    """Base class: a named metric family with a fixed set of label names."""
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def _key(self, labels: Dict) -> Tuple[str, ...]:
+        try:
+            key = tuple(str(labels[n]) for n in self.labelnames)
+        except KeyError:
+            key = None
+        if key is None or len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return key
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in items]
+
+
+class Gauge(_Metric):
+    """Value that can go up and down (e.g. queue depth)."""
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def get(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in items]
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [bucket counts..., +Inf count], sum
+        self._counts: Dict[Tuple[str, ...], List[int]] = {}
+        self._sums: Dict[Tuple[str, ...], float] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+                self._sums[key] = 0.0
+            counts[index] += 1
+            self._sums[key] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of the with-block in seconds (recorded even on error)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels) -> int:
+        return sum(self._counts.get(self._key(labels), ()))
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = [(k, list(c), self._sums[k]) for k, c in self._counts.items()]
+        lines = []
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_format_value(float(bound))}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+def render() -> str:
+    """Render every registered metric in the Prometheus text format."""
+    return "\n".join(metric.render() for metric in _registry) + "\n"
+
+
+# Application metrics
+# -------------------
+
+HTTP_REQUEST_DURATION = Histogram(
+    "outreach_http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ["method", "route", "status"],
+)
+
+GEMINI_REQUEST_DURATION = Histogram(
+    "outreach_gemini_request_duration_seconds",
+    "Gemini generate_content latency.",
+    ["outcome"],
+)
+GEMINI_ERRORS = Counter(
+    "outreach_gemini_errors_total",
+    "Gemini calls that raised, by exception type.",
+    ["error_type"],
+)
+
+GEMINI_TOKENS = Counter(
+    "outreach_gemini_tokens_total",
+    "Gemini tokens by kind (prompt, cached part of the prompt, output).",
+    ["kind"],
+)
+
+GEMINI_BATCH_ITEMS = Counter(
+    "outreach_gemini_batch_items_total",
+    "Recipients handled by batched generation, by outcome (batched or fallback to a single call).",
+    ["outcome"],
+)
+
+GMAIL_REQUEST_DURATION = Histogram(
+    "outreach_gmail_request_duration_seconds",
+    "Gmail API call latency by operation.",
+    ["operation"],
+)
+GMAIL_ERRORS = Counter(
+    "outreach_gmail_errors_total",
+    "Failed Gmail API calls by operation.",
+    ["operation"],
+)
+
+UPSTREAM_RETRIES = Counter(
+    "outreach_upstream_retries_total",
+    "Retried upstream calls by upstream and error class.",
+    ["upstream", "error_class"],
+)
+CIRCUIT_STATE = Gauge(
+    "outreach_circuit_state",
+    "Circuit breaker state per upstream (0 closed, 1 half-open, 2 open).",
+    ["upstream"],
+)
+CONCURRENCY_LIMIT = Gauge(
+    "outreach_concurrency_limit",
+    "Current adaptive (AIMD) concurrency limit per upstream.",
+    ["upstream"],
+)
+
+DB_QUERY_DURATION = Histogram(
+    "outreach_db_query_duration_seconds",
+    "Database statement execution time by statement type.",
+    ["operation"],
+)
+
+IMPORT_ROWS = Counter(
+    "outreach_import_rows_total",
+    "Contact rows processed by CSV imports.",
+)
+IMPORT_ROWS_REJECTED = Counter(
+    "outreach_import_rows_rejected_total",
+    "Contact rows dropped by import-time email validation, by reason.",
+    ["reason"],
+)
+DELIVERABILITY_CHECKS = Counter(
+    "outreach_deliverability_checks_total",
+    "Recipient domains checked at import, by source (cache, dns) and result.",
+    ["source", "result"],
+)
+IMPORT_ROWS_PER_SECOND = Histogram(
+    "outreach_import_rows_per_second",
+    "Throughput of individual CSV imports.",
+    buckets=(10, 50, 100, 500, 1000, 5000, 10000, 50000, 100000, 500000),
+)
+
+DASHBOARD_CACHE = Counter(
+    "outreach_dashboard_cache_total",
+    "Dashboard snapshot lookups, by result (hit, miss).",
+    ["result"],
+)
+
+SEND_QUEUE_DEPTH = Gauge(
+    "outreach_send_queue_depth",
+    "Drafts queued by /api/send-all and not yet processed.",
+)
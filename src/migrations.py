@@ -0,0 +1,222 @@
+"""
+Versioned database schema migrations.
+
+Each migration is registered with a version number and recorded in the
+schema_migrations table once applied. Run pending migrations once per deploy:
+
+    python scripts/cli.py migrate        # or: python -m src.migrations
+
+API workers never run DDL; at startup they only read the current version
+(MAX over the primary key) and compare it with SCHEMA_VERSION. On PostgreSQL
+concurrent runners (overlapping deploys, AUTO_MIGRATE replicas) are
+serialized with an advisory lock.
+"""
+
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, func, inspect, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.database import Base
+
+_metadata = MetaData()
+
+# Arbitrary application-wide key for pg_advisory_lock
+MIGRATION_LOCK_KEY = 728_104_315
+
+schema_migrations = Table(
+    "schema_migrations",
+    _metadata,
+    Column("version", Integer, primary_key=True),
+    Column("name", String(255), nullable=False),
+    Column("applied_at", DateTime, default=datetime.utcnow),
+)
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    apply: Callable[[Connection], None]
+
+
+MIGRATIONS: List[Migration] = []
+
+
+def migration(version: int, name: str):
+    """Register a migration function. Versions must be added in increasing order."""
+    def decorator(fn: Callable[[Connection], None]):
+        if MIGRATIONS and version <= MIGRATIONS[-1].version:
+            raise ValueError(f"Migration {version} ({name}) registered out of order")
+        MIGRATIONS.append(Migration(version, name, fn))
+        return fn
+    return decorator
+
+
+def _add_column_if_missing(conn: Connection, table: str, column: str, ddl: str):
+    """Add a column unless it already exists (create_all never alters existing tables)."""
+    columns = {col["name"] for col in inspect(conn).get_columns(table)}
+    if column not in columns:
+        print(f"Adding column {column} to {table}...")
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+
+
+# Migrations
+# ----------
+# Version 1 creates any missing tables from the current models, so later
+# migrations must be idempotent: on a fresh database their changes already exist.
+
+@migration(1, "initial_schema")
+def _initial_schema(conn: Connection):
+    import src.models  # noqa: F401 - registers models on Base.metadata
+    Base.metadata.create_all(bind=conn)
+
+
+@migration(2, "users_oauth_tokens")
+def _users_oauth_tokens(conn: Connection):
+    _add_column_if_missing(conn, "users", "access_token", "TEXT")
+    _add_column_if_missing(conn, "users", "refresh_token", "TEXT")
+    _add_column_if_missing(conn, "users", "token_expiry", "TIMESTAMP")
+
+
+@migration(3, "email_logs_gmail_draft_id")
+def _email_logs_gmail_draft_id(conn: Connection):
+    _add_column_if_missing(conn, "email_logs", "gmail_draft_id", "VARCHAR(255)")
+
+
+@migration(4, "users_password_hash")
+def _users_password_hash(conn: Connection):
+    _add_column_if_missing(conn, "users", "password_hash", "VARCHAR(255)")
+
+
+@migration(5, "generated_emails")
+def _generated_emails(conn: Connection):
+    from src.models import GeneratedEmail
+    GeneratedEmail.__table__.create(bind=conn, checkfirst=True)
+
+
+
+@migration(6, "company_profiles")
+def _company_profiles(conn: Connection):
+    from src.models import CompanyProfile
+    CompanyProfile.__table__.create(bind=conn, checkfirst=True)
+    _add_column_if_missing(conn, "contacts", "company_profile_id", "INTEGER REFERENCES company_profiles(id)")
+    # create_all only indexes the column on fresh databases
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_contacts_company_profile_id ON contacts (company_profile_id)"))
+
+
+
+@migration(7, "domain_checks")
+def _domain_checks(conn: Connection):
+    from src.models import DomainCheck
+    DomainCheck.__table__.create(bind=conn, checkfirst=True)
+
+
+
+@migration(8, "uploads")
+def _uploads(conn: Connection):
+    from src.models import Upload
+    Upload.__table__.create(bind=conn, checkfirst=True)
+
+
+@migration(9, "users_data_version")
+def _users_data_version(conn: Connection):
+    _add_column_if_missing(conn, "users", "data_version", "INTEGER NOT NULL DEFAULT 0")
+
+
+@migration(10, "contacts_lowercase_emails")
+def _contacts_lowercase_emails(conn: Connection):
+    # Imports normalize addresses before the duplicate check; legacy rows must match
+    conn.execute(text("UPDATE contacts SET email = LOWER(TRIM(email)) WHERE email <> LOWER(TRIM(email))"))
+
+
+SCHEMA_VERSION = MIGRATIONS[-1].version
+
+
+def current_version(engine: Engine) -> Optional[int]:
+    """
+    Return the highest applied migration version.
+
+    Returns:
+        0 if no migrations are recorded, None if the database is unreachable
+        or the schema_migrations table does not exist yet.
+    """
+    try:
+        with engine.connect() as conn:
+            return conn.execute(select(func.max(schema_migrations.c.version))).scalar() or 0
+    except SQLAlchemyError:
+        return None
+
+
+def applied_versions(engine: Engine) -> Dict[int, datetime]:
+    """Map of applied migration versions to when they were applied."""
+    with engine.connect() as conn:
+        if not inspect(conn).has_table(schema_migrations.name):
+            return {}
+        rows = conn.execute(select(schema_migrations.c.version, schema_migrations.c.applied_at))
+        return {version: applied_at for version, applied_at in rows}
+
+
+@contextmanager
+def _migration_lock(engine: Engine):
+    """Hold a PostgreSQL advisory lock so only one runner migrates at a time."""
+    if engine.dialect.name != "postgresql":
+        yield
+        return
+    with engine.connect() as conn:
+        conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        conn.commit()
+        try:
+            yield
+        finally:
+            conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY})
+            conn.commit()
+
+
+def run_migrations(engine: Engine) -> List[Migration]:
+    """
+    Apply all pending migrations, each in its own transaction.
+
+    Returns:
+        List of migrations that were applied
+    """
+    with _migration_lock(engine):
+        return _apply_pending(engine)
+
+
+def _apply_pending(engine: Engine) -> List[Migration]:
+    # Read under the lock: a runner that waited sees what the previous one applied
+    schema_migrations.create(bind=engine, checkfirst=True)
+    done = applied_versions(engine)
+
+    applied = []
+    for m in MIGRATIONS:
+        if m.version in done:
+            continue
+        print(f"Applying migration {m.version}: {m.name}")
+        with engine.begin() as conn:
+            m.apply(conn)
+            conn.execute(schema_migrations.insert().values(
+                version=m.version, name=m.name, applied_at=datetime.utcnow()
+            ))
+        applied.append(m)
+    return applied
+
+
+def check_schema(engine: Engine) -> Dict:
+    """Compare the database schema version with the one this code expects (single read)."""
+    version = current_version(engine)
+    return {
+        "current": version,
+        "expected": SCHEMA_VERSION,
+        "ok": version is not None and version >= SCHEMA_VERSION,
+    }
+
+
+if __name__ == "__main__":
+    from src.database import engine
+
+    applied = run_migrations(engine)
+    print(f"Applied {len(applied)} migration(s). Schema at version {SCHEMA_VERSION}.")
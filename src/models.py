@@ -1,7 +1,7 @@
 """SQLAlchemy models for the Cold Email Outreach SaaS."""
 
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Text, UniqueConstraint
 from sqlalchemy.orm import relationship
 from src.database import Base
 
@@ -25,6 +25,9 @@ class User(Base):
     # Credits system
     credits = Column(Integer, default=10)  # Start with 10 free credits
     
+    # Bumped on every change to the user's contacts, emails or credits (ETags, see src/data_version.py)
+    data_version = Column(Integer, default=0, server_default="0", nullable=False)
+    
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow)
     last_login = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -46,8 +49,9 @@ class Contact(Base):
     company = Column(String(255), nullable=True)
     role = Column(String(255), nullable=True)
     linkedin = Column(String(512), nullable=True)
+    company_profile_id = Column(Integer, ForeignKey("company_profiles.id"), nullable=True, index=True)
     
-    status = Column(String(50), default="new")  # new, contacted, replied
+    status = Column(String(50), default="new")  # new, draft, contacted, replied, undeliverable
     
     created_at = Column(DateTime, default=datetime.utcnow)
     
@@ -67,7 +71,7 @@ class EmailLog(Base):
     company = Column(String(255), nullable=True)
     
     subject = Column(String(512), nullable=True)
-    status = Column(String(50), default="draft")  # draft, sent, failed
+    status = Column(String(50), default="draft")  # draft, sending, sent, failed
     
     created_at = Column(DateTime, default=datetime.utcnow)
     sent_at = Column(DateTime, nullable=True)
@@ -75,3 +79,75 @@ class EmailLog(Base):
     
     # Relationships
     user = relationship("User", back_populates="email_logs")
+
+
+class GeneratedEmail(Base):
+    """LLM email generated ahead of time for a new contact (see src/pregeneration.py)."""
+    __tablename__ = "generated_emails"
+    __table_args__ = (UniqueConstraint("contact_id", "profile_hash"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    contact_id = Column(Integer, ForeignKey("contacts.id", ondelete="CASCADE"), nullable=False)
+    
+    # Hash of the prompt and sender profile; rows with another hash are stale
+    profile_hash = Column(String(64), nullable=False)
+    subject = Column(String(512), nullable=False)
+    body = Column(Text, nullable=False)
+    
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class CompanyProfile(Base):
+    """Company context shared by a user's contacts at the same company (see src/companies.py)."""
+    __tablename__ = "company_profiles"
+    __table_args__ = (UniqueConstraint("user_id", "name_key", "domain"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    
+    # Normalized company name and domain ("" when unknown)
+    name_key = Column(String(255), nullable=False)
+    domain = Column(String(255), nullable=False, default="")
+    name = Column(String(255), nullable=True)
+    
+    company_type = Column(String(50), default="unknown")
+    industry = Column(String(255), nullable=True)
+    keywords = Column(Text, nullable=True)  # cleaned, comma-separated
+    blurb = Column(Text, nullable=True)  # LLM-generated, filled lazily
+    contact_count = Column(Integer, default=0)
+    
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class DomainCheck(Base):
+    """Cached mail deliverability of a recipient domain (see src/deliverability.py)."""
+    __tablename__ = "domain_checks"
+
+    domain = Column(String(255), primary_key=True)
+    deliverable = Column(Boolean, nullable=False)
+    mx_hosts = Column(String(512), nullable=True)  # comma-separated, by preference
+    
+    checked_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+
+class Upload(Base):
+    """A CSV import, keyed by content hash so re-uploads can be recognized (see src/uploads.py)."""
+    __tablename__ = "uploads"
+    __table_args__ = (UniqueConstraint("user_id", "sha256"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    
+    sha256 = Column(String(64), nullable=False)
+    filename = Column(String(255), nullable=True)
+    object_name = Column(String(512), nullable=True)  # R2 backup key
+    size = Column(Integer, nullable=True)
+    summary = Column(Text, nullable=True)  # JSON response of the import
+    
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+import src.data_version  # noqa: E402,F401 - registers the data_version flush hook
@@ -0,0 +1,279 @@
+"""
+Pregeneration Module
+Fills the generated_emails cache with LLM emails right after a CSV import,
+so /api/preview and /api/draft mostly find warm results.
+
+- Opt-in (PREGENERATE_ENABLED) and credit-safe: it only calls Gemini and
+  never drafts or charges; at most min(PREGENERATE_MAX_PER_USER, credits)
+  emails are cached per user.
+- Low priority: jobs run one at a time on a dedicated worker thread and,
+  before each batch, wait for as long as interactive requests hold more than
+  half the Gemini limit.
+- Cancellable: a newer job or cancel() for the same user stops the old one
+  between batches (or while it waits for headroom). /api/draft cancels the
+  user's job, since it generates the same contacts' emails itself. Contacts
+  drafted or deleted meanwhile are skipped, and rows generated for an older
+  profile_hash are purged.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional
+
+from src.logger import get_logger
+
+logger = get_logger("pregeneration.log")
+
+PREGENERATE_ENABLED = os.getenv("PREGENERATE_ENABLED", "").lower() in ("1", "true", "yes")
+PREGENERATE_MAX_PER_USER = int(os.getenv("PREGENERATE_MAX_PER_USER", 50))
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pregenerate")
+_tokens: Dict[int, int] = {}  # user_id -> token of the job allowed to run
+_tokens_lock = threading.Lock()
+
+
+def contact_columns() -> tuple:
+    """Contact columns recruiter_from_contact reads, for queries that load rows instead of ORM objects."""
+    from src.models import Contact
+
+    return (Contact.id, Contact.name, Contact.email, Contact.company, Contact.role, Contact.company_profile_id)
+
+
+def recruiter_from_contact(contact, profile=None) -> Dict:
+    """Generator input for a Contact (object or contact_columns() row) and its CompanyProfile (shared by pregeneration, preview and draft)."""
+    recruiter = {
+        "recruiter_name": contact.name,
+        "recruiter_email": contact.email,
+        "company": contact.company,
+        "role": contact.role,
+        "company_type": "unknown"
+    }
+    if profile is not None:
+        from src.companies import company_notes
+        recruiter["company_type"] = profile.company_type or "unknown"
+        recruiter["notes"] = company_notes(profile.industry, profile.keywords)
+        if profile.blurb:
+            recruiter["company_blurb"] = profile.blurb
+    return recruiter
+
+
+def recruiters_for(db, contacts: List, generator=None, profiles: Optional[Dict[int, object]] = None) -> List[Dict]:
+    """
+    Generator inputs for contacts, with their company profiles loaded in one query.
+
+    With an LLM generator, missing company blurbs are generated first (and
+    committed, so only for callers on the session's own thread).
+
+    Args:
+        db: Database session
+        contacts: Contact objects or contact_columns() rows
+        generator: LLM generator for missing blurbs
+        profiles: Already loaded companies.profiles_for() result
+    """
+    from src import companies
+
+    if profiles is None:
+        profiles = companies.profiles_for(db, contacts)
+    if generator is not None and profiles:
+        companies.ensure_blurbs(db, profiles.values(), generator)
+    return [recruiter_from_contact(c, profiles.get(getattr(c, "company_profile_id", None))) for c in contacts]
+
+
+def _next_token(user_id: int) -> int:
+    with _tokens_lock:
+        _tokens[user_id] = _tokens.get(user_id, 0) + 1
+        return _tokens[user_id]
+
+
+def _is_current(user_id: int, token: Optional[int]) -> bool:
+    return token is None or _tokens.get(user_id) == token
+
+
+def schedule(user_id: int) -> Future:
+    """Queue a pregeneration job for a user, superseding any queued or running one."""
+    return _executor.submit(run, user_id, _next_token(user_id))
+
+
+def cancel(user_id: int):
+    """Stop the user's queued or running job at its next batch boundary."""
+    _next_token(user_id)
+
+
+def _wait_for_headroom(limiter, user_id: int, token: Optional[int],
+                       sleep: Callable[[float], None] = time.sleep) -> bool:
+    """
+    Yield to interactive generation while it uses more than half the Gemini limit.
+
+    Returns:
+        False if the job was cancelled while waiting
+    """
+    while limiter is not None and limiter.in_flight > limiter.limit // 2:
+        if not _is_current(user_id, token):
+            return False
+        sleep(0.2)
+    return _is_current(user_id, token)
+
+
+def run(user_id: int, token: Optional[int] = None, session_factory=None, generator=None) -> int:
+    """
+    Generate and cache emails for a user's new contacts.
+
+    Args:
+        user_id: User whose contacts to pregenerate
+        token: Job token from schedule(); the job stops once it is superseded
+        session_factory: Session factory (defaults to SessionLocal)
+        generator: LLMEmailGenerator to use (created if omitted)
+
+    Returns:
+        Number of emails cached
+    """
+    from src.database import SessionLocal
+    from src.llm_generator import GEMINI_RETRY, LLM_BATCH_SIZE, LLMEmailGenerator
+    from src.models import Contact, GeneratedEmail, User
+
+    if not _is_current(user_id, token):
+        return 0
+    generator = generator or LLMEmailGenerator()
+    profile_hash = generator.profile_hash
+    db = (session_factory or SessionLocal)()
+    stored = 0
+    try:
+        # Profile or prompt changed since these were generated
+        db.query(GeneratedEmail).filter(
+            GeneratedEmail.user_id == user_id,
+            GeneratedEmail.profile_hash != profile_hash
+        ).delete(synchronize_session=False)
+        db.commit()
+
+        credits = db.query(User.credits).filter(User.id == user_id).scalar() or 0
+        cached_ids = db.query(GeneratedEmail.contact_id).filter(
+            GeneratedEmail.user_id == user_id,
+            GeneratedEmail.profile_hash == profile_hash
+        )
+        budget = min(PREGENERATE_MAX_PER_USER, credits) - cached_ids.count()
+        if budget <= 0:
+            return 0
+
+        contacts = db.query(Contact).filter(
+            Contact.user_id == user_id,
+            Contact.status == "new",
+            Contact.id.not_in(cached_ids)
+        ).order_by(Contact.id).limit(budget).all()
+
+        for start in range(0, len(contacts), LLM_BATCH_SIZE):
+            if not _wait_for_headroom(GEMINI_RETRY.limiter, user_id, token):
+                logger.info("Pregeneration cancelled", user_id=user_id, stored=stored)
+                break
+
+            chunk = contacts[start:start + LLM_BATCH_SIZE]
+            emails = generator.generate_many(recruiters_for(db, chunk, generator), batch_size=len(chunk))
+
+            # Contacts may have been drafted or deleted while Gemini was working
+            still_new = {
+                contact_id for (contact_id,) in db.query(Contact.id).filter(
+                    Contact.id.in_([c.id for c in chunk]),
+                    Contact.status == "new"
+                )
+            }
+            for contact, email in zip(chunk, emails):
+                # Never cache the hard-coded fallback email
+                if contact.id in still_new and not email.get("fallback"):
+                    db.add(GeneratedEmail(
+                        user_id=user_id,
+                        contact_id=contact.id,
+                        profile_hash=profile_hash,
+                        subject=email["subject"],
+                        body=email["body"]
+                    ))
+                    stored += 1
+            db.commit()
+
+        logger.info("Pregeneration finished", user_id=user_id, stored=stored)
+        return stored
+    except Exception as e:
+        db.rollback()
+        logger.error("Pregeneration failed", user_id=user_id, error=str(e))
+        return stored
+    finally:
+        db.close()
+
+
+def lookup(db, user_id: int, contact_ids: Iterable[int], profile_hash: str) -> Dict[int, Dict]:
+    """Cached emails for the given contacts, keyed by contact id."""
+    from src.models import GeneratedEmail
+
+    contact_ids = list(contact_ids)
+    if not contact_ids:
+        return {}
+    rows = db.query(GeneratedEmail.contact_id, GeneratedEmail.subject, GeneratedEmail.body).filter(
+        GeneratedEmail.user_id == user_id,
+        GeneratedEmail.profile_hash == profile_hash,
+        GeneratedEmail.contact_id.in_(contact_ids)
+    ).all()
+    return {contact_id: {"subject": subject, "body": body} for contact_id, subject, body in rows}
+
+
+async def agenerate_with_cache(db, user_id: int, contacts: List, generator, has_attachments: bool = False,
+                               profiles: Optional[Dict[int, object]] = None) -> List[Dict]:
+    """
+    Emails for contacts, taken from the cache where warm and generated otherwise.
+
+    Queries, blurb writes and the commit stay on the calling thread with the
+    session; only the Gemini calls run in worker threads.
+
+    Args:
+        db: Database session of the request
+        user_id: Owner of the contacts
+        contacts: Contact objects or contact_columns() rows
+        generator: LLMEmailGenerator
+        has_attachments: Whether attachments are being added
+        profiles: Already loaded companies.profiles_for() result
+
+    Returns:
+        List of dicts with subject and body keys, in the order of contacts
+    """
+    from src import companies
+
+    cached = lookup(db, user_id, [c.id for c in contacts], generator.profile_hash)
+    misses = [c for c in contacts if c.id not in cached]
+    fresh = {}
+    if misses:
+        if profiles is None:
+            profiles = companies.profiles_for(db, misses)
+        used = {getattr(c, "company_profile_id", None) for c in misses}
+        miss_profiles = {pid: p for pid, p in profiles.items() if pid in used}
+        requests = companies.blurb_requests(miss_profiles.values())
+        stored = 0
+        if requests:
+            blurbs = await asyncio.to_thread(generator.company_blurbs, list(requests.values()))
+            stored = companies.store_blurbs(miss_profiles, dict(zip(requests, blurbs)))
+        recruiters = recruiters_for(db, misses, profiles=profiles)
+        if stored:
+            db.commit()
+        generated = await asyncio.to_thread(generator.generate_many, recruiters, has_attachments=has_attachments)
+        fresh = dict(zip([c.id for c in misses], generated))
+
+    logger.info("Email cache lookup", user_id=user_id, hits=len(cached), misses=len(misses))
+    emails = []
+    for contact in contacts:
+        if contact.id in cached:
+            email = dict(cached[contact.id])
+            email["body"] = generator.add_attachment_note(email["body"], has_attachments)
+            emails.append(email)
+        else:
+            emails.append(fresh[contact.id])
+    return emails
+
+
+def consume(db, contact_ids: Iterable[int]):
+    """Drop cached emails for contacts that have been drafted (caller commits)."""
+    from src.models import GeneratedEmail
+
+    contact_ids = list(contact_ids)
+    if contact_ids:
+        db.query(GeneratedEmail).filter(
+            GeneratedEmail.contact_id.in_(contact_ids)
+        ).delete(synchronize_session=False)
@@ -0,0 +1,40 @@
+"""
+Responses Module
+Fast JSON responses for list endpoints.
+
+Endpoints returning many rows build plain dicts (datetimes left as is) and
+wrap them in FastJSONResponse themselves. That skips FastAPI's
+jsonable_encoder, which walks every value in Python, and renders with
+orjson, which also formats datetimes in C. Without orjson the standard
+json module is used.
+"""
+
+import importlib.util
+import json
+from datetime import date, datetime
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+HAS_ORJSON = importlib.util.find_spec("orjson") is not None
+
+
+def _default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize content to JSON bytes (datetimes as ISO 8601)."""
+    if HAS_ORJSON:
+        import orjson
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson; content must already be plain dicts and lists."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
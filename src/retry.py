@@ -0,0 +1,350 @@
+"""
+Retry Module
+Shared retry policy for upstream API calls (Gmail, Gemini).
+
+- RetryPolicy: exponential backoff with full jitter, honouring Retry-After,
+  with a separate retry budget per error class (rate limit, quota, server, network).
+- CircuitBreaker: stops calling an upstream after consecutive failures and
+  lets a single trial call through once the cool-down has passed.
+- AdaptiveLimiter: AIMD concurrency limit; grows by ~1 slot per window of
+  successes and halves whenever the upstream signals quota pressure.
+
+Each upstream module supplies a classifier that maps an exception to an
+error class (or None for errors that must not be retried, e.g. 400/404).
+QUOTA is for limits scoped to one caller (e.g. one Gmail user): those calls
+are retried with backoff, but the shared breaker and limiter are left alone.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Callable, Dict, NamedTuple, Optional
+
+from src.metrics import CIRCUIT_STATE, CONCURRENCY_LIMIT, UPSTREAM_RETRIES
+
+# Error classes
+RATE_LIMIT = "rate_limit"
+SERVER = "server"
+NETWORK = "network"
+QUOTA = "quota"
+
+
+class ErrorInfo(NamedTuple):
+    """Classification of a failed call: error class and server-requested delay."""
+
+    error_class: Optional[str]  # None = not retryable
+    retry_after: Optional[float] = None
+
+
+def classify_status(status: Optional[int]) -> Optional[str]:
+    """Map an HTTP status code to an error class (None = don't retry)."""
+    if status is None:
+        return NETWORK
+    if status == 429:
+        return RATE_LIMIT
+    if status in (500, 502, 503, 504):
+        return SERVER
+    return None
+
+
+def parse_retry_after(value) -> Optional[float]:
+    """Parse a Retry-After header given in seconds (HTTP-date form is ignored)."""
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker (closed -> open -> half-open -> closed)."""
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self.state = self.CLOSED
+        CIRCUIT_STATE.set(0, upstream=name)
+
+    def allow(self) -> bool:
+        """Return True if a call may go through now."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self._set_state(self.HALF_OPEN)
+            if self.state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._trial_in_flight = False
+            if self.state != self.CLOSED:
+                self._set_state(self.CLOSED)
+
+    def release_trial(self):
+        """Give back a half-open trial slot whose call ended without an outcome (e.g. cancelled)."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                self._set_state(self.OPEN)
+
+    def _set_state(self, state: str):
+        self.state = state
+        CIRCUIT_STATE.set({self.CLOSED: 0, self.HALF_OPEN: 1, self.OPEN: 2}[state], upstream=self.name)
+
+
+class AdaptiveLimiter:
+    """
+    AIMD concurrency limiter usable from threads and event loops.
+
+    on_success() adds 1/limit (about +1 per limit's worth of successes);
+    on_overload() multiplies the limit by `decrease`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initial: int = 10,
+        minimum: int = 1,
+        maximum: int = 100,
+        decrease: float = 0.5,
+    ):
+        self.name = name
+        self.minimum = minimum
+        self.maximum = maximum
+        self.decrease = decrease
+        self._limit = float(max(minimum, min(initial, maximum)))
+        self._in_flight = 0
+        self._cond = threading.Condition()
+        self._async_waiters: deque = deque()
+        CONCURRENCY_LIMIT.set(self.limit, upstream=name)
+
+    @property
+    def limit(self) -> int:
+        return max(self.minimum, int(self._limit))
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def acquire(self):
+        """Block the calling thread until a slot is free."""
+        with self._cond:
+            while self._in_flight >= self.limit:
+                self._cond.wait()
+            self._in_flight += 1
+
+    async def acquire_async(self):
+        """Wait on the event loop until a slot is free."""
+        while True:
+            with self._cond:
+                if self._in_flight < self.limit:
+                    self._in_flight += 1
+                    return
+                loop = asyncio.get_running_loop()
+                waiter = loop.create_future()
+                self._async_waiters.append((loop, waiter))
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                with self._cond:
+                    try:
+                        self._async_waiters.remove((loop, waiter))
+                    except ValueError:
+                        self._wake()  # already woken: pass the wake-up on
+                raise
+
+    def release(self):
+        with self._cond:
+            self._in_flight -= 1
+            self._wake()
+
+    def on_success(self):
+        with self._cond:
+            self._limit = min(self.maximum, self._limit + 1 / self._limit)
+            CONCURRENCY_LIMIT.set(self.limit, upstream=self.name)
+            self._wake()
+
+    def on_overload(self):
+        with self._cond:
+            self._limit = max(self.minimum, self._limit * self.decrease)
+            CONCURRENCY_LIMIT.set(self.limit, upstream=self.name)
+
+    def _wake(self):
+        # Called with the lock held; waiters re-check the limit when they wake
+        free = self.limit - self._in_flight
+        if free <= 0:
+            return
+        self._cond.notify(free)
+        while free > 0 and self._async_waiters:
+            loop, waiter = self._async_waiters.popleft()
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(_resolve, waiter)
+                free -= 1
+
+    @contextmanager
+    def slot(self):
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    @asynccontextmanager
+    async def slot_async(self):
+        await self.acquire_async()
+        try:
+            yield
+        finally:
+            self.release()
+
+
+def _resolve(waiter: asyncio.Future):
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class RetryPolicy:
+    """Retry loop shared by the sync and async call paths of one upstream."""
+
+    def __init__(
+        self,
+        name: str,
+        classify: Callable[[Exception], ErrorInfo],
+        budgets: Optional[Dict[str, int]] = None,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        breaker: Optional[CircuitBreaker] = None,
+        limiter: Optional[AdaptiveLimiter] = None,
+    ):
+        """
+        Args:
+            name: Upstream name used in metrics labels
+            classify: Maps an exception to ErrorInfo(error_class, retry_after)
+            budgets: Maximum retries per error class for a single call
+            base_delay: First backoff delay in seconds (doubles per retry)
+            max_delay: Cap for backoff and Retry-After delays
+            breaker: Optional circuit breaker checked before every attempt
+            limiter: Optional AIMD limiter holding a slot during each attempt
+        """
+        self.name = name
+        self.classify = classify
+        self.budgets = budgets if budgets is not None else {RATE_LIMIT: 5, QUOTA: 5, SERVER: 3, NETWORK: 2}
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.breaker = breaker
+        self.limiter = limiter
+
+    def backoff(self, retry: int, retry_after: Optional[float] = None) -> float:
+        """Delay before the given retry (0-based): Retry-After if sent, else full-jitter backoff."""
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** retry))
+
+    def _before_attempt(self):
+        if self.breaker is not None and not self.breaker.allow():
+            raise CircuitOpenError(f"{self.name} circuit is open")
+
+    def _on_abort(self):
+        # Cancelled (or interrupted) mid-attempt: no verdict on the upstream,
+        # but a half-open trial must not stay in flight forever
+        if self.breaker is not None:
+            self.breaker.release_trial()
+
+    def _on_success(self):
+        if self.breaker is not None:
+            self.breaker.record_success()
+        if self.limiter is not None:
+            self.limiter.on_success()
+
+    def _on_error(self, error: Exception, used: Dict[str, int], retry: int) -> float:
+        """Record a failed attempt; return the delay before retrying or re-raise."""
+        info = self.classify(error)
+        if info.error_class is None:
+            # Client errors say nothing about upstream health
+            if self.breaker is not None:
+                self.breaker.record_success()
+            raise error
+        if info.error_class == QUOTA:
+            # One caller's quota: the upstream is healthy for everyone else
+            if self.breaker is not None:
+                self.breaker.record_success()
+        else:
+            if self.breaker is not None:
+                self.breaker.record_failure()
+            if info.error_class == RATE_LIMIT and self.limiter is not None:
+                self.limiter.on_overload()
+
+        used[info.error_class] = used.get(info.error_class, 0) + 1
+        if used[info.error_class] > self.budgets.get(info.error_class, 0):
+            raise error
+        UPSTREAM_RETRIES.inc(upstream=self.name, error_class=info.error_class)
+        return self.backoff(retry, info.retry_after)
+
+    def call(self, fn: Callable, *args, **kwargs):
+        """Call fn with retries, sleeping between attempts (blocking)."""
+        used: Dict[str, int] = {}
+        retry = 0
+        while True:
+            self._before_attempt()
+            try:
+                if self.limiter is not None:
+                    with self.limiter.slot():
+                        result = fn(*args, **kwargs)
+                else:
+                    result = fn(*args, **kwargs)
+            except Exception as e:
+                delay = self._on_error(e, used, retry)
+                retry += 1
+                time.sleep(delay)
+                continue
+            except BaseException:
+                self._on_abort()
+                raise
+            self._on_success()
+            return result
+
+    async def acall(self, fn: Callable, *args, **kwargs):
+        """Await fn(*args, **kwargs) with retries, sleeping on the event loop."""
+        used: Dict[str, int] = {}
+        retry = 0
+        while True:
+            self._before_attempt()
+            try:
+                if self.limiter is not None:
+                    async with self.limiter.slot_async():
+                        result = await fn(*args, **kwargs)
+                else:
+                    result = await fn(*args, **kwargs)
+            except Exception as e:
+                delay = self._on_error(e, used, retry)
+                retry += 1
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                self._on_abort()
+                raise
+            self._on_success()
+            return result
@@ -0,0 +1,258 @@
+"""
+Sender Module
+Background sending of a user's drafts for /api/send-all.
+
+Before anything is sent, the batch is claimed with one UPDATE ... RETURNING
+that moves its drafts to "sending" and commits. A draft claimed by another
+batch (e.g. a double-clicked send-all) is not returned, and a worker killed
+mid-batch leaves its drafts in "sending" instead of "draft", so they are
+never sent twice.
+
+Each outcome is buffered and written with one bulk UPDATE per flush
+("sending" -> "sent", or back to "draft" when Gmail refused the send). A
+flush happens once SEND_FLUSH_SIZE outcomes are pending or the oldest is
+SEND_FLUSH_INTERVAL seconds old, and always at the end. The claim already
+makes sends durable, so the interval only bounds how long the UI shows
+"sending", and long pauses between sends do not force a flush per send.
+Each flush also refreshes the claim time (sent_at) of the drafts still
+waiting, so a live batch's claim never looks abandoned.
+
+Drafts left in "sending" for SEND_CLAIM_TIMEOUT seconds belong to a batch
+that died. reconcile() settles them from Gmail, where sending deletes the
+draft: a draft that is gone was sent, one that still exists goes back to
+"draft". It runs at the start of every batch.
+"""
+
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Set
+
+from src import dashboard, data_version, metrics
+from src.logger import get_logger
+
+logger = get_logger("app.log")
+
+SEND_FLUSH_SIZE = int(os.getenv("SEND_FLUSH_SIZE", 20))
+SEND_FLUSH_INTERVAL = float(os.getenv("SEND_FLUSH_INTERVAL", 60))
+# Must stay well above SEND_FLUSH_INTERVAL plus the pause between sends
+SEND_CLAIM_TIMEOUT = float(os.getenv("SEND_CLAIM_TIMEOUT", 900))
+
+
+class StatusBuffer:
+    """Outcomes of one batch's claimed drafts, written in bulk."""
+
+    def __init__(self, db, user_id: int, claimed=(), max_size: int = SEND_FLUSH_SIZE,
+                 max_age: float = SEND_FLUSH_INTERVAL, heartbeat: float = SEND_CLAIM_TIMEOUT / 3,
+                 clock: Callable[[], float] = time.monotonic):
+        self.db = db
+        self.user_id = user_id
+        self.claimed: Set[int] = set(claimed)
+        self.max_size = max_size
+        self.max_age = max_age
+        self.heartbeat = heartbeat
+        self.clock = clock
+        self.pending: Dict[int, Optional[datetime]] = {}  # log id -> sent_at, None = back to draft
+        self.oldest: Optional[float] = None
+        self.last_write = clock()
+        self.flushed = 0
+
+    def add(self, log_id: int, sent_at: datetime):
+        """Record a sent draft."""
+        self._add(log_id, sent_at)
+
+    def release(self, log_id: int):
+        """Record a draft that was not sent; it goes back to "draft"."""
+        self._add(log_id, None)
+
+    def _add(self, log_id: int, sent_at: Optional[datetime]):
+        if not self.pending:
+            self.oldest = self.clock()
+        self.pending[log_id] = sent_at
+
+    def due(self, horizon: float = 0.0) -> bool:
+        """
+        True when a flush is needed: enough outcomes are pending, the oldest
+        is max_age old, or the claim would go unrefreshed for longer than
+        heartbeat seconds once horizon more seconds pass.
+        """
+        now = self.clock()
+        if self.pending and (len(self.pending) >= self.max_size or now - self.oldest >= self.max_age):
+            return True
+        return bool(self.claimed) and now - self.last_write + horizon >= self.heartbeat
+
+    def flush(self) -> List[int]:
+        """
+        Write pending outcomes and refresh the remaining claims in one UPDATE
+        and commit; returns the ids recorded as sent.
+        """
+        from sqlalchemy import case
+        from src.models import EmailLog
+
+        if not self.claimed:
+            return []
+        now = datetime.utcnow()
+        sent = {log_id: at for log_id, at in self.pending.items() if at is not None}
+        released = [log_id for log_id, at in self.pending.items() if at is None]
+        # Claims still waiting get a fresh claim time
+        sent_at = case(sent, value=EmailLog.id, else_=now) if sent else now
+        if released:
+            sent_at = case((EmailLog.id.in_(released), None), else_=sent_at)
+        values = {EmailLog.sent_at: sent_at}
+        if self.pending:
+            values[EmailLog.status] = case(
+                (EmailLog.id.in_(sent), "sent"), (EmailLog.id.in_(released), "draft"), else_="sending"
+            )
+        self.db.query(EmailLog).filter(
+            EmailLog.id.in_(self.claimed),
+            EmailLog.status == "sending"
+        ).update(values, synchronize_session=False)
+        if self.pending:
+            # Bulk UPDATEs skip the flush hook that versions per-user reads
+            data_version.bump(self.db, [self.user_id])
+        self.db.commit()
+        if self.pending:
+            dashboard.invalidate(self.user_id)
+
+        ids = list(sent)
+        self.claimed.difference_update(self.pending)
+        self.pending = {}
+        self.oldest = None
+        self.last_write = self.clock()
+        self.flushed += len(ids)
+        for log_id in ids:
+            logger.info("Sent", user_id=self.user_id, email_log_id=log_id)
+        return ids
+
+
+def claim(db, user_id: int, draft_ids: List[int]) -> Dict[int, str]:
+    """
+    Move a user's drafts to "sending" in one UPDATE and commit.
+
+    Returns:
+        Gmail draft id by EmailLog id, for the drafts this call claimed
+    """
+    from sqlalchemy import update
+    from src.models import EmailLog
+
+    rows = db.execute(
+        update(EmailLog)
+        .where(EmailLog.id.in_(draft_ids), EmailLog.user_id == user_id, EmailLog.status == "draft")
+        .values(status="sending", sent_at=datetime.utcnow())
+        .returning(EmailLog.id, EmailLog.gmail_draft_id)
+        .execution_options(synchronize_session=False)
+    ).all()
+    if rows:
+        data_version.bump(db, [user_id])
+    db.commit()
+    return dict(rows)
+
+
+def reconcile(db, user_id: int, gmail) -> Dict[str, int]:
+    """
+    Settle a user's drafts left in "sending" by a batch that died.
+
+    Args:
+        db: Database session
+        user_id: Owner of the drafts
+        gmail: Authenticated GmailClient of the user
+
+    Returns:
+        Number of drafts recorded as "sent" and returned to "draft"
+    """
+    from src.models import EmailLog
+
+    stale = db.query(EmailLog).filter(
+        EmailLog.user_id == user_id,
+        EmailLog.status == "sending",
+        EmailLog.sent_at < datetime.utcnow() - timedelta(seconds=SEND_CLAIM_TIMEOUT)
+    ).all()
+    result = {"sent": 0, "draft": 0}
+    for log in stale:
+        exists = gmail.draft_exists(log.gmail_draft_id) if log.gmail_draft_id else True
+        if exists is None:
+            continue  # Gmail could not tell: try again next batch
+        if exists:
+            log.status, log.sent_at = "draft", None
+        else:
+            log.status = "sent"  # sent_at keeps the last claim refresh
+        result[log.status] += 1
+    db.commit()
+    if stale:
+        dashboard.invalidate(user_id)
+        logger.warning("Reconciled abandoned sends", user_id=user_id, **result)
+    return result
+
+
+def send_batch(user_id: int, draft_ids: List[int], delay_seconds: float, gmail_factory: Callable,
+               session_factory=None, sleep: Callable[[float], None] = time.sleep) -> int:
+    """
+    Send a user's drafts one by one, delay_seconds apart.
+
+    Args:
+        user_id: Owner of the drafts
+        draft_ids: EmailLog ids queued by /api/send-all (drafts sent, removed
+            or claimed by another batch since are skipped)
+        delay_seconds: Pause between sends
+        gmail_factory: Callable returning a GmailClient for a User
+        session_factory: Session factory (defaults to SessionLocal)
+        sleep: Sleep function (replaced in tests)
+
+    Returns:
+        Number of sends recorded as "sent"
+    """
+    from src.database import SessionLocal
+    from src.models import User
+
+    db = (session_factory or SessionLocal)()
+    remaining = len(draft_ids)
+    buffer = StatusBuffer(db, user_id)
+    try:
+        user = db.query(User).filter(User.id == user_id).first()
+        if user is None:
+            logger.error("Batch send failed: user not found", user_id=user_id)
+            return 0
+        gmail = gmail_factory(user)
+        if not gmail.authenticate():
+            logger.error("Batch send failed: Gmail auth failed", user_id=user_id)
+            return 0
+
+        reconcile(db, user_id, gmail)
+        rows = claim(db, user_id, draft_ids)
+        buffer = StatusBuffer(db, user_id, claimed=rows)
+
+        for position, log_id in enumerate(draft_ids, 1):
+            remaining -= 1
+            metrics.SEND_QUEUE_DEPTH.dec()
+            if log_id not in rows:
+                continue
+            try:
+                sent = rows[log_id] and gmail.send_draft(rows[log_id])
+            except Exception as e:
+                sent = None
+                logger.error("Error sending draft", user_id=user_id, email_log_id=log_id, error=str(e))
+            if sent:
+                buffer.add(log_id, datetime.utcnow())
+            else:
+                buffer.release(log_id)
+            pause = delay_seconds if position < len(draft_ids) else 0
+            if buffer.due(horizon=pause):
+                buffer.flush()
+            if pause:
+                sleep(pause)
+    except Exception as e:
+        db.rollback()
+        logger.error("Batch send failed", user_id=user_id, error=str(e))
+    finally:
+        # Outcomes before a failure are still recorded, and unsent claims released
+        try:
+            for log_id in buffer.claimed.difference(buffer.pending):
+                buffer.release(log_id)
+            buffer.flush()
+        except Exception as e:
+            db.rollback()
+            logger.error("Recording sent drafts failed", user_id=user_id, email_log_ids=list(buffer.pending), error=str(e))
+        # Drafts skipped by an early return are no longer queued either
+        metrics.SEND_QUEUE_DEPTH.dec(remaining)
+        db.close()
+    return buffer.flushed
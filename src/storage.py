@@ -1,9 +1,30 @@
-"""Storage module for Cloudflare R2 / AWS S3 compatibility."""
+"""
+Storage module for Cloudflare R2 / AWS S3 compatibility.
 
+One boto3 client is created on first use and shared (boto3 clients are
+thread-safe), with a connection pool sized for background backups. Large
+files go up as concurrent multipart uploads (TRANSFER_CONFIG). CSV backups
+can be compressed with gzip, or zstd when the optional zstandard package is
+installed (R2_BACKUP_COMPRESSION).
+"""
+
+import gzip
+import importlib.util
 import os
+import shutil
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import NoCredentialsError, ClientError
-from typing import Optional
+
+from src.logger import get_logger
+
+logger = get_logger("storage.log")
 
 # Configuration
 R2_ACCESS_KEY_ID = os.getenv("R2_ACCESS_KEY_ID")
@@ -11,31 +32,57 @@ R2_SECRET_ACCESS_KEY = os.getenv("R2_SECRET_ACCESS_KEY")
 R2_ENDPOINT_URL = os.getenv("R2_ENDPOINT_URL")
 R2_BUCKET_NAME = os.getenv("R2_BUCKET_NAME", "cold-email-outreach")
 
-# Initialize S3 client for R2
+R2_MAX_POOL_CONNECTIONS = int(os.getenv("R2_MAX_POOL_CONNECTIONS", 20))
+R2_MULTIPART_THRESHOLD = int(os.getenv("R2_MULTIPART_THRESHOLD", 8 * 1024 * 1024))
+R2_MULTIPART_CHUNKSIZE = int(os.getenv("R2_MULTIPART_CHUNKSIZE", 8 * 1024 * 1024))
+R2_MAX_CONCURRENCY = int(os.getenv("R2_MAX_CONCURRENCY", 4))
+# "none", "gzip" or "zstd" (falls back to gzip without zstandard)
+R2_BACKUP_COMPRESSION = os.getenv("R2_BACKUP_COMPRESSION", "none")
+
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=R2_MULTIPART_THRESHOLD,
+    multipart_chunksize=R2_MULTIPART_CHUNKSIZE,
+    max_concurrency=R2_MAX_CONCURRENCY,
+)
+
+# compression -> (key suffix, Content-Encoding)
+COMPRESSIONS = {"gzip": (".gz", "gzip"), "zstd": (".zst", "zstd")}
+
+
+@lru_cache(maxsize=None)
 def get_s3_client():
+    """The shared S3 client for R2, or None when credentials are not configured."""
     if not R2_ACCESS_KEY_ID or not R2_SECRET_ACCESS_KEY or not R2_ENDPOINT_URL:
         return None
-    
+
     return boto3.client(
         "s3",
         endpoint_url=R2_ENDPOINT_URL,
         aws_access_key_id=R2_ACCESS_KEY_ID,
         aws_secret_access_key=R2_SECRET_ACCESS_KEY,
+        config=Config(
+            max_pool_connections=R2_MAX_POOL_CONNECTIONS,
+            retries={"max_attempts": 3, "mode": "standard"},
+        ),
     )
 
-def upload_file(file_obj, object_name: str, content_type: str = "text/csv") -> Optional[str]:
-    """Upload a file-like object to R2 bucket."""
+def upload_file(file_obj, object_name: str, content_type: str = "text/csv", content_encoding: Optional[str] = None) -> Optional[str]:
+    """Upload a file-like object to R2 bucket (multipart above R2_MULTIPART_THRESHOLD)."""
     s3_client = get_s3_client()
     if not s3_client:
-        print("Warning: R2 credentials not configured. Skipping upload.")
+        logger.warning("R2 credentials not configured. Skipping upload.", object_name=object_name)
         return None
 
+    extra_args = {'ContentType': content_type}
+    if content_encoding:
+        extra_args['ContentEncoding'] = content_encoding
     try:
         s3_client.upload_fileobj(
             file_obj,
             R2_BUCKET_NAME,
             object_name,
-            ExtraArgs={'ContentType': content_type}
+            ExtraArgs=extra_args,
+            Config=TRANSFER_CONFIG
         )
         # Return public URL if public, or just the object key
         # For private buckets, maybe return pre-signed URL?
@@ -45,11 +92,61 @@ def upload_file(file_obj, object_name: str, content_type: str = "text/csv") -> O
             return f"{public_url_base}/{object_name}"
         return object_name
     except ClientError as e:
-        print(f"Error uploading to R2: {e}")
+        logger.error("Error uploading to R2", object_name=object_name, error=str(e))
         return None
     except Exception as e:
-        print(f"Unexpected error uploading to R2: {e}")
+        logger.error("Unexpected error uploading to R2", object_name=object_name, error=str(e))
+        return None
+
+def backup_compression(compression: Optional[str] = None) -> Optional[str]:
+    """Compression actually used for backups: "gzip", "zstd" or None."""
+    compression = (compression or R2_BACKUP_COMPRESSION).lower()
+    if compression not in COMPRESSIONS:
+        return None
+    if compression == "zstd" and importlib.util.find_spec("zstandard") is None:
+        logger.warning("zstandard not installed; compressing backups with gzip")
+        return "gzip"
+    return compression
+
+def _compress(src, dest, compression: str):
+    """Stream src into dest, compressed."""
+    if compression == "zstd":
+        import zstandard
+        zstandard.ZstdCompressor(level=3).copy_stream(src, dest)
+    else:
+        with gzip.GzipFile(fileobj=dest, mode="wb", compresslevel=6, mtime=0) as gz:
+            shutil.copyfileobj(src, gz, 1024 * 1024)
+
+def backup_file(local_path: str, object_name: str, content_type: str = "text/csv", compression: Optional[str] = None) -> Optional[str]:
+    """
+    Back up a file from disk to R2, optionally compressed.
+
+    Args:
+        local_path: File to back up
+        object_name: Object key before any compression suffix
+        content_type: Content type of the uncompressed file
+        compression: "gzip", "zstd" or "none" (defaults to R2_BACKUP_COMPRESSION)
+
+    Returns:
+        Object key the backup was stored under (object_name, suffixed with
+        .gz / .zst when compressed), or None when skipped or failed
+    """
+    compression = backup_compression(compression)
+    key = object_name + COMPRESSIONS[compression][0] if compression else object_name
+    try:
+        if not compression:
+            with open(local_path, "rb") as f:
+                stored = upload_file(f, key, content_type)
+        else:
+            # Compressed into a temporary file so multipart parts can be read concurrently
+            with open(local_path, "rb") as src, tempfile.TemporaryFile(dir=Path(local_path).parent) as compressed:
+                _compress(src, compressed, compression)
+                compressed.seek(0)
+                stored = upload_file(compressed, key, content_type, content_encoding=COMPRESSIONS[compression][1])
+    except OSError as e:
+        logger.error("Backup failed", object_name=key, error=str(e))
         return None
+    return key if stored is not None else None
 
 def generate_presigned_url(object_name: str, expiration=3600) -> Optional[str]:
     """Generate a presigned URL to share an S3 object."""
@@ -65,5 +162,5 @@ def generate_presigned_url(object_name: str, expiration=3600) -> Optional[str]:
         )
         return response
     except ClientError as e:
-        print(f"Error generating presigned URL: {e}")
+        logger.error("Error generating presigned URL", object_name=object_name, error=str(e))
         return None
@@ -1,7 +1,6 @@
 """Stripe Payments API routes."""
 
 import os
-import stripe
 from fastapi import APIRouter, Depends, HTTPException, Request, Header
 from fastapi.responses import RedirectResponse
 from sqlalchemy.orm import Session
@@ -10,13 +9,27 @@ from pydantic import BaseModel
 from src.database import get_db
 from src.models import User
 from src.auth import require_auth
+from src import dashboard
+from src.logger import get_logger
+
+logger = get_logger("app.log")
 
-stripe.api_key = os.getenv("STRIPE_SECRET_KEY")
 FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:3000")
 PRICE_ID_CREDITS = os.getenv("STRIPE_PRICE_ID_CREDITS", "price_H5ggYwtDq4fbrJ") # Default dummy
 
 router = APIRouter(prefix="/stripe", tags=["Payments"])
 
+
+def get_stripe():
+    """Import and configure the Stripe SDK on first use (keeps it off the boot path)."""
+    import stripe
+    stripe.api_key = os.getenv("STRIPE_SECRET_KEY")
+    if os.getenv("STRIPE_API_BASE"):
+        # Local stand-in server (see benchmarks/)
+        stripe.api_base = os.getenv("STRIPE_API_BASE")
+    return stripe
+
+
 class CheckoutRequest(BaseModel):
     credits: int
     amount: int  # in cents
@@ -27,6 +40,7 @@ async def create_checkout_session(
     user: User = Depends(require_auth)
 ):
     """Create a Stripe Checkout session to buy credits."""
+    stripe = get_stripe()
     if not stripe.api_key:
         raise HTTPException(status_code=500, detail="Stripe API key not configured")
         
@@ -64,6 +78,7 @@ async def create_checkout_session(
 @router.post("/webhook")
 async def stripe_webhook(request: Request, stripe_signature: str = Header(None), db: Session = Depends(get_db)):
     """Handle Stripe webhooks to fulfill orders."""
+    stripe = get_stripe()
     webhook_secret = os.getenv("STRIPE_WEBHOOK_SECRET")
     payload = await request.body()
 
@@ -78,6 +93,10 @@ async def stripe_webhook(request: Request, stripe_signature: str = Header(None),
         # Invalid signature
         raise HTTPException(status_code=400, detail="Invalid signature")
 
+    # Newer stripe SDKs return a StripeObject that no longer subclasses dict
+    if hasattr(event, "to_dict"):
+        event = event.to_dict()
+
     # Handle the event
     if event['type'] == 'checkout.session.completed':
         session = event['data']['object']
@@ -92,6 +111,7 @@ async def stripe_webhook(request: Request, stripe_signature: str = Header(None),
             if user:
                 user.credits += credits_amount
                 db.commit()
-                print(f"Added {credits_amount} credits to user {user.email}")
+                dashboard.invalidate(user.id)
+                logger.info("Added credits", user_id=user.id, credits=credits_amount)
 
     return {"status": "success"}
@@ -6,16 +6,29 @@ Tracks sent emails and their statuses to prevent duplicates.
 import json
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 import hashlib
 
 
+# Statuses that count as "already contacted" for dedup purposes
+CONTACTED_STATUSES = ('sent', 'draft')
+
+
+def _normalize(value) -> str:
+    """Normalize an email/company value for key comparison (handles None/NaN)."""
+    if value is None or value != value:  # NaN != NaN
+        return ''
+    return str(value).strip().lower()
+
+
 class EmailTracker:
     """Tracks email sending history and status."""
     
     def __init__(self, tracking_file: str = "data/tracking.json"):
         self.tracking_file = Path(tracking_file)
         self.records: Dict[str, Dict] = {}
+        # Normalized (email, company) keys of sent/draft records, kept in sync with records
+        self._contacted: Set[Tuple[str, str]] = set()
         self._load()
     
     def _load(self):
@@ -26,6 +39,27 @@ class EmailTracker:
                 self.records = data.get('records', {})
         else:
             self.records = {}
+        self._rebuild_index()
+    
+    def _rebuild_index(self):
+        """Rebuild the contacted-key index from the loaded records."""
+        self._contacted = {
+            self._key(rec.get('recruiter_email'), rec.get('company'))
+            for rec in self.records.values()
+            if rec.get('status') in CONTACTED_STATUSES
+        }
+    
+    def _key(self, email, company) -> Tuple[str, str]:
+        """Normalized (email, company) key used by the contacted index."""
+        return (_normalize(email), _normalize(company))
+    
+    def _index_record(self, record: Dict):
+        """Add or remove a single record from the contacted index."""
+        key = self._key(record.get('recruiter_email'), record.get('company'))
+        if record.get('status') in CONTACTED_STATUSES:
+            self._contacted.add(key)
+        else:
+            self._contacted.discard(key)
     
     def _save(self):
         """Save tracking data to file."""
@@ -39,16 +73,12 @@ class EmailTracker:
     
     def _generate_id(self, email: str, company: str) -> str:
         """Generate unique ID for a recruiter."""
-        key = f"{email.lower()}:{company.lower()}"
+        key = f"{_normalize(email)}:{_normalize(company)}"
         return hashlib.md5(key.encode()).hexdigest()[:12]
     
     def is_sent(self, recruiter_email: str, company: str) -> bool:
         """Check if email was already sent to this recruiter."""
-        record_id = self._generate_id(recruiter_email, company)
-        if record_id in self.records:
-            status = self.records[record_id].get('status')
-            return status in ['sent', 'draft']
-        return False
+        return self._key(recruiter_email, company) in self._contacted
     
     def add_record(
         self,
@@ -85,6 +115,7 @@ class EmailTracker:
             'created_at': self.records.get(record_id, {}).get('created_at', datetime.now().isoformat()),
             'updated_at': datetime.now().isoformat()
         }
+        self._index_record(self.records[record_id])
         
         self._save()
         return record_id
@@ -96,6 +127,7 @@ class EmailTracker:
             self.records[record_id]['updated_at'] = datetime.now().isoformat()
             if message_id:
                 self.records[record_id]['message_id'] = message_id
+            self._index_record(self.records[record_id])
             self._save()
     
     def get_all(self, status: Optional[str] = None) -> List[Dict]:
@@ -128,13 +160,40 @@ class EmailTracker:
     
     def filter_unsent(self, recruiters: List[Dict]) -> List[Dict]:
         """Filter out recruiters who have already been contacted."""
-        unsent = []
-        for recruiter in recruiters:
-            email = recruiter.get('recruiter_email', '')
-            company = recruiter.get('company', '')
-            if not self.is_sent(email, company):
-                unsent.append(recruiter)
-        return unsent
+        contacted = self._contacted
+        return [
+            r for r in recruiters
+            if self._key(r.get('recruiter_email'), r.get('company')) not in contacted
+        ]
+    
+    def filter_unsent_df(self, df):
+        """
+        Drop already-contacted rows from a recruiter DataFrame in one anti-join.
+        
+        Args:
+            df: pandas DataFrame with recruiter_email and company columns
+        
+        Returns:
+            DataFrame containing only rows not yet drafted/sent
+        """
+        import pandas as pd
+        
+        if df.empty or not self._contacted:
+            return df
+        
+        def normalized(col: str) -> pd.Series:
+            if col not in df.columns:
+                return pd.Series('', index=df.index)
+            return df[col].fillna('').astype(str).str.strip().str.lower()
+        
+        keys = pd.MultiIndex.from_arrays([normalized('recruiter_email'), normalized('company')])
+        return df[~keys.isin(list(self._contacted))]
+    
+    def clear(self):
+        """Remove all tracking records."""
+        self.records = {}
+        self._contacted = set()
+        self._save()
     
     def export_csv(self, filepath: str = "data/tracking_export.csv"):
         """Export tracking data to CSV."""
@@ -155,5 +214,6 @@ class EmailTracker:
                      if rec.get('status') == 'failed']
         for rid in to_remove:
             del self.records[rid]
+        # Failed records are never in the contacted index, so it stays valid
         self._save()
         print(f"Cleared {len(to_remove)} failed records.")
@@ -0,0 +1,177 @@
+"""
+Uploads Module
+Writes uploaded files to disk and remembers imported CSVs by content hash.
+
+Uploads are read with `await file.read(chunk)` and written from a worker
+thread, so large or slow uploads do not stall other requests, and are
+capped at UPLOAD_MAX_BYTES. Starlette spools a multipart body completely
+before the handler runs, so requests whose Content-Length is over the limit
+are refused up front (declared_too_large(), checked by app.py's middleware);
+the checks in asave_upload cover bodies sent without a length. The SHA-256 of an upload is computed while its
+chunks are written, so no second read of the file is needed. /api/upload records each successful
+import in the uploads table with its summary; when the same user uploads a
+file with the same content again, that summary is returned without parsing
+the file or backing it up to R2 a second time. The R2 object key is stored
+on the import by backup_import() once the background backup has succeeded.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import uuid
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional
+
+from src.logger import get_logger
+
+logger = get_logger("uploads.log")
+
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", 1024 * 1024))
+# Largest accepted CSV / attachment in bytes (0 = unlimited)
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", 20 * 1024 * 1024))
+ATTACHMENT_MAX_BYTES = int(os.getenv("ATTACHMENT_MAX_BYTES", 10 * 1024 * 1024))
+# Room for multipart boundaries, part headers and other form fields
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+class SavedFile(NamedTuple):
+    """A file written by asave_upload."""
+
+    path: Path
+    sha256: str
+    size: int
+
+
+def temp_path(directory: Path) -> Path:
+    """Unique temporary path in directory for an upload being written."""
+    return directory / f".upload-{uuid.uuid4().hex}.part"
+
+
+class UploadTooLarge(Exception):
+    """An upload exceeded its size limit; nothing was kept on disk."""
+
+    def __init__(self, limit: int):
+        super().__init__(f"File exceeds the {limit // (1024 * 1024)} MB upload limit")
+        self.limit = limit
+
+
+def declared_too_large(content_length: Optional[str], max_bytes: Optional[int] = None) -> bool:
+    """True when a request's Content-Length header is over the limit (default UPLOAD_MAX_BYTES) plus multipart overhead."""
+    if max_bytes is None:
+        max_bytes = UPLOAD_MAX_BYTES
+    if not max_bytes or not content_length:
+        return False
+    try:
+        return int(content_length) > max_bytes + MULTIPART_OVERHEAD
+    except ValueError:
+        return False
+
+
+async def asave_upload(
+    upload,
+    dest: Path,
+    max_bytes: int = UPLOAD_MAX_BYTES,
+    chunk_size: int = UPLOAD_CHUNK_SIZE,
+) -> SavedFile:
+    """
+    Write an UploadFile to dest in chunks without blocking the event loop.
+
+    Chunks are read with `await upload.read()` and written from a worker
+    thread, and hashed as they go. The body has already been spooled by
+    then, so this limit only keeps oversized files off dest; requests are
+    refused before spooling by their Content-Length (declared_too_large).
+
+    Args:
+        upload: FastAPI/Starlette UploadFile
+        dest: Destination path (removed again if the upload fails)
+        max_bytes: Size limit (0 = unlimited)
+        chunk_size: Bytes per read
+
+    Returns:
+        SavedFile with the path, SHA-256 hex digest and size in bytes
+
+    Raises:
+        UploadTooLarge: when the upload is larger than max_bytes
+    """
+    if max_bytes and (getattr(upload, "size", None) or 0) > max_bytes:
+        raise UploadTooLarge(max_bytes)
+
+    digest = hashlib.sha256()
+    size = 0
+    f = await asyncio.to_thread(open, dest, "wb")
+    try:
+        while chunk := await upload.read(chunk_size):
+            size += len(chunk)
+            if max_bytes and size > max_bytes:
+                raise UploadTooLarge(max_bytes)
+            digest.update(chunk)
+            await asyncio.to_thread(f.write, chunk)
+    except BaseException:
+        await asyncio.to_thread(f.close)
+        dest.unlink(missing_ok=True)
+        raise
+    await asyncio.to_thread(f.close)
+    return SavedFile(dest, digest.hexdigest(), size)
+
+
+def find_import(db, user_id: int, sha256: str) -> Optional[Dict]:
+    """Summary of the user's earlier import of a file with this hash, if any."""
+    from src.models import Upload
+
+    row = db.query(Upload).filter(Upload.user_id == user_id, Upload.sha256 == sha256).first()
+    if row is None or not isinstance(row.summary, str):
+        return None
+    return json.loads(row.summary)
+
+
+def record_import(db, user_id: int, saved: SavedFile, filename: str, summary: Dict):
+    """Remember a successful import (caller commits); its object key is set by backup_import()."""
+    from src.models import Upload
+
+    db.add(Upload(
+        user_id=user_id,
+        sha256=saved.sha256,
+        filename=filename,
+        size=saved.size,
+        summary=json.dumps(summary)
+    ))
+
+
+def backup_import(user_id: int, sha256: str, local_path: str, object_name: str, session_factory=None) -> Optional[str]:
+    """
+    Back up an imported CSV to R2, then store the object key on its import (background task).
+
+    The key stays NULL when R2 is not configured or the backup fails.
+
+    Args:
+        user_id: Owner of the import
+        sha256: Content hash of the import
+        local_path: Imported file on disk
+        object_name: Object key before any compression suffix
+        session_factory: Session factory (defaults to SessionLocal)
+
+    Returns:
+        Object key stored, or None
+    """
+    from src import storage
+    from src.database import SessionLocal
+    from src.models import Upload
+
+    key = storage.backup_file(local_path, object_name)
+    if key is None:
+        return None
+    db = (session_factory or SessionLocal)()
+    try:
+        db.query(Upload).filter(
+            Upload.user_id == user_id,
+            Upload.sha256 == sha256
+        ).update({Upload.object_name: key}, synchronize_session=False)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error("Recording backup key failed", user_id=user_id, object_name=key, error=str(e))
+        return None
+    finally:
+        db.close()
+    return key
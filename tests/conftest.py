@@ -0,0 +1,40 @@
+"""
+Shared fixtures: a fresh SQLite database migrated to the latest schema, with
+one user.
+"""
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.migrations import run_migrations
+from src.models import User
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """Engine for a migrated SQLite database (usable from TestClient's thread)."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False})
+    run_migrations(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session_factory(engine):
+    return sessionmaker(bind=engine)
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def user(db):
+    user = User(email="owner@example.com", name="Owner", credits=10)
+    db.add(user)
+    db.commit()
+    return user
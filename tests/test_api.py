@@ -6,6 +6,8 @@ Tests the new endpoints added in Option B MVP:
 - /api/contacts
 - /api/history
 - /api/send-all
+- /api/dashboard
+- conditional GETs (ETag / If-None-Match)
 """
 
 import pytest
@@ -154,6 +156,96 @@ class TestHistoryEndpoint:
         assert isinstance(data, list)
 
 
+# /api/drafts Tests
+class TestDraftsEndpoint:
+    """Tests for /api/drafts endpoint."""
+    
+    def test_drafts_are_listed_column_rows(self, client, mock_db):
+        """Should load only the listed columns as rows (not ORM objects)."""
+        from collections import namedtuple
+        from src import dashboard
+        Row = namedtuple("Row", [c.key for c in dashboard.log_columns()])
+        rows = [Row(1, "a@acme.io", "Jane", "Acme", "Hi", "draft", datetime(2025, 1, 2, 3, 4, 5), None)]
+        mock_db.query.return_value.filter.return_value.order_by.return_value.all.return_value = rows
+        
+        response = client.get("/api/drafts")
+        
+        assert response.status_code == 200
+        mock_db.query.assert_called_with(*dashboard.log_columns())
+        assert response.json() == [{
+            "id": 1, "recipient_email": "a@acme.io", "recipient_name": "Jane", "company": "Acme",
+            "subject": "Hi", "status": "draft", "created_at": "2025-01-02T03:04:05", "sent_at": None,
+        }]
+
+
+# /api/dashboard Tests
+class TestDashboardEndpoint:
+    """Tests for /api/dashboard endpoint."""
+    
+    @pytest.fixture(autouse=True)
+    def empty_cache(self, mock_user):
+        from src import dashboard
+        mock_user.name = "Test User"
+        mock_user.picture = None
+        dashboard.clear()
+        yield
+        dashboard.clear()
+    
+    def test_dashboard_returns_snapshot_with_etag(self, client, mock_db):
+        """Should return stats, history, contacts and credits in one response."""
+        # Act
+        response = client.get("/api/dashboard")
+        
+        # Assert
+        assert response.status_code == 200
+        data = response.json()
+        assert data["credits_available"] == 50
+        assert set(data) == {"user", "credits_available", "stats", "history", "contacts"}
+        assert response.headers["etag"]
+    
+    def test_unchanged_dashboard_is_not_modified(self, client, mock_db):
+        """Should answer 304 from the cache when the ETag still matches."""
+        etag = client.get("/api/dashboard").headers["etag"]
+        mock_db.query.reset_mock()
+        
+        response = client.get("/api/dashboard", headers={"If-None-Match": etag})
+        
+        assert response.status_code == 304
+        mock_db.query.assert_not_called()
+
+
+# Conditional requests
+class TestConditionalReads:
+    """Read endpoints answer If-None-Match with 304 while the data version is unchanged."""
+    
+    @pytest.mark.parametrize("path", ["/api/stats", "/api/history", "/api/contacts?status=new", "/api/drafts"])
+    def test_matching_etag_skips_queries(self, client, mock_db, mock_user, path):
+        mock_user.data_version = 3
+        mock_db.query.return_value.filter.return_value.scalar.return_value = 0
+        etag = client.get(path).headers["etag"]
+        mock_db.query.reset_mock()
+        
+        response = client.get(path, headers={"If-None-Match": etag})
+        
+        assert response.status_code == 304
+        mock_db.query.assert_not_called()
+    
+    def test_new_version_changes_the_etag(self, client, mock_user):
+        mock_user.data_version = 3
+        etag = client.get("/api/history").headers["etag"]
+        mock_user.data_version = 4
+        
+        response = client.get("/api/history", headers={"If-None-Match": etag})
+        
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+    
+    def test_etag_depends_on_query(self, client, mock_user):
+        mock_user.data_version = 3
+        
+        assert client.get("/api/history").headers["etag"] != client.get("/api/history?limit=5").headers["etag"]
+
+
 # /api/send-all Tests
 class TestSendAllEndpoint:
     """Tests for /api/send-all endpoint (Option B feature)."""
@@ -191,6 +283,73 @@ class TestSendAllEndpoint:
         assert data["queued"] == 0
 
 
+# /api/preview/stream Tests
+class TestPreviewStreamEndpoint:
+    """Tests for the streaming NDJSON preview."""
+    
+    def stream(self, client, mock_db, monkeypatch, count=3):
+        """Run /api/preview/stream for count contacts against a stand-in Gemini."""
+        import json
+        from benchmarks.fakes import FakeProfile, gemini_server
+        
+        server = gemini_server(FakeProfile(latency=0.4)).start()
+        monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+        monkeypatch.setenv("GEMINI_BASE_URL", server.url)
+        
+        contacts = []
+        for i in range(count):
+            contact = MagicMock()
+            contact.id = i + 1
+            contact.name = f"Person {i}"
+            contact.email = f"p{i}@example.com"
+            contact.company = f"Company {i}"
+            contact.role = "Recruiter"
+            contacts.append(contact)
+        mock_db.query.return_value.filter.return_value.limit.return_value.all.return_value = contacts
+        
+        try:
+            response = client.get(f"/api/preview/stream?limit={count}")
+        finally:
+            server.stop()
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        return [json.loads(line) for line in response.text.splitlines()]
+    
+    def test_streams_deltas_then_emails_concurrently(self, client, mock_db, monkeypatch):
+        """Should stream partial text and one email per contact, generated concurrently."""
+        events = self.stream(client, mock_db, monkeypatch)
+        emails = [e for e in events if e["type"] == "email"]
+        
+        assert events[-1] == {"type": "done", "count": 3}
+        assert sorted(e["index"] for e in emails) == [0, 1, 2]
+        assert all(e["subject"].startswith("Agentic Workflows") for e in emails)
+        # Partial text for each email arrives before the email itself
+        first_delta = {e["index"]: events.index(e) for e in reversed(events) if e["type"] == "delta"}
+        assert all(first_delta[e["index"]] < events.index(e) for e in emails)
+        # Overlapped: every generation had started streaming before the first one finished
+        assert max(first_delta.values()) < events.index(emails[0])
+    
+    def test_open_streams_are_limited(self, client, mock_db, monkeypatch):
+        """A stream holds its GEMINI_STREAMS slot until it is fully consumed."""
+        from src import llm_generator
+        from src.retry import AdaptiveLimiter
+        
+        monkeypatch.setattr(llm_generator, "GEMINI_STREAMS", AdaptiveLimiter("test", initial=1, maximum=1))
+        events = self.stream(client, mock_db, monkeypatch, count=2)
+        
+        # With one slot the second generation only starts after the first email is complete
+        order = [(e["type"], e["index"]) for e in events if e["type"] != "done"]
+        first_email = next(i for i, (kind, _) in enumerate(order) if kind == "email")
+        assert {index for _, index in order[:first_email + 1]} == {order[first_email][1]}
+    
+    def test_limit_is_capped(self, client):
+        """Should reject requests for more previews than PREVIEW_STREAM_MAX."""
+        response = client.get("/api/preview/stream?limit=1000")
+        
+        assert response.status_code == 422
+
+
 # Credit Validation Tests
 class TestCreditValidation:
     """Tests for credit validation in /api/draft."""
@@ -0,0 +1,225 @@
+"""
+Tests for per-company profiles: name/domain normalization, the Apollo
+conversion building notes once per company, profile upserts at import and
+blurb reuse at generation time.
+"""
+
+import asyncio
+import threading
+
+import pandas as pd
+import pytest
+from sqlalchemy import event
+
+from src import companies, pregeneration
+from src.data_processor import DataProcessor
+from src.models import CompanyProfile, Contact
+
+
+class FakeBlurbGenerator:
+    """Stands in for LLMEmailGenerator.company_blurbs; records each call."""
+
+    def __init__(self):
+        self.calls = []
+
+    def company_blurbs(self, companies_):
+        self.calls.append([c["company"] for c in companies_])
+        return [f"{c['company']} builds things." for c in companies_]
+
+
+class FakeEmailGenerator(FakeBlurbGenerator):
+    """Blurbs plus emails; records the threads Gemini would be called from."""
+
+    profile_hash = "hash-1"
+
+    def __init__(self):
+        super().__init__()
+        self.threads = []
+        self.recruiters = []
+
+    def company_blurbs(self, companies_):
+        self.threads.append(threading.current_thread())
+        return super().company_blurbs(companies_)
+
+    def generate_many(self, recruiters, has_attachments=False):
+        self.threads.append(threading.current_thread())
+        self.recruiters = recruiters
+        return [{"subject": "S", "body": "B"} for _ in recruiters]
+
+
+class TestNormalization:
+    """normalize_company / website_domain / email_domain / clean_keywords."""
+
+    @pytest.mark.parametrize("name,expected", [
+        ("Acme, Inc.", "acme"),
+        ("ACME Inc", "acme"),
+        ("Acme Technologies Pvt. Ltd.", "acme technologies"),
+        ("Smith & Sons Co", "smith and sons"),
+        ("Co", "co"),
+        (None, ""),
+    ])
+    def test_normalize_company(self, name, expected):
+        assert companies.normalize_company(name) == expected
+
+    def test_domains(self):
+        assert companies.website_domain("https://www.Acme.io/about") == "acme.io"
+        assert companies.website_domain("acme.io") == "acme.io"
+        assert companies.website_domain(float("nan")) == ""
+        assert companies.email_domain("jane@Acme.io") == "acme.io"
+        assert companies.email_domain("jane@gmail.com") == ""
+
+    def test_clean_keywords_dedupes_case_insensitively(self):
+        assert companies.clean_keywords(" ML,  ml , Data  Science,,AI ") == ["ML", "Data Science", "AI"]
+        assert companies.company_notes("Fintech", "ai, AI, agents") == "Fintech | Keywords: ai, agents"
+        assert companies.company_notes("", "") == ""
+
+
+class TestApolloConversion:
+    """DataProcessor builds notes once per company and keeps the raw fields."""
+
+    def test_recruiters_at_one_company_share_notes(self, tmp_path):
+        path = tmp_path / "apollo.csv"
+        pd.DataFrame({
+            "First Name": ["Jane", "John", "Ann"],
+            "Last Name": ["Doe", "Roe", "Lee"],
+            "Email": ["jane@acme.io", "john@acme.io", "ann@globex.com"],
+            "Company Name": ["Acme", "Acme", "Globex"],
+            "Title": ["Recruiter", "Talent Partner", "HR"],
+            "# Employees": [20, 20, 900],
+            "Industry": ["Fintech", "Fintech", None],
+            "Keywords": ["ai, AI, agents", "ai, AI, agents", None],
+            "Website": ["https://www.acme.io", "https://www.acme.io", "globex.com"],
+        }).to_csv(path, index=False)
+
+        rows = DataProcessor().load_csv(str(path))
+
+        assert rows[0]["notes"] == rows[1]["notes"] == "Fintech | Keywords: ai, agents"
+        assert rows[2]["notes"] == ""
+        assert [r["company_domain"] for r in rows] == ["acme.io", "acme.io", "globex.com"]
+        assert [r["company_type"] for r in rows] == ["startup", "startup", "enterprise"]
+
+
+class TestUpsertProfiles:
+    """Profiles are created once per company and merged on re-import."""
+
+    def test_groups_recruiters_by_company(self, db, user):
+        recruiters = [
+            {"recruiter_email": "jane@acme.io", "company": "Acme, Inc.", "company_type": "startup",
+             "industry": "Fintech", "keywords": "ai, agents"},
+            {"recruiter_email": "john@acme.io", "company": "ACME Inc", "company_type": "startup",
+             "industry": "Fintech", "keywords": "ai, agents"},
+            {"recruiter_email": "ann@gmail.com", "company": "Globex", "company_type": "unknown",
+             "notes": "Energy | Keywords: grid, Grid, solar"},
+        ]
+
+        profiles = companies.upsert_profiles(db, user.id, recruiters)
+        db.commit()
+
+        assert set(profiles) == {("acme", "acme.io"), ("globex", "")}
+        globex = profiles[("globex", "")]
+        assert (globex.industry, globex.keywords, globex.company_type) == ("Energy", "grid, solar", "unknown")
+        assert db.query(CompanyProfile).count() == 2
+
+    def test_reimport_merges_keywords(self, db, user):
+        first = {"recruiter_email": "jane@acme.io", "company": "Acme", "keywords": "ai, agents"}
+        companies.upsert_profiles(db, user.id, [first])
+        db.commit()
+
+        again = dict(first, company_type="mid-size", keywords="Agents, sql")
+        profile = companies.upsert_profiles(db, user.id, [again])[("acme", "acme.io")]
+        db.commit()
+
+        assert db.query(CompanyProfile).count() == 1
+        assert profile.keywords == "ai, agents, sql"
+        assert profile.company_type == "mid-size"
+
+    def test_concurrent_import_of_the_same_company(self, db, user, session_factory, monkeypatch):
+        lookup = companies._existing_profiles
+
+        def racing_lookup(db, user_id, keys):
+            # Another upload commits Acme between this import's lookup and its insert
+            monkeypatch.setattr(companies, "_existing_profiles", lookup)
+            found = lookup(db, user_id, keys)
+            other = session_factory()
+            companies.upsert_profiles(other, user_id, [{"recruiter_email": "bob@acme.io", "company": "Acme", "keywords": "ai"}])
+            other.commit()
+            other.close()
+            return found
+
+        monkeypatch.setattr(companies, "_existing_profiles", racing_lookup)
+        profiles = companies.upsert_profiles(db, user.id, [
+            {"recruiter_email": "jane@acme.io", "company": "Acme", "keywords": "sql"},
+            {"recruiter_email": "ann@globex.com", "company": "Globex"},
+        ])
+        db.commit()
+
+        assert set(profiles) == {("acme", "acme.io"), ("globex", "globex.com")}
+        assert profiles[("acme", "acme.io")].keywords == "ai, sql"
+        assert db.query(CompanyProfile).count() == 2
+
+
+class TestCompanyContext:
+    """Generation inputs come from the profile; blurbs are written once per company."""
+
+    def add_contacts(self, db, user, profile, count):
+        for i in range(count):
+            db.add(Contact(
+                user_id=user.id, name=f"{profile.name} {i}", email=f"{i}@{profile.domain}",
+                company=profile.name, company_profile_id=profile.id, status="new"
+            ))
+        profile.contact_count = count
+        db.commit()
+
+    def test_blurbs_generated_once_for_shared_companies(self, db, user):
+        profiles = companies.upsert_profiles(db, user.id, [
+            {"recruiter_email": "a@acme.io", "company": "Acme", "company_type": "startup",
+             "industry": "Fintech", "keywords": "ai"},
+            {"recruiter_email": "a@solo.io", "company": "Solo"},
+        ])
+        acme, solo = profiles[("acme", "acme.io")], profiles[("solo", "solo.io")]
+        self.add_contacts(db, user, acme, 3)
+        self.add_contacts(db, user, solo, 1)
+        contacts = db.query(Contact).order_by(Contact.id).all()
+        generator = FakeBlurbGenerator()
+
+        recruiters = pregeneration.recruiters_for(db, contacts, generator)
+        pregeneration.recruiters_for(db, contacts, generator)
+
+        # Only Acme has enough contacts, and its blurb is reused on the second pass
+        assert generator.calls == [["Acme"]]
+        assert [r.get("company_blurb") for r in recruiters] == ["Acme builds things."] * 3 + [None]
+        assert recruiters[0]["company_type"] == "startup"
+        assert recruiters[0]["notes"] == "Fintech | Keywords: ai"
+        assert recruiters[3]["company_type"] == "unknown"
+
+    def test_request_path_uses_the_session_on_the_calling_thread(self, db, user):
+        """Gemini calls run in worker threads; queries and the commit stay with the caller."""
+        profile = companies.upsert_profiles(db, user.id, [{"recruiter_email": "a@acme.io", "company": "Acme"}])[("acme", "acme.io")]
+        self.add_contacts(db, user, profile, 2)
+        rows = db.query(*pregeneration.contact_columns()).order_by(Contact.id).all()
+        profiles = companies.profiles_for(db, rows)
+        generator = FakeEmailGenerator()
+        commits, statements = [], []
+        event.listen(db, "after_commit", lambda session: commits.append(threading.current_thread()))
+        event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+        emails = asyncio.run(pregeneration.agenerate_with_cache(db, user.id, rows, generator, profiles=profiles))
+
+        assert emails == [{"subject": "S", "body": "B"}] * 2
+        assert generator.calls == [["Acme"]]
+        assert [r["company_blurb"] for r in generator.recruiters] == ["Acme builds things."] * 2
+        assert threading.main_thread() not in generator.threads
+        assert commits == [threading.main_thread()]
+        # The profiles passed in are reused rather than queried again
+        assert not any("FROM company_profiles" in sql for sql in statements)
+        assert db.get(CompanyProfile, profile.id).blurb == "Acme builds things."
+
+    def test_contacts_without_profile_keep_defaults(self, db, user):
+        contact = Contact(user_id=user.id, name="Jane", email="jane@acme.io", company="Acme", status="new")
+        db.add(contact)
+        db.commit()
+
+        [recruiter] = pregeneration.recruiters_for(db, [contact], FakeBlurbGenerator())
+
+        assert recruiter["company_type"] == "unknown"
+        assert "company_blurb" not in recruiter
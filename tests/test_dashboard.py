@@ -0,0 +1,91 @@
+"""
+Tests for the cached dashboard snapshot (src/dashboard.py) and ETag helpers
+(src/etags.py).
+"""
+
+import pytest
+
+from src import dashboard
+from src.etags import etag_for, etag_matches
+from src.models import Contact, EmailLog
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    dashboard.clear()
+    yield
+    dashboard.clear()
+
+
+@pytest.fixture
+def user(user, db):
+    """The shared user, with a contact and emails in each status."""
+    user.credits = 40
+    db.add_all([
+        Contact(user_id=user.id, name="Jane", email="jane@acme.io", company="Acme", status="new"),
+        EmailLog(user_id=user.id, recipient_email="a@acme.io", status="sent"),
+        EmailLog(user_id=user.id, recipient_email="b@acme.io", status="draft"),
+        EmailLog(user_id=user.id, recipient_email="c@acme.io", status="draft"),
+        EmailLog(user_id=user.id, recipient_email="d@acme.io", status="queued"),
+    ])
+    db.commit()
+    return user
+
+
+class TestSnapshot:
+    """Contents, caching and invalidation."""
+
+    def test_build(self, db, user):
+        snapshot = dashboard.build(db, user)
+
+        assert snapshot["credits_available"] == 40
+        assert snapshot["stats"] == {"total_sent": 1, "total_drafted": 2, "pending": 1, "failed_emails": 0}
+        assert [c["email"] for c in snapshot["contacts"]] == ["jane@acme.io"]
+        assert len(snapshot["history"]) == 4
+
+    def test_cached_until_invalidated(self, db, user, monkeypatch):
+        snapshot, etag = dashboard.get(db, user)
+        monkeypatch.setattr(dashboard, "build", lambda db, user: pytest.fail("snapshot rebuilt"))
+
+        assert dashboard.get(db, user) == (snapshot, etag)
+
+        monkeypatch.undo()
+        dashboard.invalidate(user.id)
+        assert dashboard.get(db, user) == (snapshot, etag)
+
+    def test_writes_bump_the_data_version(self, db, user):
+        _, etag = dashboard.get(db, user)
+        version = user.data_version
+
+        db.add(EmailLog(user_id=user.id, recipient_email="e@acme.io", status="sent"))
+        db.commit()
+
+        assert user.data_version == version + 1
+        fresh, fresh_etag = dashboard.get(db, user)
+        assert fresh["stats"]["total_sent"] == 2
+        assert fresh_etag != etag
+
+    def test_expired_snapshots_are_rebuilt(self, db, user, monkeypatch):
+        monkeypatch.setattr(dashboard, "DASHBOARD_CACHE_TTL", 0)
+        _, etag = dashboard.get(db, user)
+        user.credits = 39
+        db.commit()
+
+        assert dashboard.get(db, user)[1] != etag
+
+
+class TestEtags:
+    """ETag generation and If-None-Match matching."""
+
+    def test_etag_ignores_key_order(self):
+        assert etag_for({"a": 1, "b": [1, 2]}) == etag_for({"b": [1, 2], "a": 1})
+        assert etag_for({"a": 1}) != etag_for({"a": 2})
+
+    def test_if_none_match(self):
+        etag = etag_for({"a": 1})
+
+        assert etag_matches(etag, etag)
+        assert etag_matches(f'"other", W/{etag}', etag)
+        assert etag_matches("*", etag)
+        assert not etag_matches(None, etag)
+        assert not etag_matches('"other"', etag)
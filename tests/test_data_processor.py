@@ -0,0 +1,136 @@
+"""
+Tests for the vectorized Apollo import and the columnar cache in DataProcessor.
+"""
+
+import os
+
+import pandas as pd
+import pytest
+
+from benchmarks import apollo_import
+from src import columnar_cache
+from src.data_processor import DataProcessor
+
+
+def write_csv(path, **columns):
+    pd.DataFrame(columns).to_csv(path, index=False)
+    return str(path)
+
+
+class TestApolloImport:
+    """Column pruning, employee-count buckets and defaults."""
+
+    def test_company_type_buckets(self, tmp_path):
+        employees = ["1", "49", "49.7", "50", "499", "500", "12000", "", "n/a", "1,200"]
+        path = write_csv(
+            tmp_path / "apollo.csv",
+            **{
+                "First Name": ["A"] * len(employees),
+                "Email": [f"{i}@x.io" for i in range(len(employees))],
+                "Company Name": [f"C{i}" for i in range(len(employees))],
+                "# Employees": employees,
+            }
+        )
+
+        df = DataProcessor()._read_csv_frame(path)
+
+        assert df["company_type"].tolist() == [
+            "startup", "startup", "startup", "mid-size", "mid-size",
+            "enterprise", "enterprise", "unknown", "unknown", "unknown",
+        ]
+
+    def test_unused_columns_are_not_read(self, tmp_path):
+        path = write_csv(
+            tmp_path / "apollo.csv",
+            **{
+                "First Name": ["Jane"],
+                "Last Name": [None],
+                "Email": ["jane@acme.io"],
+                "Company Name": ["Acme"],
+                "Seniority": ["Senior"],
+                "Phone": ["+1 555"],
+            }
+        )
+
+        df = DataProcessor()._read_csv_frame(path)
+
+        assert "Seniority" not in df.columns and "Phone" not in df.columns
+        row = df.iloc[0]
+        # No Title / # Employees columns: defaults instead of errors
+        assert (row["recruiter_name"], row["role"], row["company_type"]) == ("Jane", "AI/ML Engineer", "unknown")
+
+    def test_benchmark_matches_previous_implementation(self):
+        report = apollo_import.run(rows=2000, companies=50, extra_columns=5)
+
+        assert report["config"]["columns"] == 14
+        assert report["legacy_s"] > 0 and report["current_s"] > 0
+
+
+class TestColumnarCache:
+    """Arrow sidecars keyed by content hash (src/columnar_cache.py)."""
+
+    def standard_csv(self, tmp_path):
+        return write_csv(
+            tmp_path / "contacts.csv",
+            recruiter_name=["Jane", "John"],
+            recruiter_email=["jane@acme.io", "john@acme.io"],
+            company=["Acme", "Acme"],
+            role=["HR", "Recruiter"],
+        )
+
+    def test_uncached_loads_write_no_sidecar(self, tmp_path):
+        path = self.standard_csv(tmp_path)
+
+        DataProcessor().load_validated(path)
+        DataProcessor().load_dataframe(path)
+
+        assert not list(tmp_path.glob(".*.arrow"))
+
+    def test_sidecar_is_written_and_read_back(self, tmp_path, monkeypatch):
+        pytest.importorskip("pyarrow")
+        path = self.standard_csv(tmp_path)
+
+        parsed = DataProcessor().load_dataframe(path, cache=True)
+        assert columnar_cache.sidecar_path(path, columnar_cache.file_sha256(path)).exists()
+
+        # Repeat loads come from the sidecar without parsing the CSV
+        def no_parse(self, filepath):
+            raise AssertionError("CSV parsed again")
+        monkeypatch.setattr(DataProcessor, "_parse_csv_frame", no_parse)
+        cached = DataProcessor().load_dataframe(path, cache=True)
+
+        pd.testing.assert_frame_equal(cached, parsed, check_dtype=False)
+
+    def test_sidecar_reads_only_the_requested_columns(self, tmp_path):
+        pytest.importorskip("pyarrow")
+        path = self.standard_csv(tmp_path)
+        DataProcessor().load_dataframe(path, cache=True)
+
+        cached = DataProcessor().load_dataframe(path, cache=True, columns=["recruiter_email", "company", "missing"])
+        uncached = DataProcessor().load_dataframe(path, columns=["recruiter_email", "company", "missing"])
+
+        assert list(cached.columns) == list(uncached.columns) == ["recruiter_email", "company"]
+        assert cached["recruiter_email"].tolist() == ["jane@acme.io", "john@acme.io"]
+
+    def test_changed_content_replaces_the_sidecar(self, tmp_path):
+        pytest.importorskip("pyarrow")
+        path = self.standard_csv(tmp_path)
+        DataProcessor().load_dataframe(path, cache=True)
+
+        write_csv(path, recruiter_name=["Ann"], recruiter_email=["ann@acme.io"], company=["Acme"], role=["HR"])
+
+        assert DataProcessor().load_dataframe(path, cache=True)["recruiter_name"].tolist() == ["Ann"]
+        assert list(tmp_path.glob(".*.arrow")) == [columnar_cache.sidecar_path(path, columnar_cache.file_sha256(path))]
+
+    def test_sidecars_of_deleted_csvs_are_pruned(self, tmp_path):
+        pytest.importorskip("pyarrow")
+        gone = write_csv(
+            tmp_path / "old.csv", recruiter_name=["Ann"], recruiter_email=["ann@acme.io"], company=["Acme"], role=["HR"]
+        )
+        DataProcessor().load_dataframe(gone, cache=True)
+        os.remove(gone)
+
+        path = self.standard_csv(tmp_path)
+        DataProcessor().load_dataframe(path, cache=True)
+
+        assert list(tmp_path.glob(".*.arrow")) == [columnar_cache.sidecar_path(path, columnar_cache.file_sha256(path))]
@@ -0,0 +1,78 @@
+"""
+Tests for per-user data versions (src/data_version.py).
+"""
+
+import pytest
+
+from src.models import Contact, EmailLog, User
+
+
+@pytest.fixture
+def user_id(user):
+    return user.id
+
+
+def version(session_factory, user_id):
+    with session_factory() as db:
+        return db.get(User, user_id).data_version
+
+
+class TestDataVersion:
+    """Writes to contacts, email logs and credits bump the owner's version."""
+
+    def test_new_user_starts_at_zero(self, session_factory, user_id):
+        assert version(session_factory, user_id) == 0
+
+    def test_writes_without_the_user_loaded(self, session_factory, user_id):
+        with session_factory() as db:
+            db.add(Contact(user_id=user_id, email="jane@acme.io", status="new"))
+            db.commit()
+        assert version(session_factory, user_id) == 1
+
+        with session_factory() as db:
+            contact = db.query(Contact).one()
+            contact.status = "drafted"
+            db.add(EmailLog(user_id=user_id, recipient_email="jane@acme.io", status="draft"))
+            db.commit()
+        # One flush, one bump
+        assert version(session_factory, user_id) == 2
+
+        with session_factory() as db:
+            db.delete(db.query(Contact).one())
+            db.commit()
+        assert version(session_factory, user_id) == 3
+
+    def test_credits_bump_other_fields_do_not(self, session_factory, user_id):
+        with session_factory() as db:
+            user = db.get(User, user_id)
+            user.name = "Me"
+            db.commit()
+            assert user.data_version == 0
+
+            user.credits -= 1
+            db.commit()
+            assert user.data_version == 1
+
+    def test_unchanged_objects_do_not_bump(self, session_factory, user_id):
+        with session_factory() as db:
+            db.add(Contact(user_id=user_id, email="jane@acme.io", status="new"))
+            db.commit()
+            contact = db.query(Contact).one()
+            contact.status = "new"
+            db.commit()
+        assert version(session_factory, user_id) == 1
+
+    def test_concurrent_writes_each_bump(self, session_factory, user_id):
+        """Two sessions that loaded the same version both count."""
+        first, second = session_factory(), session_factory()
+        users = [db.get(User, user_id) for db in (first, second)]
+        assert [u.data_version for u in users] == [0, 0]
+        first.add(Contact(user_id=user_id, email="jane@acme.io", status="new"))
+        second.add(Contact(user_id=user_id, email="john@acme.io", status="new"))
+
+        first.commit()
+        second.commit()
+        first.close()
+        second.close()
+
+        assert version(session_factory, user_id) == 2
@@ -0,0 +1,84 @@
+"""
+Tests for import-time domain deliverability checks (src/deliverability.py)
+against a local stand-in DNS table.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+from src import deliverability
+from src.deliverability import DomainResult, Resolver, StaticResolver, check_domains
+from src.models import DomainCheck
+
+DNS_TABLE = {
+    "acme.io": ["mx1.acme.io", "mx2.acme.io"],
+    "parked.io": [],  # exists, no mail route
+}
+
+
+class FlakyResolver(Resolver):
+    """Times out for every domain."""
+
+    async def check(self, domain):
+        return DomainResult(None)
+
+
+class TestCheckDomains:
+    """Resolution, caching and concurrency."""
+
+    def test_classifies_domains(self, db):
+        resolver = StaticResolver(DNS_TABLE)
+
+        result = asyncio.run(check_domains(db, ["acme.io", "acme.io", "parked.io", "gone.example", ""], resolver))
+
+        assert result == {"acme.io": True, "parked.io": False, "gone.example": False}
+        # Each distinct domain is resolved once
+        assert sorted(resolver.lookups) == ["acme.io", "gone.example", "parked.io"]
+        assert db.get(DomainCheck, "acme.io").mx_hosts == "mx1.acme.io,mx2.acme.io"
+
+    def test_cached_results_skip_lookups_until_expiry(self, db):
+        asyncio.run(check_domains(db, ["acme.io", "gone.example"], StaticResolver(DNS_TABLE)))
+        resolver = StaticResolver({})  # would now report everything dead
+
+        assert asyncio.run(check_domains(db, ["acme.io", "gone.example"], resolver)) == {
+            "acme.io": True, "gone.example": False
+        }
+        assert resolver.lookups == []
+
+        db.get(DomainCheck, "acme.io").expires_at = datetime.utcnow() - timedelta(seconds=1)
+        db.commit()
+        assert asyncio.run(check_domains(db, ["acme.io"], resolver)) == {"acme.io": False}
+        assert resolver.lookups == ["acme.io"]
+
+    def test_dead_domains_expire_sooner(self, db):
+        asyncio.run(check_domains(db, ["acme.io", "gone.example"], StaticResolver(DNS_TABLE)))
+
+        live, dead = db.get(DomainCheck, "acme.io"), db.get(DomainCheck, "gone.example")
+        assert dead.expires_at - dead.checked_at == timedelta(seconds=deliverability.DELIVERABILITY_NEGATIVE_TTL)
+        assert live.expires_at - live.checked_at == timedelta(seconds=deliverability.DELIVERABILITY_TTL)
+
+    def test_failed_lookups_count_as_deliverable_and_are_not_cached(self, db):
+        assert asyncio.run(check_domains(db, ["acme.io"], FlakyResolver())) == {"acme.io": True}
+        assert db.query(DomainCheck).count() == 0
+
+    def test_lookups_run_concurrently(self, db):
+        domains = [f"d{i}.io" for i in range(40)]
+        resolver = StaticResolver({d: [f"mx.{d}"] for d in domains}, latency=0.05)
+
+        start = time.perf_counter()
+        result = asyncio.run(check_domains(db, domains, resolver, concurrency=20))
+
+        assert all(result.values()) and len(result) == 40
+        # Two waves of 20 instead of 40 sequential lookups
+        assert time.perf_counter() - start < 40 * 0.05 / 2
+
+    def test_disabled_without_resolver(self, db, monkeypatch):
+        monkeypatch.setattr(deliverability, "get_resolver", lambda: None)
+
+        assert asyncio.run(check_domains(db, ["gone.example"])) == {"gone.example": True}
+
+
+def test_email_domain():
+    assert deliverability.email_domain("Jane@Acme.IO") == "acme.io"
+    assert deliverability.email_domain(None) == ""
@@ -0,0 +1,83 @@
+"""
+Tests for import-time email validation (src/email_validation.py).
+"""
+
+import pandas as pd
+
+from benchmarks import email_validation as bench
+from src.data_processor import DataProcessor
+from src.email_validation import is_disposable, validate_frame
+
+
+def frame(*emails):
+    return pd.DataFrame({"recruiter_name": [f"R{i}" for i in range(len(emails))], "recruiter_email": list(emails)})
+
+
+class TestValidateFrame:
+    """Normalization, rejection reasons and the report."""
+
+    def test_normalizes_accepted_addresses(self):
+        accepted, report = validate_frame(frame("  Jane@Acme.IO ", "mailto:<john@acme.io>"))
+
+        assert accepted["recruiter_email"].tolist() == ["jane@acme.io", "john@acme.io"]
+        assert report["accepted"] == 2 and report["rows"] == []
+
+    def test_rejections_and_report(self):
+        df = frame(
+            "jane@acme.io",
+            "JANE@acme.io",        # duplicate after normalization
+            "not-an-email",
+            None,
+            "x@mailinator.com",
+            "x@inbox.yopmail.com",  # subdomain of a disposable domain
+            "careers@acme.io",      # role mailbox: kept, flagged
+        )
+
+        accepted, report = validate_frame(df)
+
+        assert accepted["recruiter_name"].tolist() == ["R0", "R6"]
+        assert report["total"] == 7
+        assert report["rejected"] == {"invalid": 2, "duplicate": 1, "disposable": 2}
+        assert report["flagged"] == {"role": 1}
+        assert report["rows"][:3] == [
+            {"row": 3, "email": "JANE@acme.io", "reason": "duplicate"},
+            {"row": 4, "email": "not-an-email", "reason": "invalid"},
+            {"row": 5, "email": "", "reason": "invalid"},
+        ]
+
+    def test_disposable_domains_match_whole_labels(self):
+        assert is_disposable("yopmail.com")
+        assert is_disposable("mx.yopmail.com")
+        assert not is_disposable("notyopmail.com")
+
+    def test_empty_frame(self):
+        accepted, report = validate_frame(frame())
+
+        assert accepted.empty
+        assert report["total"] == 0 and report["rejected"] == {"invalid": 0, "duplicate": 0, "disposable": 0}
+
+
+class TestDataProcessorValidation:
+    """load_validated / validate_emails use the same pipeline."""
+
+    def test_load_validated(self, tmp_path):
+        path = tmp_path / "contacts.csv"
+        frame("Jane@Acme.io", "jane@acme.io", "bad").assign(company="Acme", role="HR").to_csv(path, index=False)
+
+        recruiters, report = DataProcessor().load_validated(str(path))
+
+        assert [r["recruiter_email"] for r in recruiters] == ["jane@acme.io"]
+        assert report["rejected"]["duplicate"] == 1 and report["rejected"]["invalid"] == 1
+
+    def test_validate_emails_prints_a_summary(self, capsys):
+        processor = DataProcessor()
+        processor.recruiters = [{"recruiter_name": "A", "recruiter_email": "bad"}]
+
+        assert processor.validate_emails() == []
+        assert "1 emails rejected (1 invalid)" in capsys.readouterr().out
+
+    def test_benchmark_runs(self):
+        result = bench.run(rows=5000)
+
+        assert result["accepted"] + sum(result["rejected"].values()) == 5000
+        assert result["flagged"]["role"] > 0
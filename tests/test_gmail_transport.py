@@ -0,0 +1,195 @@
+"""
+Tests for the async Gmail transport (src/gmail_transport.py) and the
+GmailClient async methods, against a local stand-in Gmail server.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from benchmarks.fakes import FakeProfile, FakeServer, gmail_server
+from src import gmail_client, gmail_transport
+from src.gmail_client import GmailClient
+from src.metrics import GMAIL_ERRORS
+
+
+def make_user():
+    return SimpleNamespace(
+        id=1,
+        email="me@example.com",
+        access_token="access-token",
+        refresh_token="refresh-token",
+        token_expiry=None,  # never expires
+    )
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    """No backoff sleeps, and a fresh circuit breaker and limit per test."""
+    monkeypatch.setattr(gmail_client.GMAIL_RETRY, "base_delay", 0)
+    monkeypatch.setattr(gmail_client.GMAIL_RETRY, "max_delay", 0)
+    monkeypatch.setattr(gmail_client.GMAIL_LIMITER, "_limit", 10.0)
+    gmail_client.GMAIL_BREAKER.record_success()
+
+
+@pytest.fixture
+def serve(monkeypatch):
+    """Start a stand-in server and point the shared pool at it."""
+    servers = []
+
+    def start(server: FakeServer) -> FakeServer:
+        servers.append(server.start())
+        monkeypatch.setattr(gmail_transport, "GMAIL_API_ENDPOINT", server.url)
+        monkeypatch.setattr(gmail_transport, "_client", None)
+        return server
+
+    yield start
+    for server in servers:
+        server.stop()
+
+
+class TestAsyncGmailClient:
+    """acreate_draft / asend_draft / asend_email over HttpxTransport."""
+
+    def test_create_and_send_draft(self, serve):
+        server = serve(gmail_server())
+
+        async def run():
+            client = GmailClient(user=make_user())
+            assert await client.aauthenticate()
+            draft = await client.acreate_draft("to@example.com", "Hello", "Body")
+            sent = await client.asend_draft(draft["id"])
+            email = await client.asend_email("to@example.com", "Hi", "Body")
+            await gmail_transport.close_async_client()
+            return draft, sent, email
+
+        draft, sent, email = asyncio.run(run())
+
+        assert draft["status"] == "draft" and draft["id"]
+        assert sent["status"] == "sent" and sent["thread_id"]
+        assert email["status"] == "sent"
+        assert set(server.calls.latencies) == {
+            "/gmail/v1/users/me/drafts",
+            "/gmail/v1/users/me/drafts/send",
+            "/gmail/v1/users/me/messages/send",
+        }
+
+    def test_messages_are_built_off_the_event_loop(self, serve, tmp_path, monkeypatch):
+        """Attachments are read and encoded in a worker thread, not on the loop."""
+        import threading
+
+        serve(gmail_server())
+        attachment = tmp_path / "resume.pdf"
+        attachment.write_bytes(b"%PDF" * 1000)
+        create_message = GmailClient._create_message
+        threads = []
+
+        def recording(self, *args):
+            threads.append(threading.current_thread())
+            return create_message(self, *args)
+
+        monkeypatch.setattr(GmailClient, "_create_message", recording)
+
+        async def run():
+            client = GmailClient(user=make_user())
+            await client.aauthenticate()
+            draft = await client.acreate_draft("to@example.com", "Hello", "Body", [str(attachment)])
+            email = await client.asend_email("to@example.com", "Hi", "Body", str(attachment))
+            await gmail_transport.close_async_client()
+            return draft, email, threading.current_thread()
+
+        draft, email, loop_thread = asyncio.run(run())
+
+        assert draft["status"] == "draft" and email["status"] == "sent"
+        assert len(threads) == 2 and loop_thread not in threads
+
+    def test_concurrent_calls_share_one_pool(self, serve):
+        server = serve(gmail_server(FakeProfile(latency=0.05)))
+
+        async def run():
+            clients = [GmailClient(user=make_user()) for _ in range(5)]
+            for client in clients:
+                await client.aauthenticate()
+            pool = gmail_transport.get_async_client()
+            results = await asyncio.gather(*(
+                c.acreate_draft(f"to{i}@example.com", "S", "B") for i, c in enumerate(clients * 4)
+            ))
+            same_pool = gmail_transport.get_async_client() is pool
+            await gmail_transport.close_async_client()
+            return results, same_pool
+
+        results, same_pool = asyncio.run(run())
+
+        assert all(r and r["status"] == "draft" for r in results)
+        assert same_pool
+        assert len(server.calls.latencies["/gmail/v1/users/me/drafts"]) == 20
+
+    def test_http_error_returns_none_and_counts(self, serve):
+        server = serve(gmail_server(FakeProfile(error_rate=1.0, error_status=503)))
+        before = GMAIL_ERRORS.get(operation="send_draft")
+
+        async def run():
+            client = GmailClient(user=make_user())
+            await client.aauthenticate()
+            result = await client.asend_draft("r-123")
+            await gmail_transport.close_async_client()
+            return result
+
+        assert asyncio.run(run()) is None
+        assert GMAIL_ERRORS.get(operation="send_draft") == before + 1
+        # First attempt plus the SERVER retry budget
+        assert len(server.calls.latencies["/gmail/v1/users/me/drafts/send"]) == 4
+
+    def test_rate_limited_call_is_retried(self, serve):
+        attempts = []
+
+        def create(path, body):
+            attempts.append(path)
+            if len(attempts) <= 2:
+                return 429, {"error": {"code": 429, "message": "Too many concurrent requests for user"}}
+            return 200, {"id": "r-1", "message": {"id": "m-1"}}
+
+        serve(FakeServer("gmail", [("/gmail/v1/users/me/drafts", create)]))
+        limit_before = gmail_client.GMAIL_LIMITER.limit
+
+        async def run():
+            client = GmailClient(user=make_user())
+            await client.aauthenticate()
+            result = await client.acreate_draft("to@example.com", "S", "B")
+            await gmail_transport.close_async_client()
+            return result
+
+        assert asyncio.run(run())["id"] == "r-1"
+        assert len(attempts) == 3
+        # A per-user limit: retried without shrinking the limit shared by all users
+        assert gmail_client.GMAIL_LIMITER.limit == limit_before
+
+    def test_refreshes_token_once_on_401(self, serve):
+        attempts = []
+
+        def send(path, body):
+            attempts.append(path)
+            if len(attempts) == 1:
+                return 401, {"error": {"code": 401, "message": "Invalid Credentials"}}
+            return 200, {"id": "m1", "threadId": "t1"}
+
+        serve(FakeServer("gmail", [("/gmail/v1/users/me/drafts/send", send)]))
+        refreshed = []
+
+        async def run():
+            client = GmailClient(user=make_user())
+            await client.aauthenticate()
+            client.transport = gmail_transport.HttpxTransport(client.creds, lambda: refreshed.append(True))
+            result = await client.asend_draft("r-123")
+            await gmail_transport.close_async_client()
+            return result
+
+        assert asyncio.run(run())["id"] == "m1"
+        assert refreshed == [True]
+        assert len(attempts) == 2
+
+    def test_aauthenticate_fails_without_token(self):
+        user = make_user()
+        user.access_token = None
+        assert asyncio.run(GmailClient(user=user).aauthenticate()) is False
@@ -0,0 +1,71 @@
+"""
+Import-time regression tests (python -X importtime).
+
+Each entry point has a list of heavy modules that must not be imported at
+load and a cumulative import budget in milliseconds. Budgets are generous
+to tolerate slow CI machines; scale them with IMPORT_BUDGET_SCALE.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+ENTRY_POINTS = {
+    "app": {
+        "code": "import app",
+        "budget_ms": 2500,
+        "forbidden": ["pandas", "googleapiclient", "google_auth_oauthlib", "boto3", "stripe"],
+    },
+    "cli": {
+        "code": "import sys; sys.path.insert(0, 'scripts'); import cli",
+        "budget_ms": 400,
+        "forbidden": ["pandas", "googleapiclient", "boto3", "jinja2", "sqlalchemy"],
+    },
+}
+
+
+def measure_imports(code: str):
+    """Run code under -X importtime and return (total ms, set of imported modules)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total_us = 0
+    modules = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        if not cumulative.strip().isdigit():
+            continue  # header row
+        modules.add(name.strip())
+        # Top-level imports have exactly one space before the module name
+        if not name.startswith("  "):
+            total_us += int(cumulative)
+    return total_us / 1000, modules
+
+
+@pytest.mark.parametrize("entry_point", sorted(ENTRY_POINTS))
+def test_heavy_dependencies_are_lazy(entry_point):
+    """Heavy optional dependencies should only load on first use."""
+    spec = ENTRY_POINTS[entry_point]
+    _, modules = measure_imports(spec["code"])
+    loaded = [m for m in spec["forbidden"] if m in modules]
+    assert not loaded, f"{entry_point} imports {loaded} at load time"
+
+
+@pytest.mark.parametrize("entry_point", sorted(ENTRY_POINTS))
+def test_import_time_within_budget(entry_point):
+    """Cumulative import time should stay under the entry point's budget (best of 3)."""
+    spec = ENTRY_POINTS[entry_point]
+    budget = spec["budget_ms"] * float(os.getenv("IMPORT_BUDGET_SCALE", "1"))
+    best = min(measure_imports(spec["code"])[0] for _ in range(3))
+    assert best <= budget, f"{entry_point} took {best:.0f}ms to import (budget {budget:.0f}ms)"
@@ -0,0 +1,166 @@
+"""
+Tests for LLMEmailGenerator prompt construction: the shared system
+instruction, the per-recipient delta and notes compaction.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.llm_generator import (
+    SYSTEM_INSTRUCTION,
+    LLMEmailGenerator,
+    compact_notes,
+    estimate_tokens,
+)
+
+APOLLO_NOTES = "Information Technology & Services | Keywords: " + ", ".join(
+    f"keyword {i}" for i in range(300)
+)
+
+
+@pytest.fixture
+def generator(monkeypatch):
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+    gen = LLMEmailGenerator()
+    gen.client = MagicMock()
+    gen.client.models.generate_content.return_value = SimpleNamespace(
+        text="Subject: GraphRAG // Ansh Agrawal (Motilal Oswal)\n\nHi Jane,\n\nBody.\n\nBest, Ansh",
+        usage_metadata=None,
+    )
+    return gen
+
+
+RECRUITER = {
+    "recruiter_name": "Jane Doe",
+    "recruiter_email": "jane@acme.test",
+    "company": "Acme",
+    "company_type": "startup",
+    "notes": APOLLO_NOTES,
+}
+
+
+class TestCompactNotes:
+    """Notes are trimmed to the token budget."""
+
+    def test_short_notes_unchanged(self):
+        assert compact_notes("Fintech | Keywords: payments, risk", 60) == "Fintech | Keywords: payments, risk"
+
+    def test_apollo_keywords_trimmed_to_budget(self):
+        notes = compact_notes(APOLLO_NOTES, 30)
+        assert estimate_tokens(notes) <= 30
+        assert notes.startswith("Information Technology & Services | Keywords: keyword 0, keyword 1")
+
+    def test_duplicate_keywords_dropped(self):
+        notes = "AI | Keywords: " + ", ".join(["LLM", "llm", "Agents", "LLM"] + ["filler"] * 100)
+        assert compact_notes(notes, 10) == "AI | Keywords: LLM, Agents, filler"
+
+    def test_free_text_cut_at_word_boundary(self):
+        notes = "word " * 100
+        trimmed = compact_notes(notes, 5)
+        assert estimate_tokens(trimmed) <= 5
+        assert trimmed.split() == ["word"] * len(trimmed.split())
+
+    def test_missing_notes(self):
+        assert compact_notes(None) == ""
+        assert compact_notes(float("nan")) == ""
+
+
+class TestPromptSplit:
+    """The static preamble goes in the system instruction, once per client."""
+
+    def test_prompt_contains_only_recipient_delta(self, generator):
+        prompt = generator._build_prompt(RECRUITER)
+        assert "Jane Doe (First name: Jane)" in prompt
+        assert "Acme" in prompt
+        assert "Technical Career Strategist" not in prompt
+        assert estimate_tokens(prompt) < 100
+
+    def test_generate_sends_system_instruction(self, generator):
+        result = generator.generate(RECRUITER)
+
+        kwargs = generator.client.models.generate_content.call_args.kwargs
+        assert kwargs["config"].system_instruction == SYSTEM_INSTRUCTION
+        assert "Technical Career Strategist" not in kwargs["contents"]
+        assert result["subject"] == "GraphRAG // Ansh Agrawal (Motilal Oswal)"
+
+    def test_config_is_reused_across_calls(self, generator):
+        generator.generate(RECRUITER)
+        generator.generate({**RECRUITER, "recruiter_name": "Sam Lee"})
+
+        configs = [c.kwargs["config"] for c in generator.client.models.generate_content.call_args_list]
+        assert configs[0] is configs[1]
+
+
+def batch_response(prompt, drop=(), broken=False):
+    """Fake JSON-mode response with one item per "[n]" section of the prompt."""
+    import json
+    import re
+
+    if broken:
+        return SimpleNamespace(text='[{"id": 1, "subj', usage_metadata=None)
+    ids = [int(n) for n in re.findall(r"^\[(\d+)\]$", prompt, re.MULTILINE)]
+    items = [{"id": n, "subject": f"Subject {n}", "body": f"Body {n}"} for n in ids if n not in drop]
+    return SimpleNamespace(text=json.dumps(items), usage_metadata=None)
+
+
+def recruiters(n):
+    return [{**RECRUITER, "recruiter_name": f"Person {i}", "company": f"Company {i}"} for i in range(n)]
+
+
+class TestGenerateMany:
+    """Batched JSON-mode generation with per-item fallback."""
+
+    def test_splits_into_batches_and_keeps_order(self, generator):
+        calls = generator.client.models.generate_content
+        calls.side_effect = lambda model, contents, config: batch_response(contents)
+
+        emails = generator.generate_many(recruiters(25), batch_size=10)
+
+        assert calls.call_count == 3
+        assert all(c.kwargs["config"].response_mime_type == "application/json" for c in calls.call_args_list)
+        assert [e["subject"] for e in emails[:3]] == ["Subject 1", "Subject 2", "Subject 3"]
+        assert emails[10]["subject"] == "Subject 1"  # first item of the second batch
+        assert len(emails) == 25
+
+    def test_missing_item_falls_back_to_single_call(self, generator):
+        single = SimpleNamespace(text="Subject: Single\n\nHi,\n\nBest, Ansh", usage_metadata=None)
+
+        def respond(model, contents, config):
+            if config is generator.batch_config:
+                return batch_response(contents, drop={2})
+            return single
+
+        generator.client.models.generate_content.side_effect = respond
+        emails = generator.generate_many(recruiters(3), batch_size=3)
+
+        assert [e["subject"] for e in emails] == ["Subject 1", "Single", "Subject 3"]
+        assert generator.client.models.generate_content.call_count == 2
+
+    def test_unparseable_batch_falls_back_for_every_item(self, generator):
+        single = SimpleNamespace(text="Subject: Single\n\nHi,\n\nBest, Ansh", usage_metadata=None)
+
+        def respond(model, contents, config):
+            if config is generator.batch_config:
+                return batch_response(contents, broken=True)
+            return single
+
+        generator.client.models.generate_content.side_effect = respond
+        emails = generator.generate_many(recruiters(4), batch_size=4)
+
+        assert [e["subject"] for e in emails] == ["Single"] * 4
+
+    def test_batch_size_one_uses_single_calls(self, generator):
+        emails = generator.generate_many(recruiters(2), batch_size=1)
+
+        configs = [c.kwargs["config"] for c in generator.client.models.generate_content.call_args_list]
+        assert configs == [generator.config, generator.config]
+        assert emails[0]["subject"] == "GraphRAG // Ansh Agrawal (Motilal Oswal)"
+
+    def test_attachment_note_added_to_batched_items(self, generator):
+        generator.client.models.generate_content.side_effect = (
+            lambda model, contents, config: batch_response(contents)
+        )
+        emails = generator.generate_many(recruiters(2), has_attachments=True, batch_size=2)
+        assert all(e["body"].endswith("I've attached my resume for your reference.") for e in emails)
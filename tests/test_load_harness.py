@@ -0,0 +1,35 @@
+"""
+Smoke test for the end-to-end load-testing harness (benchmarks/load_test.py).
+
+Runs in a subprocess because the harness points DATABASE_URL and the
+Google/Stripe endpoints at temporary stand-ins before importing the app.
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_pipeline_completes_against_stand_in_servers():
+    result = subprocess.run(
+        [
+            sys.executable, "-m", "benchmarks.load_test",
+            "--users", "2", "--contacts", "3",
+            "--gemini-latency", "0", "--gmail-latency", "0", "--stripe-latency", "0",
+            "--timeout", "60", "--json",
+        ],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+    report = json.loads(result.stdout[result.stdout.index("{"):])
+
+    for stage in ("checkout", "upload", "draft", "send"):
+        assert report["stages"][stage]["errors"] == 0, stage
+        assert report["stages"][stage]["count"] == 2
+    assert report["upstream"]["gmail /gmail/v1/users/me/drafts/send"]["count"] == 6
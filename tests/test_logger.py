@@ -0,0 +1,59 @@
+"""
+Tests for the buffered background log writer.
+"""
+
+import json
+
+from src.logger import AsyncLogger, LogWriter, get_writer
+
+
+class TestLogWriter:
+    """Tests for LogWriter batching, rotation and overflow handling."""
+
+    def test_lines_are_written_after_flush(self, tmp_path):
+        writer = LogWriter(tmp_path / "app.log")
+        for i in range(100):
+            writer.write(f"line {i}")
+        writer.flush()
+
+        lines = (tmp_path / "app.log").read_text().splitlines()
+        assert lines == [f"line {i}" for i in range(100)]
+        assert writer.stats()["written"] == 100
+        writer.close()
+
+    def test_rotates_by_size(self, tmp_path):
+        writer = LogWriter(tmp_path / "app.log", max_bytes=200, backup_count=2, batch_size=1)
+        for i in range(60):
+            writer.write(f"record number {i:04d}")
+        writer.close()
+
+        assert (tmp_path / "app.log.1").exists()
+        assert (tmp_path / "app.log.2").exists()
+        assert not (tmp_path / "app.log.3").exists()
+
+    def test_full_queue_drops_instead_of_blocking(self, tmp_path, monkeypatch):
+        writer = LogWriter(tmp_path / "app.log", queue_size=2)
+        monkeypatch.setattr(writer, "_ensure_started", lambda: None)  # no consumer
+
+        results = [writer.write(f"line {i}") for i in range(5)]
+
+        assert results == [True, True, False, False, False]
+        assert writer.dropped == 3
+        assert writer.overflows == 1
+
+
+class TestAsyncLogger:
+    """Tests for the structured logger front end."""
+
+    def test_loggers_share_one_writer_per_file(self):
+        assert get_writer("shared.log") is get_writer("shared.log")
+
+    def test_records_are_json(self, tmp_path):
+        logger = AsyncLogger.__new__(AsyncLogger)
+        logger.writer = LogWriter(tmp_path / "structured.log")
+        logger.info("Generated", company="Acme", duration_ms=12.5)
+        logger.writer.close()
+
+        record = json.loads((tmp_path / "structured.log").read_text())
+        assert record["level"] == "INFO"
+        assert record["company"] == "Acme"
@@ -0,0 +1,65 @@
+"""
+Tests for the in-process metrics registry and /metrics endpoint.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.metrics import Counter, Gauge, Histogram
+
+
+class TestMetricTypes:
+    """Tests for counter, gauge and histogram rendering."""
+
+    def test_counter_renders_labels(self):
+        counter = Counter("test_counter_total", "A test counter.", ["kind"])
+        counter.inc(kind="a")
+        counter.inc(2, kind="a")
+
+        assert counter.get(kind="a") == 3
+        assert 'test_counter_total{kind="a"} 3' in counter.render()
+
+    def test_counter_rejects_wrong_labels(self):
+        counter = Counter("test_counter_labels_total", "A test counter.", ["kind"])
+        with pytest.raises(ValueError):
+            counter.inc(other="x")
+
+    def test_gauge_goes_up_and_down(self):
+        gauge = Gauge("test_gauge", "A test gauge.")
+        gauge.inc(5)
+        gauge.dec(2)
+        assert gauge.get() == 3
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = Histogram("test_latency_seconds", "A test histogram.", buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 5.0):
+            histogram.observe(value)
+
+        rendered = histogram.render()
+        assert 'test_latency_seconds_bucket{le="0.1"} 1' in rendered
+        assert 'test_latency_seconds_bucket{le="1.0"} 2' in rendered
+        assert 'test_latency_seconds_bucket{le="+Inf"} 3' in rendered
+        assert "test_latency_seconds_count 3" in rendered
+
+
+class TestMetricsEndpoint:
+    """Tests for GET /metrics."""
+
+    def test_metrics_exposes_request_latency(self):
+        from app import app
+
+        with TestClient(app) as client:
+            client.get("/")
+            response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert 'outreach_http_request_duration_seconds_count{method="GET",route="/",status="200"}' in response.text
+
+    def test_metrics_token_required_when_configured(self, monkeypatch):
+        from app import app
+
+        monkeypatch.setenv("METRICS_TOKEN", "secret")
+        with TestClient(app) as client:
+            assert client.get("/metrics").status_code == 401
+            assert client.get("/metrics", headers={"Authorization": "Bearer secret"}).status_code == 200
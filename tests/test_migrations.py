@@ -0,0 +1,88 @@
+"""
+Tests for the versioned migration runner.
+"""
+
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+
+from src import migrations
+from src.migrations import SCHEMA_VERSION, check_schema, current_version, run_migrations
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """Engine for an empty SQLite database."""
+    return create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+
+
+class TestMigrations:
+    """Tests for run_migrations and the startup schema check."""
+
+    def test_fresh_database_is_migrated_to_latest(self, engine):
+        assert current_version(engine) is None
+        assert not check_schema(engine)["ok"]
+
+        applied = run_migrations(engine)
+
+        assert [m.version for m in applied] == list(range(1, SCHEMA_VERSION + 1))
+        assert current_version(engine) == SCHEMA_VERSION
+        assert check_schema(engine)["ok"]
+
+    def test_second_run_is_a_no_op(self, engine):
+        run_migrations(engine)
+        assert run_migrations(engine) == []
+
+    def test_legacy_schema_gets_missing_columns(self, engine):
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE users (id INTEGER PRIMARY KEY, email VARCHAR(255))"))
+            conn.execute(text("CREATE TABLE email_logs (id INTEGER PRIMARY KEY, user_id INTEGER)"))
+
+        run_migrations(engine)
+
+        inspector = inspect(engine)
+        user_columns = {c["name"] for c in inspector.get_columns("users")}
+        log_columns = {c["name"] for c in inspector.get_columns("email_logs")}
+        assert {"access_token", "refresh_token", "token_expiry", "password_hash"} <= user_columns
+        assert "gmail_draft_id" in log_columns
+
+    def test_contacts_from_before_company_profiles_get_the_profile_index(self, engine):
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE contacts (id INTEGER PRIMARY KEY, user_id INTEGER, email VARCHAR(255))"))
+
+        run_migrations(engine)
+
+        indexes = {ix["name"] for ix in inspect(engine).get_indexes("contacts")}
+        assert "ix_contacts_company_profile_id" in indexes
+
+    def test_legacy_contact_emails_are_lowercased(self, engine):
+        run_migrations(engine)
+        with engine.begin() as conn:
+            conn.execute(text("INSERT INTO contacts (user_id, email) VALUES (1, ' Jane@Acme.IO'), (1, 'bob@acme.io')"))
+            conn.execute(text("DELETE FROM schema_migrations WHERE version = 10"))
+
+        run_migrations(engine)
+
+        with engine.connect() as conn:
+            emails = conn.execute(text("SELECT email FROM contacts ORDER BY id")).scalars().all()
+        assert emails == ["jane@acme.io", "bob@acme.io"]
+
+    def test_runs_under_the_migration_lock(self, engine, monkeypatch):
+        events = []
+
+        @contextmanager
+        def lock(engine):
+            events.append("locked")
+            yield
+            events.append("unlocked")
+
+        def apply_pending(engine):
+            events.append("applied")
+            return []
+
+        monkeypatch.setattr(migrations, "_migration_lock", lock)
+        monkeypatch.setattr(migrations, "_apply_pending", apply_pending)
+        run_migrations(engine)
+
+        assert events == ["locked", "applied", "unlocked"]
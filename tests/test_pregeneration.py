@@ -0,0 +1,205 @@
+"""
+Tests for background pregeneration into the generated_emails cache.
+"""
+
+import asyncio
+
+import pytest
+
+from src import pregeneration
+from src.models import Contact, GeneratedEmail, User
+
+
+class FakeGenerator:
+    """Stands in for LLMEmailGenerator; records the recruiters it was asked for."""
+
+    def __init__(self, profile_hash="hash-1", fallback_for=(), on_call=None):
+        self.profile_hash = profile_hash
+        self.fallback_for = set(fallback_for)
+        self.on_call = on_call
+        self.requested = []
+
+    def generate_many(self, recruiters, has_attachments=False, batch_size=None):
+        self.requested.extend(r["recruiter_email"] for r in recruiters)
+        if self.on_call:
+            self.on_call()
+        emails = []
+        for r in recruiters:
+            email = {"subject": f"Hi {r['recruiter_name']}", "body": "Body"}
+            if r["recruiter_email"] in self.fallback_for:
+                email["fallback"] = True
+            emails.append(email)
+        return emails
+
+    def add_attachment_note(self, body, has_attachments):
+        return body + " [resume]" if has_attachments else body
+
+
+@pytest.fixture
+def user_id(db, user):
+    """The shared user with six new contacts and a drafted one."""
+    user.credits = 100
+    for i in range(6):
+        db.add(Contact(user_id=user.id, name=f"Person {i}", email=f"p{i}@example.com", status="new"))
+    db.add(Contact(user_id=user.id, name="Drafted", email="drafted@example.com", status="draft"))
+    db.commit()
+    return user.id
+
+
+def cached(session_factory):
+    db = session_factory()
+    try:
+        return db.query(GeneratedEmail).order_by(GeneratedEmail.contact_id).all()
+    finally:
+        db.close()
+
+
+class TestPregeneration:
+    """run() fills the cache within the cap and stops when superseded."""
+
+    def test_caches_new_contacts_only(self, session_factory, user_id):
+        generator = FakeGenerator()
+        assert pregeneration.run(user_id, session_factory=session_factory, generator=generator) == 6
+        assert "drafted@example.com" not in generator.requested
+        assert {row.profile_hash for row in cached(session_factory)} == {"hash-1"}
+
+        # Second run has nothing left to do
+        assert pregeneration.run(user_id, session_factory=session_factory, generator=FakeGenerator()) == 0
+
+    def test_capped_by_credits_and_per_user_limit(self, session_factory, user_id, monkeypatch):
+        db = session_factory()
+        db.query(User).filter(User.id == user_id).update({"credits": 4})
+        db.commit()
+        db.close()
+        assert pregeneration.run(user_id, session_factory=session_factory, generator=FakeGenerator()) == 4
+
+        monkeypatch.setattr(pregeneration, "PREGENERATE_MAX_PER_USER", 2)
+        assert pregeneration.run(user_id, session_factory=session_factory, generator=FakeGenerator("hash-2")) == 2
+
+    def test_fallback_emails_are_not_cached(self, session_factory, user_id):
+        generator = FakeGenerator(fallback_for={"p0@example.com"})
+        assert pregeneration.run(user_id, session_factory=session_factory, generator=generator) == 5
+
+    def test_profile_change_purges_stale_rows(self, session_factory, user_id):
+        pregeneration.run(user_id, session_factory=session_factory, generator=FakeGenerator("hash-1"))
+        pregeneration.run(user_id, session_factory=session_factory, generator=FakeGenerator("hash-2"))
+        assert {row.profile_hash for row in cached(session_factory)} == {"hash-2"}
+
+    def test_cancel_stops_between_batches(self, session_factory, user_id, monkeypatch):
+        import src.llm_generator
+
+        monkeypatch.setattr(src.llm_generator, "LLM_BATCH_SIZE", 2)
+        token = pregeneration._next_token(user_id)
+        generator = FakeGenerator(on_call=lambda: pregeneration.cancel(user_id))
+
+        stored = pregeneration.run(user_id, token, session_factory=session_factory, generator=generator)
+
+        assert stored == 2
+        assert len(generator.requested) == 2
+
+    def test_drafting_stops_the_job(self, session_factory, user_id, db, user, monkeypatch):
+        """A draft request while the job is running cancels the job's remaining batches."""
+        import src.llm_generator
+        from fastapi.testclient import TestClient
+
+        import app as app_module
+        from src.auth import require_auth
+        from src.database import get_db
+
+        class FakeGmail:
+            async def aauthenticate(self):
+                return True
+
+            async def acreate_draft(self, to, subject, body, attachment_paths=None):
+                return {"id": f"draft-{to}"}
+
+        monkeypatch.setattr(src.llm_generator, "LLM_BATCH_SIZE", 2)
+        monkeypatch.setattr(app_module, "get_gmail_client", lambda user: FakeGmail())
+        app_module.app.dependency_overrides[require_auth] = lambda: user
+        app_module.app.dependency_overrides[get_db] = lambda: db
+        responses = []
+        try:
+            with TestClient(app_module.app) as client:
+                def draft():
+                    if not responses:
+                        responses.append(client.post("/api/draft", data={"use_llm": "false"}))
+
+                generator = FakeGenerator(on_call=draft)
+                token = pregeneration._next_token(user_id)
+                stored = pregeneration.run(user_id, token, session_factory=session_factory, generator=generator)
+        finally:
+            app_module.app.dependency_overrides.clear()
+
+        assert responses[0].json()["success"] == 6
+        # The batch in flight finished (and its drafted contacts were not cached); no more were started
+        assert len(generator.requested) == 2 and stored == 0
+
+    def test_waits_for_headroom_until_cancelled(self, user_id):
+        from src.retry import AdaptiveLimiter
+
+        limiter = AdaptiveLimiter("test", initial=2, maximum=2)
+        token = pregeneration._next_token(user_id)
+        limiter.acquire()
+        limiter.acquire()  # interactive calls hold the whole limit
+
+        waited = []
+
+        def sleep(seconds):
+            waited.append(seconds)
+            if len(waited) == 3:
+                pregeneration.cancel(user_id)
+
+        assert not pregeneration._wait_for_headroom(limiter, user_id, token, sleep=sleep)
+        assert len(waited) == 3
+
+        limiter.release()
+        assert pregeneration._wait_for_headroom(limiter, user_id, pregeneration._next_token(user_id))
+
+    def test_contacts_drafted_meanwhile_are_skipped(self, session_factory, user_id):
+        def draft_everything():
+            db = session_factory()
+            db.query(Contact).update({"status": "draft"})
+            db.commit()
+            db.close()
+
+        generator = FakeGenerator(on_call=draft_everything)
+        assert pregeneration.run(user_id, session_factory=session_factory, generator=generator) == 0
+
+
+class TestCacheUse:
+    """Preview/draft read warm results and drafting consumes them."""
+
+    def test_generate_with_cache_mixes_hits_and_misses(self, session_factory, user_id, monkeypatch):
+        monkeypatch.setattr(pregeneration, "PREGENERATE_MAX_PER_USER", 3)
+        pregeneration.run(user_id, session_factory=session_factory, generator=FakeGenerator())
+
+        db = session_factory()
+        contacts = db.query(Contact).filter(Contact.status == "new").order_by(Contact.id).all()
+        generator = FakeGenerator()
+        emails = asyncio.run(pregeneration.agenerate_with_cache(db, user_id, contacts, generator, has_attachments=True))
+
+        assert len(emails) == 6
+        assert generator.requested == ["p3@example.com", "p4@example.com", "p5@example.com"]
+        assert emails[0] == {"subject": "Hi Person 0", "body": "Body [resume]"}
+
+        pregeneration.consume(db, [contacts[0].id])
+        db.commit()
+        db.close()
+        assert len(cached(session_factory)) == 2
+
+    def test_other_profile_hash_is_a_miss(self, session_factory, user_id):
+        pregeneration.run(user_id, session_factory=session_factory, generator=FakeGenerator("old"))
+        db = session_factory()
+        ids = [c.id for c in db.query(Contact).all()]
+        assert pregeneration.lookup(db, user_id, ids, "new") == {}
+        db.close()
+
+    def test_contact_rows_work_like_objects(self, session_factory, user_id):
+        """Preview and draft load contact_columns() rows instead of Contact objects."""
+        db = session_factory()
+        query = db.query(Contact).filter(Contact.status == "new").order_by(Contact.id)
+        rows = db.query(*pregeneration.contact_columns()).filter(Contact.status == "new").order_by(Contact.id).all()
+
+        assert pregeneration.recruiters_for(db, rows) == pregeneration.recruiters_for(db, query.all())
+        assert asyncio.run(pregeneration.agenerate_with_cache(db, user_id, rows, FakeGenerator()))[0]["subject"] == "Hi Person 0"
+        db.close()
@@ -0,0 +1,34 @@
+"""
+Tests for FastJSONResponse and row serialization (src/responses.py).
+"""
+
+import json
+from datetime import datetime
+
+from fastapi.encoders import jsonable_encoder
+
+from benchmarks import json_responses as bench
+from src import responses
+from src.responses import FastJSONResponse
+
+CONTENT = [{"id": 1, "name": "Zoë", "created_at": datetime(2025, 1, 2, 3, 4, 5, 678), "sent_at": None}]
+
+
+class TestFastJSONResponse:
+    """Rendering matches the generic encoder, with or without orjson."""
+
+    def test_matches_jsonable_encoder(self):
+        body = FastJSONResponse(CONTENT).body
+
+        assert json.loads(body) == jsonable_encoder(CONTENT)
+        assert json.loads(body)[0]["created_at"] == "2025-01-02T03:04:05.000678"
+
+    def test_fallback_without_orjson(self, monkeypatch):
+        monkeypatch.setattr(responses, "HAS_ORJSON", False)
+
+        assert json.loads(FastJSONResponse(CONTENT).body) == jsonable_encoder(CONTENT)
+
+    def test_benchmark_runs(self):
+        report = bench.run(rows=200, repeat=1)
+
+        assert report["rows"] == 200 and report["history_after_ms"] >= 0
@@ -0,0 +1,246 @@
+"""
+Tests for the shared retry policy, circuit breaker and AIMD limiter (src/retry.py).
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from src.retry import (
+    NETWORK,
+    QUOTA,
+    RATE_LIMIT,
+    SERVER,
+    AdaptiveLimiter,
+    CircuitBreaker,
+    CircuitOpenError,
+    ErrorInfo,
+    RetryPolicy,
+    classify_status,
+)
+
+
+class FakeError(Exception):
+    def __init__(self, error_class, retry_after=None):
+        super().__init__(error_class)
+        self.error_class = error_class
+        self.retry_after = retry_after
+
+
+def classify(error):
+    if isinstance(error, FakeError):
+        return ErrorInfo(error.error_class, error.retry_after)
+    return ErrorInfo(None)
+
+
+def flaky(errors, result="ok"):
+    """Callable raising the given errors in order, then returning result."""
+    calls = []
+
+    def fn():
+        calls.append(time.monotonic())
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return result
+
+    fn.calls = calls
+    return fn
+
+
+def policy(**kwargs):
+    kwargs.setdefault("base_delay", 0)
+    return RetryPolicy("test", classify, **kwargs)
+
+
+class TestRetryPolicy:
+    """Backoff, Retry-After and per-error-class budgets."""
+
+    def test_retries_transient_errors_then_succeeds(self):
+        fn = flaky([FakeError(SERVER), FakeError(RATE_LIMIT), FakeError(NETWORK)])
+        assert policy().call(fn) == "ok"
+        assert len(fn.calls) == 4
+
+    def test_budget_is_per_error_class(self):
+        fn = flaky([FakeError(SERVER)] * 3)
+        with pytest.raises(FakeError):
+            policy(budgets={SERVER: 2, RATE_LIMIT: 5}).call(fn)
+        assert len(fn.calls) == 3
+
+        fn = flaky([FakeError(SERVER), FakeError(SERVER), FakeError(RATE_LIMIT)])
+        assert policy(budgets={SERVER: 2, RATE_LIMIT: 1}).call(fn) == "ok"
+
+    def test_non_retryable_error_raises_immediately(self):
+        fn = flaky([ValueError("bad request")])
+        with pytest.raises(ValueError):
+            policy().call(fn)
+        assert len(fn.calls) == 1
+
+    def test_retry_after_is_honoured_and_capped(self):
+        p = policy(max_delay=5)
+        assert p.backoff(0, retry_after=2) == 2
+        assert p.backoff(0, retry_after=120) == 5
+
+    def test_backoff_uses_full_jitter(self):
+        p = RetryPolicy("test", classify, base_delay=1, max_delay=8)
+        delays = [p.backoff(3) for _ in range(200)]
+        assert all(0 <= d <= 8 for d in delays)
+        assert max(delays) > 4 and min(delays) < 4
+
+    def test_async_call_retries(self):
+        errors = [FakeError(SERVER, retry_after=0.01)]
+
+        async def fn():
+            if errors:
+                raise errors.pop()
+            return "ok"
+
+        assert asyncio.run(policy().acall(fn)) == "ok"
+
+    def test_classify_status(self):
+        assert classify_status(429) == RATE_LIMIT
+        assert classify_status(503) == SERVER
+        assert classify_status(None) == NETWORK
+        assert classify_status(404) is None
+
+
+class TestCircuitBreaker:
+    """closed -> open -> half-open -> closed transitions."""
+
+    def test_opens_after_consecutive_failures(self):
+        breaker = CircuitBreaker("test", failure_threshold=3, reset_timeout=60)
+        fn = flaky([FakeError(SERVER)] * 10)
+        with pytest.raises(FakeError):
+            policy(breaker=breaker, budgets={SERVER: 2}).call(fn)
+        assert breaker.state == CircuitBreaker.OPEN
+        with pytest.raises(CircuitOpenError):
+            policy(breaker=breaker).call(fn)
+        assert len(fn.calls) == 3
+
+    def test_half_open_trial_closes_on_success(self):
+        breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0.01)
+        breaker.record_failure()
+        assert not breaker.allow()
+        time.sleep(0.02)
+        assert breaker.allow()  # the single trial call
+        assert not breaker.allow()
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_cancelled_trial_frees_the_half_open_slot(self):
+        breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0.01)
+        breaker.record_failure()
+        time.sleep(0.02)
+
+        async def hang():
+            await asyncio.sleep(10)
+
+        async def ok():
+            return "ok"
+
+        async def run():
+            trial = asyncio.create_task(policy(breaker=breaker).acall(hang))
+            await asyncio.sleep(0.01)
+            trial.cancel()  # e.g. the client of a streaming request disconnected
+            with pytest.raises(asyncio.CancelledError):
+                await trial
+            return await policy(breaker=breaker).acall(ok)
+
+        assert asyncio.run(run()) == "ok"
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_client_errors_do_not_trip_the_breaker(self):
+        breaker = CircuitBreaker("test", failure_threshold=1)
+        with pytest.raises(ValueError):
+            policy(breaker=breaker).call(flaky([ValueError()]))
+        assert breaker.state == CircuitBreaker.CLOSED
+
+
+class TestAdaptiveLimiter:
+    """AIMD limit changes and enforcement."""
+
+    def test_multiplicative_decrease_additive_increase(self):
+        limiter = AdaptiveLimiter("test", initial=8, maximum=16)
+        limiter.on_overload()
+        assert limiter.limit == 4
+        # +1/limit per success: one more slot after about `limit` successes
+        for _ in range(4):
+            limiter.on_success()
+        assert limiter.limit == 4
+        limiter.on_success()
+        assert limiter.limit == 5
+
+    def test_limit_stays_within_bounds(self):
+        limiter = AdaptiveLimiter("test", initial=2, minimum=1, maximum=3)
+        for _ in range(5):
+            limiter.on_overload()
+        assert limiter.limit == 1
+        for _ in range(100):
+            limiter.on_success()
+        assert limiter.limit == 3
+
+    def test_rate_limit_errors_shrink_the_limit(self):
+        limiter = AdaptiveLimiter("test", initial=8)
+        assert policy(limiter=limiter).call(flaky([FakeError(RATE_LIMIT)])) == "ok"
+        assert limiter.limit == 4
+        assert limiter.in_flight == 0
+
+    def test_quota_errors_leave_shared_state_alone(self):
+        """One caller over its own quota is retried without throttling everyone."""
+        limiter = AdaptiveLimiter("test", initial=8)
+        breaker = CircuitBreaker("test", failure_threshold=1)
+        fn = flaky([FakeError(QUOTA)] * 3)
+
+        assert policy(limiter=limiter, breaker=breaker).call(fn) == "ok"
+        assert len(fn.calls) == 4
+        assert limiter.limit == 8
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_async_concurrency_never_exceeds_limit(self):
+        limiter = AdaptiveLimiter("test", initial=3, maximum=3)
+        peak = []
+
+        async def task():
+            async with limiter.slot_async():
+                peak.append(limiter.in_flight)
+                await asyncio.sleep(0.01)
+
+        async def run():
+            await asyncio.gather(*(task() for _ in range(20)))
+
+        asyncio.run(run())
+        assert len(peak) == 20
+        assert max(peak) <= 3
+        assert limiter.in_flight == 0
+
+
+class TestUpstreamClassifiers:
+    """Gmail and Gemini errors map to the right error classes."""
+
+    def test_gmail_quota_403_is_per_user_quota(self):
+        from src.gmail_client import classify_gmail_error
+        from src.gmail_transport import GmailAPIError
+
+        quota = GmailAPIError("403: userRateLimitExceeded", status_code=403)
+        assert classify_gmail_error(quota).error_class == QUOTA
+        assert classify_gmail_error(GmailAPIError("403: forbidden", status_code=403)).error_class is None
+        assert classify_gmail_error(GmailAPIError("429", status_code=429, retry_after=3)) == (RATE_LIMIT, 3)
+
+    def test_gmail_per_user_429_is_per_user_quota(self):
+        from src.gmail_client import classify_gmail_error
+        from src.gmail_transport import GmailAPIError
+
+        for detail in ("429: userRateLimitExceeded", "429: rateLimitExceeded",
+                       "429: Too many concurrent requests for user"):
+            assert classify_gmail_error(GmailAPIError(detail, status_code=429, retry_after=2)) == (QUOTA, 2)
+
+    def test_gemini_retry_info_delay(self):
+        from google.genai import errors
+        from src.llm_generator import classify_gemini_error
+
+        body = {"error": {"code": 429, "status": "RESOURCE_EXHAUSTED", "details": [
+            {"@type": "type.googleapis.com/google.rpc.RetryInfo", "retryDelay": "17s"},
+        ]}}
+        assert classify_gemini_error(errors.ClientError(429, body)) == (RATE_LIMIT, 17.0)
+        assert classify_gemini_error(errors.ServerError(503, {"error": {"code": 503}})).error_class == SERVER
+        assert classify_gemini_error(errors.ClientError(400, {"error": {"code": 400}})).error_class is None
@@ -0,0 +1,207 @@
+"""
+Tests for background batch sending with bulk status writes (src/sender.py).
+"""
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event
+
+from src import sender
+from src.models import EmailLog, User
+
+
+class FakeGmail:
+    """Stands in for GmailClient; fails the draft ids it is told to."""
+
+    def __init__(self, authenticated=True, failing=(), gone=()):
+        self.authenticated = authenticated
+        self.failing = set(failing)
+        self.gone = set(gone)  # drafts sent by an earlier client
+        self.sent = []
+
+    def authenticate(self):
+        return self.authenticated
+
+    def send_draft(self, draft_id):
+        if draft_id in self.failing:
+            raise RuntimeError("Gmail error")
+        self.sent.append(draft_id)
+        return {"id": f"msg-{draft_id}"}
+
+    def draft_exists(self, draft_id):
+        return draft_id not in self.gone and draft_id not in self.sent
+
+
+@pytest.fixture
+def drafts(db, user):
+    logs = [
+        EmailLog(user_id=user.id, recipient_email=f"p{i}@acme.io", status="draft", gmail_draft_id=f"d{i}")
+        for i in range(5)
+    ]
+    db.add_all(logs)
+    db.commit()
+    return user.id, [log.id for log in logs]
+
+
+def statuses(session_factory):
+    db = session_factory()
+    try:
+        return {log.gmail_draft_id: (log.status, log.sent_at is not None) for log in db.query(EmailLog)}
+    finally:
+        db.close()
+
+
+def count_statements(engine, prefix):
+    executed = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(prefix):
+            executed.append(statement)
+
+    return executed
+
+
+class TestSendBatch:
+    """Prefetch, buffering and durability."""
+
+    def test_sends_and_records_in_bulk(self, engine, session_factory, drafts, monkeypatch):
+        monkeypatch.setattr(sender, "SEND_FLUSH_SIZE", 100)
+        user_id, ids = drafts
+        updates = count_statements(engine, "UPDATE EMAIL_LOGS")
+        selects = count_statements(engine, "SELECT EMAIL_LOGS")
+        sleeps = []
+
+        sent = sender.send_batch(user_id, ids, 0, lambda user: FakeGmail(),
+                                 session_factory=session_factory, sleep=sleeps.append)
+
+        # One claim and one bulk UPDATE for the whole batch; the only SELECT looks for abandoned claims
+        assert len(updates) == 2 and len(selects) == 1
+        assert sent == 5
+        assert set(statuses(session_factory).values()) == {("sent", True)}
+        assert sleeps == []
+
+    def test_batch_is_claimed_before_sending(self, session_factory, drafts):
+        user_id, ids = drafts
+        seen = []
+
+        def sleep(seconds):
+            seen.append(sorted(status for status, _ in statuses(session_factory).values()))
+
+        sender.send_batch(user_id, ids, 30, lambda user: FakeGmail(), session_factory=session_factory, sleep=sleep)
+
+        # A long pause no longer forces a flush per send: the claim is what makes sends durable
+        assert seen == [["sending"] * 5] * 4
+        assert set(statuses(session_factory).values()) == {("sent", True)}
+
+    def test_claimed_drafts_are_not_sent_twice(self, session_factory, drafts):
+        user_id, ids = drafts
+        second = FakeGmail()
+
+        def sleep(seconds):
+            # A second send-all arrives while the first batch is running
+            if not second.sent:
+                sender.send_batch(user_id, ids, 0, lambda user: second, session_factory=session_factory)
+
+        first = FakeGmail()
+        sender.send_batch(user_id, ids, 1, lambda user: first, session_factory=session_factory, sleep=sleep)
+
+        assert len(first.sent) == 5 and second.sent == []
+
+    def test_killed_between_send_and_flush(self, session_factory, drafts, monkeypatch):
+        """Drafts sent before the worker died are not resent, and are settled once the claim is stale."""
+        user_id, ids = drafts
+        gmail = FakeGmail()
+
+        def sleep(seconds):
+            if len(gmail.sent) == 2:
+                raise RuntimeError("worker killed")
+
+        def killed(self):
+            raise RuntimeError("no flush: the process is gone")
+
+        with monkeypatch.context() as m:
+            m.setattr(sender.StatusBuffer, "flush", killed)
+            assert sender.send_batch(user_id, ids, 1, lambda user: gmail, session_factory=session_factory, sleep=sleep) == 0
+        assert gmail.sent == ["d0", "d1"]
+        assert {status for status, _ in statuses(session_factory).values()} == {"sending"}
+
+        # The next send-all finds no drafts to resend while the claim may still be live
+        retry = FakeGmail(gone=gmail.sent)
+        assert sender.send_batch(user_id, ids, 0, lambda user: retry, session_factory=session_factory) == 0
+        assert retry.sent == []
+
+        # Once it is stale, Gmail tells what was sent and the rest is sent again
+        monkeypatch.setattr(sender, "SEND_CLAIM_TIMEOUT", -1)
+        assert sender.send_batch(user_id, ids, 0, lambda user: retry, session_factory=session_factory) == 3
+        assert retry.sent == ["d2", "d3", "d4"]
+        assert set(statuses(session_factory).values()) == {("sent", True)}
+
+    def test_failures_stay_drafts(self, session_factory, drafts):
+        user_id, ids = drafts
+
+        sent = sender.send_batch(user_id, ids, 0, lambda user: FakeGmail(failing={"d1", "d3"}),
+                                 session_factory=session_factory, sleep=lambda s: None)
+
+        assert sent == 3
+        assert statuses(session_factory)["d1"] == ("draft", False)
+        assert statuses(session_factory)["d2"] == ("sent", True)
+
+    def test_sent_drafts_are_recorded_after_a_crash(self, session_factory, drafts, monkeypatch):
+        user_id, ids = drafts
+        gmail = FakeGmail()
+        monkeypatch.setattr(sender, "SEND_FLUSH_SIZE", 100)
+
+        def sleep(seconds):
+            if len(gmail.sent) == 2:
+                raise RuntimeError("worker stopping")
+
+        sent = sender.send_batch(user_id, ids, 1, lambda user: gmail, session_factory=session_factory, sleep=sleep)
+
+        assert sent == 2
+        assert [d for d, (status, _) in statuses(session_factory).items() if status == "sent"] == ["d0", "d1"]
+
+    def test_missing_user_or_auth_sends_nothing(self, session_factory, drafts):
+        user_id, ids = drafts
+
+        assert sender.send_batch(user_id + 1, ids, 0, lambda user: FakeGmail(), session_factory=session_factory) == 0
+        assert sender.send_batch(user_id, ids, 0, lambda user: FakeGmail(authenticated=False),
+                                 session_factory=session_factory) == 0
+        assert set(statuses(session_factory).values()) == {("draft", False)}
+
+    def test_bulk_writes_bump_the_data_version(self, session_factory, drafts):
+        user_id, ids = drafts
+
+        sender.send_batch(user_id, ids, 0, lambda user: FakeGmail(), session_factory=session_factory)
+
+        db = session_factory()
+        assert db.get(User, user_id).data_version >= 1
+        db.close()
+
+
+class TestStatusBuffer:
+    """Size, age and claim refresh triggers."""
+
+    def test_due_by_size_and_age(self):
+        now = [0.0]
+        buffer = sender.StatusBuffer(db=None, user_id=1, max_size=3, max_age=5, clock=lambda: now[0])
+
+        assert not buffer.due()
+        buffer.add(1, datetime(2024, 1, 1))
+        # The pause before the next send does not count towards the age
+        assert not buffer.due() and not buffer.due(horizon=30)
+        now[0] = 5
+        assert buffer.due()
+        buffer.add(2, datetime(2024, 1, 1))
+        buffer.release(3)
+        now[0] = 0
+        assert buffer.due()
+
+    def test_claims_are_refreshed_before_they_look_abandoned(self):
+        now = [0.0]
+        buffer = sender.StatusBuffer(db=None, user_id=1, claimed=[1, 2], heartbeat=100, clock=lambda: now[0])
+
+        assert not buffer.due(horizon=30)
+        now[0] = 70
+        assert buffer.due(horizon=30)
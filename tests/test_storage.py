@@ -0,0 +1,124 @@
+"""
+Tests for R2 storage (src/storage.py): the shared client, multipart
+settings and compressed backups. The round trip against an S3 stand-in
+runs when moto is installed.
+"""
+
+import gzip
+
+import pytest
+
+from src import storage
+
+
+@pytest.fixture
+def credentials(monkeypatch):
+    monkeypatch.setattr(storage, "R2_ACCESS_KEY_ID", "test")
+    monkeypatch.setattr(storage, "R2_SECRET_ACCESS_KEY", "test")
+    monkeypatch.setattr(storage, "R2_ENDPOINT_URL", "https://r2.example.com")
+    storage.get_s3_client.cache_clear()
+    yield
+    storage.get_s3_client.cache_clear()
+
+
+class FakeClient:
+    """Records upload_fileobj calls with the uploaded bytes."""
+
+    def __init__(self):
+        self.uploads = []
+
+    def upload_fileobj(self, file_obj, bucket, key, ExtraArgs=None, Config=None):
+        self.uploads.append({"key": key, "body": file_obj.read(), "extra": ExtraArgs, "config": Config})
+
+
+@pytest.fixture
+def fake_client(monkeypatch):
+    client = FakeClient()
+    monkeypatch.setattr(storage, "get_s3_client", lambda: client)
+    return client
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    path = tmp_path / "contacts.csv"
+    path.write_bytes(b"recruiter_name,recruiter_email\n" + b"Jane,jane@acme.io\n" * 500)
+    return path
+
+
+class TestClient:
+    """One client per process, with a tuned pool."""
+
+    def test_client_is_created_once(self, credentials):
+        client = storage.get_s3_client()
+
+        assert storage.get_s3_client() is client
+        assert client.meta.config.max_pool_connections == storage.R2_MAX_POOL_CONNECTIONS
+
+    def test_no_client_without_credentials(self, monkeypatch):
+        monkeypatch.setattr(storage, "R2_ACCESS_KEY_ID", None)
+        storage.get_s3_client.cache_clear()
+
+        assert storage.get_s3_client() is None
+        storage.get_s3_client.cache_clear()
+
+
+class TestBackupFile:
+    """Backups from disk, plain or compressed."""
+
+    def test_plain_backup_uses_multipart_config(self, fake_client, csv_file):
+        assert storage.backup_file(str(csv_file), "users/1/uploads/contacts.csv", compression="none") == "users/1/uploads/contacts.csv"
+
+        upload = fake_client.uploads[0]
+        assert upload["body"] == csv_file.read_bytes()
+        assert upload["config"] is storage.TRANSFER_CONFIG
+
+    def test_gzip_backup(self, fake_client, csv_file):
+        key = storage.backup_file(str(csv_file), "users/1/uploads/contacts.csv", compression="gzip")
+
+        upload = fake_client.uploads[0]
+        assert key == upload["key"] == "users/1/uploads/contacts.csv.gz"
+        assert upload["extra"] == {"ContentType": "text/csv", "ContentEncoding": "gzip"}
+        assert gzip.decompress(upload["body"]) == csv_file.read_bytes()
+        assert len(upload["body"]) < csv_file.stat().st_size
+
+    def test_returns_the_key_not_the_public_url(self, fake_client, csv_file, monkeypatch):
+        monkeypatch.setenv("R2_PUBLIC_URL", "https://cdn.example.com")
+
+        assert storage.backup_file(str(csv_file), "a.csv", compression="none") == "a.csv"
+
+    def test_skipped_upload_returns_none(self, monkeypatch, csv_file):
+        monkeypatch.setattr(storage, "get_s3_client", lambda: None)
+
+        assert storage.backup_file(str(csv_file), "a.csv", compression="none") is None
+
+    def test_missing_file_is_logged_not_raised(self, fake_client, tmp_path):
+        assert storage.backup_file(str(tmp_path / "gone.csv"), "gone.csv", compression="none") is None
+
+
+class TestS3RoundTrip:
+    """Multipart upload against moto's S3 stand-in."""
+
+    def test_multipart_upload_round_trip(self, monkeypatch, csv_file):
+        moto = pytest.importorskip("moto")
+        from boto3.s3.transfer import TransferConfig
+
+        monkeypatch.setattr(storage, "R2_ACCESS_KEY_ID", "test")
+        monkeypatch.setattr(storage, "R2_SECRET_ACCESS_KEY", "test")
+        monkeypatch.setattr(storage, "R2_ENDPOINT_URL", "https://s3.us-east-1.amazonaws.com")
+        monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+        # Small parts so the 5 MB file goes up as several concurrent parts
+        monkeypatch.setattr(storage, "TRANSFER_CONFIG", TransferConfig(
+            multipart_threshold=5 * 1024 * 1024, multipart_chunksize=5 * 1024 * 1024, max_concurrency=4
+        ))
+        csv_file.write_bytes(b"Jane,jane@acme.io\n" * 400_000)
+
+        with moto.mock_aws():
+            storage.get_s3_client.cache_clear()
+            client = storage.get_s3_client()
+            client.create_bucket(Bucket=storage.R2_BUCKET_NAME)
+
+            key = storage.backup_file(str(csv_file), "users/1/uploads/contacts.csv", compression="none")
+            body = client.get_object(Bucket=storage.R2_BUCKET_NAME, Key=key)["Body"].read()
+            storage.get_s3_client.cache_clear()
+
+        assert body == csv_file.read_bytes()
@@ -0,0 +1,71 @@
+"""
+Tests for EmailTracker dedup:
+- contacted-key index stays in sync with records
+- filter_unsent and filter_unsent_df agree
+"""
+
+import pandas as pd
+import pytest
+
+from src.tracker import EmailTracker
+
+
+@pytest.fixture
+def tracker(tmp_path):
+    """Tracker backed by a temporary tracking file."""
+    return EmailTracker(tracking_file=str(tmp_path / "tracking.json"))
+
+
+def _recruiter(email, company="Acme"):
+    return {"recruiter_name": "Jane", "recruiter_email": email, "company": company, "role": "CTO"}
+
+
+class TestContactedIndex:
+    """Tests for the in-memory contacted-key index."""
+
+    def test_is_sent_is_case_and_whitespace_insensitive(self, tracker):
+        tracker.add_record(_recruiter("Jane@Acme.com"), "sent")
+        assert tracker.is_sent(" jane@acme.com ", "ACME")
+
+    def test_failed_status_removes_key(self, tracker):
+        record_id = tracker.add_record(_recruiter("jane@acme.com"), "draft")
+        tracker.update_status(record_id, "failed")
+        assert not tracker.is_sent("jane@acme.com", "Acme")
+
+    def test_index_is_rebuilt_on_load(self, tracker):
+        tracker.add_record(_recruiter("jane@acme.com"), "sent")
+        reloaded = EmailTracker(tracking_file=str(tracker.tracking_file))
+        assert reloaded.is_sent("jane@acme.com", "Acme")
+
+    def test_clear_resets_index(self, tracker):
+        tracker.add_record(_recruiter("jane@acme.com"), "sent")
+        tracker.clear()
+        assert not tracker.is_sent("jane@acme.com", "Acme")
+
+
+class TestFilterUnsent:
+    """Tests for list and DataFrame dedup."""
+
+    def test_list_and_dataframe_filters_agree(self, tracker):
+        tracker.add_record(_recruiter("sent@acme.com"), "sent")
+        tracker.add_record(_recruiter("draft@beta.io", "Beta"), "draft")
+        tracker.add_record(_recruiter("failed@acme.com"), "failed")
+        recruiters = [
+            _recruiter("SENT@acme.com"),
+            _recruiter("draft@beta.io", "beta"),
+            _recruiter("failed@acme.com"),
+            _recruiter("new@acme.com"),
+            _recruiter("sent@acme.com", "Other Co"),
+        ]
+
+        from_list = tracker.filter_unsent(recruiters)
+        from_df = tracker.filter_unsent_df(pd.DataFrame(recruiters)).to_dict("records")
+
+        expected = ["failed@acme.com", "new@acme.com", "sent@acme.com"]
+        assert [r["recruiter_email"] for r in from_list] == expected
+        assert [r["recruiter_email"] for r in from_df] == expected
+
+    def test_dataframe_filter_handles_missing_values(self, tracker):
+        tracker.add_record({"recruiter_email": "jane@acme.com", "company": None}, "sent")
+        df = pd.DataFrame({"recruiter_email": ["jane@acme.com", "joe@acme.com"], "company": [float("nan"), None]})
+        assert tracker.filter_unsent_df(df)["recruiter_email"].tolist() == ["joe@acme.com"]
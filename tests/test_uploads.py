@@ -0,0 +1,183 @@
+"""
+Tests for chunked, hashed upload saving and duplicate-import detection (src/uploads.py).
+"""
+
+import asyncio
+import hashlib
+import io
+
+import pytest
+from fastapi import UploadFile
+
+from src import uploads
+from src.models import Contact, Upload
+
+
+def upload(content: bytes, size=None) -> UploadFile:
+    return UploadFile(io.BytesIO(content), size=size, filename="contacts.csv")
+
+
+def save(content: bytes, dest, **kwargs):
+    return asyncio.run(uploads.asave_upload(upload(content), dest, **kwargs))
+
+
+class TestSaveUpload:
+    """Chunked async writes hash the content they write and enforce the size limit."""
+
+    def test_hash_and_size_match_the_content(self, tmp_path):
+        content = b"recruiter_name,recruiter_email\n" + b"Jane,jane@acme.io\n" * 1000
+
+        saved = save(content, tmp_path / "a.csv", chunk_size=7)
+
+        assert saved.path.read_bytes() == content
+        assert saved.sha256 == hashlib.sha256(content).hexdigest()
+        assert saved.size == len(content)
+
+    def test_oversized_stream_is_rejected_and_removed(self, tmp_path):
+        dest = tmp_path / "big.csv"
+
+        with pytest.raises(uploads.UploadTooLarge):
+            save(b"x" * 1000, dest, max_bytes=100, chunk_size=64)
+        assert not dest.exists()
+
+    def test_declared_size_is_rejected_before_reading(self, tmp_path):
+        file = upload(b"x" * 10, size=10_000)
+
+        with pytest.raises(uploads.UploadTooLarge):
+            asyncio.run(uploads.asave_upload(file, tmp_path / "big.csv", max_bytes=100))
+        assert file.file.tell() == 0
+
+    def test_does_not_block_the_event_loop(self, tmp_path):
+        """Other coroutines keep running while a large upload is written."""
+        events = []
+
+        async def write():
+            await uploads.asave_upload(upload(b"x" * 64 * 50), tmp_path / "a.csv", chunk_size=64)
+            events.append("saved")
+
+        async def ticker():
+            for _ in range(5):
+                events.append("tick")
+                await asyncio.sleep(0)
+
+        async def both():
+            await asyncio.gather(write(), ticker())
+
+        asyncio.run(both())
+        assert events[-1] == "saved" and events.count("tick") == 5
+
+    def test_temp_paths_are_unique_and_hidden(self, tmp_path):
+        first, second = uploads.temp_path(tmp_path), uploads.temp_path(tmp_path)
+
+        assert first != second
+        assert first.parent == tmp_path and first.name.startswith(".")
+
+
+class TestImportRegistry:
+    """find_import returns the summary stored by record_import."""
+
+    def test_roundtrip_per_user(self, db, tmp_path):
+        saved = save(b"a,b\n1,2\n", tmp_path / "a.csv")
+        summary = {"filename": "a.csv", "total_contacts": 1, "new_added": 1}
+
+        assert uploads.find_import(db, 1, saved.sha256) is None
+        uploads.record_import(db, 1, saved, "a.csv", summary)
+        db.commit()
+
+        assert uploads.find_import(db, 1, saved.sha256) == summary
+        # Another user's identical file is imported normally
+        assert uploads.find_import(db, 2, saved.sha256) is None
+
+    def test_object_key_is_stored_after_a_successful_backup(self, db, session_factory, tmp_path, monkeypatch):
+        from src import storage
+
+        saved = save(b"a,b\n1,2\n", tmp_path / "a.csv")
+        uploads.record_import(db, 1, saved, "a.csv", {})
+        db.commit()
+        row = db.query(Upload).one()
+        assert row.object_name is None
+
+        monkeypatch.setattr(storage, "backup_file", lambda path, name: None)
+        assert uploads.backup_import(1, saved.sha256, str(saved.path), "users/1/a.csv", session_factory) is None
+        db.refresh(row)
+        assert row.object_name is None
+
+        monkeypatch.setattr(storage, "backup_file", lambda path, name: name + ".gz")
+        assert uploads.backup_import(1, saved.sha256, str(saved.path), "users/1/a.csv", session_factory) == "users/1/a.csv.gz"
+        db.refresh(row)
+        assert row.object_name == "users/1/a.csv.gz"
+
+
+CSV = b"recruiter_name,recruiter_email,company,role\nJane,jane@acme.io,Acme,HR\nJohn,john@acme.io,Acme,Recruiter\n"
+
+
+@pytest.fixture
+def client(db, user, tmp_path, monkeypatch):
+    """TestClient for app.py on the shared database, authenticated as the shared user."""
+    from fastapi.testclient import TestClient
+
+    import app as app_module
+    from src import deliverability
+    from src.auth import require_auth
+    from src.database import get_db
+
+    monkeypatch.setattr(app_module, "UPLOAD_DIR", tmp_path)
+    monkeypatch.setattr(deliverability, "DELIVERABILITY_RESOLVER", "none")
+    app_module.app.dependency_overrides[require_auth] = lambda: user
+    app_module.app.dependency_overrides[get_db] = lambda: db
+    with TestClient(app_module.app) as c:
+        yield c
+    app_module.app.dependency_overrides.clear()
+
+
+def post_csv(client, content: bytes = CSV):
+    return client.post("/api/upload", files={"file": ("contacts.csv", content, "text/csv")})
+
+
+class TestUploadEndpoint:
+    """/api/upload records the import in the contacts' transaction."""
+
+    def test_repeat_upload_is_a_duplicate(self, client, db):
+        first = post_csv(client).json()
+        second = post_csv(client).json()
+
+        assert (first["duplicate"], first["new_added"]) == (False, 2)
+        assert second == {**first, "duplicate": True}
+        assert db.query(Contact).count() == 2
+
+    def test_concurrent_duplicate_returns_the_first_summary(self, client, db, monkeypatch):
+        """An identical upload that passed the duplicate check before the first one committed."""
+        first = post_csv(client).json()
+        find_import = uploads.find_import
+        checks = []
+
+        def racing(db, user_id, sha256):
+            checks.append(sha256)
+            return None if len(checks) == 1 else find_import(db, user_id, sha256)
+
+        monkeypatch.setattr(uploads, "find_import", racing)
+        response = post_csv(client)
+
+        assert response.status_code == 200
+        assert response.json() == {**first, "duplicate": True}
+        assert db.query(Upload).count() == 1
+        assert db.query(Contact).count() == 2
+
+    def test_oversized_request_is_refused_before_the_body_is_read(self, client, db, monkeypatch):
+        monkeypatch.setattr(uploads, "UPLOAD_MAX_BYTES", 1024)
+        saves = []
+        monkeypatch.setattr(uploads, "asave_upload", lambda *args, **kwargs: saves.append(args))
+        big = CSV + b"Jim,jim@acme.io,Acme,HR\n" * 4000  # ~100 KB: over the limit plus multipart overhead
+
+        response = post_csv(client, big)
+        draft = client.post("/api/draft", files={"attachments": ("resume.pdf", big, "application/pdf")})
+
+        assert (response.status_code, draft.status_code) == (413, 413)
+        assert saves == []
+        assert db.query(Contact).count() == 0
+
+    def test_requests_within_the_limit_pass(self):
+        assert not uploads.declared_too_large(None)
+        assert not uploads.declared_too_large("2048", max_bytes=1024)  # multipart overhead
+        assert uploads.declared_too_large(str(1024 + uploads.MULTIPART_OVERHEAD + 1), max_bytes=1024)
+        assert not uploads.declared_too_large("10" * 20, max_bytes=0)